@@ -9,8 +9,8 @@ Design specification: https://github.com/mcpugmire1/mattgpt-design-spec
 """
 
 # Standard library
-import json
 import os
+import time
 from pathlib import Path
 
 import streamlit as st
@@ -26,7 +26,8 @@ from ui.components.navbar import render_navbar
 # Local imports - components
 from ui.pages.home import render_home_page
 from ui.styles.global_styles import apply_global_styles
-from utils.corpus_loader import normalize_story
+from utils.corpus_loader import get_corpus
+from utils.corpus_snapshot import get_corpus_snapshot
 from utils.validation import preload_nonsense_rules
 
 # =========================
@@ -161,6 +162,26 @@ if DEBUG:
             st.write("Index stats:")
             st.json(dbg_state.get("stats", {}))
 
+    with st.sidebar.expander("🧠 Embedding cache", expanded=False):
+        from services.embedding_cache import get_embedding_cache
+
+        st.json(get_embedding_cache().stats())
+
+    with st.sidebar.expander("📮 Telemetry spool", expanded=False):
+        from services.telemetry_spool import get_telemetry_spool
+
+        spool = get_telemetry_spool()
+        st.json(spool.stats())
+        st.write("Off-domain reasons (24h):")
+        st.json(dict(spool.count_by("offdomain", "reason", since=time.time() - 86400)))
+
+    with st.sidebar.expander("⏱️ Ask Agy latency (last turn)", expanded=False):
+        trace = st.session_state.get("__ask_trace__")
+        if trace is None:
+            st.caption("No query yet.")
+        else:
+            st.code(trace.format_waterfall())
+
 
 # =========================
 # Config / constants
@@ -168,7 +189,7 @@ if DEBUG:
 DATA_FILE = os.getenv("STORIES_JSONL", "echo_star_stories_nlp.jsonl")  # optional
 
 
-def load_star_stories(path: str):
+def load_star_stories(path: str, corpus=None):
     """Load JSONL records as-is, preserving all fields from source data.
 
     This is a "dumb loader" - no business logic, no transformation, no synthetic fields.
@@ -179,55 +200,40 @@ def load_star_stories(path: str):
     - REQUIRE a stable `id`: if missing, skip the row (prevents mismatch with Pinecone vector IDs).
     - Preserves ALL fields from JSONL (including Solution / Offering, Category, Sub-category, etc.)
     - Emit small warnings for visibility.
+
+    Parsing happens in utils.corpus_loader.get_corpus(), once per process and
+    file version; pass its result as corpus to avoid a second stat().
     """
-    stories: list[dict] = []
-    p = Path(path)
-    if not p.exists():
+    if corpus is None:
+        corpus = get_corpus(path)
+    if corpus is None:
         st.warning(f"Stories file not found: {path!r}. No fallback will be used.")
-        return stories
-
-    skipped_no_id = 0
-    with p.open("r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, 1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                story = json.loads(line)
-            except Exception as e:
-                st.warning(f"JSON parse error at line {line_no}: {e}")
-                continue
+        return []
 
-            # Enforce a stable ID so Pinecone hits can map back to STORIES
-            story_id = story.get("id")
-            if story_id in (None, "", 0):
-                skipped_no_id += 1
-                continue
-
-            # Ensure id is a string
-            story["id"] = str(story_id).strip()
-
-            normalize_story(story)
-
-            stories.append(story)
+    # Every rerun of every session shares the same story list.
+    for line_no, err in corpus.parse_errors:
+        st.warning(f"JSON parse error at line {line_no}: {err}")
 
     if DEBUG:
-        if skipped_no_id:
+        name = Path(path).name
+        if corpus.skipped_no_id:
             st.caption(
-                f"DEBUG • Loaded {len(stories)} stories from {p.name}; skipped {skipped_no_id} rows without an 'id' (kept Pinecone mapping stable)."
+                f"DEBUG • Loaded {len(corpus.stories)} stories from {name}; skipped {corpus.skipped_no_id} rows without an 'id' (kept Pinecone mapping stable)."
             )
         else:
-            st.caption(f"DEBUG • Loaded {len(stories)} stories from {p.name}.")
+            st.caption(f"DEBUG • Loaded {len(corpus.stories)} stories from {name}.")
 
-    return stories
+    return corpus.stories
 
 
 # Load stories from JSONL
-STORIES = load_star_stories(DATA_FILE)
+CORPUS = get_corpus(DATA_FILE)
+STORIES = load_star_stories(DATA_FILE, CORPUS)
 if not STORIES:
     st.error(f"❌ Failed to load stories from {DATA_FILE}. Check file path and format.")
     st.stop()
 
+
 # Startup init: initialize search vocabulary, preload nonsense filter rules
 # (MATTGPT-165), sync portfolio metadata. Any failure here means the app cannot
 # safely serve requests. Rather than let a broken deploy render a working
@@ -236,8 +242,9 @@ if not STORIES:
 # a user-safe fallback message. NOTE: sync_portfolio_metadata import is
 # deferred to avoid a circular dependency (backend_service <- conversation_view
 # <- __init__).
+# Cheap on reruns: every view comes from the memoized CorpusSnapshot.
 try:
-    initialize_vocab(STORIES)
+    initialize_vocab(STORIES, get_corpus_snapshot(STORIES).search_vocab)
     preload_nonsense_rules()
     from ui.pages.ask_mattgpt.backend_service import (  # noqa: E402
         sync_portfolio_metadata,
@@ -427,37 +434,11 @@ def _clear_explore_state():
         st.session_state[version_key] = st.session_state.get(version_key, 0) + 1
 
 
-def build_facets(stories):
-    """Build filter option lists from story data using raw JSONL field names."""
-    # Primary filters (NEW for Phase 4 redesign)
-    industries = sorted({s.get("Industry", "") for s in stories if s.get("Industry")})
-    capabilities = sorted(
-        {
-            s.get("Solution / Offering", "")
-            for s in stories
-            if s.get("Solution / Offering")
-        }
-    )
-
-    # Advanced filters
-    clients = sorted({s.get("Client", "") for s in stories if s.get("Client")})
-    # domains now comes from Sub-category field (used to be synthetic Category / Sub-category)
-    domains = sorted(
-        {s.get("Sub-category", "") for s in stories if s.get("Sub-category")}
-    )
-    roles = sorted({s.get("Role", "") for s in stories if s.get("Role")})
-    # tags comes from public_tags (already parsed to list in loader)
-    tags = sorted({t for s in stories for t in (s.get("public_tags") or [])})
-    # personas field doesn't exist in current data
-    personas = []
-    return industries, capabilities, clients, domains, roles, tags, personas
-
-
 # =========================
 # UI — Home / My Work / Ask Agy / Role Match / My Profile
 # =========================
-industries, capabilities, clients, domains, roles, tags, personas_all = build_facets(
-    STORIES
+industries, capabilities, clients, domains, roles, tags, personas_all = (
+    list(options) for options in get_corpus_snapshot(STORIES).facets
 )
 
 if st.session_state["active_tab"] == "Home":
@@ -2,7 +2,10 @@
 build_custom_embeddings.py
 
 Reads enriched STAR story data from a JSONL file, generates embeddings using
-OpenAI's text-embedding-3-small (1536 dims), and upserts them into Pinecone.
+OpenAI's text-embedding-3-small (1536 dims), writes the local vector index
+(data/story_vectors.npy + manifest, used when VECTOR_BACKEND=faiss), rebuilds
+the binary corpus snapshot (<STORIES_JSONL>.snapshot, see utils/corpus_binary.py)
+and upserts them into Pinecone.
 
 Updated 12.05.25:
 - Switched from MiniLM (384 dims) to OpenAI text-embedding-3-small (1536 dims)
@@ -22,6 +25,7 @@ Env (via .env or shell):
   PINECONE_API_KEY=...
   PINECONE_INDEX_NAME=matt-portfolio-v2
   PINECONE_NAMESPACE=default
+  LOCAL_INDEX_ONLY=1          # optional: skip the Pinecone upsert
 """
 
 import json
@@ -33,6 +37,10 @@ from dotenv import load_dotenv
 from openai import OpenAI
 from pinecone import Pinecone
 
+from config.constants import LOCAL_VECTOR_INDEX_PREFIX
+from services.vector_index import save_local_index
+from utils.corpus_binary import build_snapshot
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s — %(levelname)s — %(message)s"
 )
@@ -43,6 +51,12 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
 PINECONE_NAMESPACE = os.getenv("PINECONE_NAMESPACE", "default")
+LOCAL_INDEX_ONLY = str(os.getenv("LOCAL_INDEX_ONLY", "")).strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
 
 EMBEDDING_MODEL = "text-embedding-3-small"  # 1536 dims
 
@@ -280,6 +294,35 @@ if __name__ == "__main__":
         f"✅ Generated {len(embeddings)} embeddings (dim={len(embeddings[0])})"
     )
 
+    # ---------------------------
+    # Write local vector index
+    # ---------------------------
+    local_ids: list[str] = []
+    local_meta: list[dict[str, Any]] = []
+    for i, s in enumerate(stories):
+        meta = build_metadata(s)
+        vec_id = str(meta.get("id") or f"story-{i}")
+        meta["id"] = vec_id
+        local_ids.append(vec_id)
+        local_meta.append(meta)
+    save_local_index(
+        local_ids,
+        embeddings,
+        local_meta,
+        prefix=LOCAL_VECTOR_INDEX_PREFIX,
+        model=EMBEDDING_MODEL,
+    )
+    logging.info(
+        f"💾 Wrote local vector index to {LOCAL_VECTOR_INDEX_PREFIX}.npy ({len(local_ids)} vectors)"
+    )
+    snapshot = build_snapshot(
+        STORIES_JSONL, index_prefix=LOCAL_VECTOR_INDEX_PREFIX, model=EMBEDDING_MODEL
+    )
+    logging.info(f"💾 Wrote corpus snapshot to {snapshot}")
+    if LOCAL_INDEX_ONLY:
+        logging.info("⏭️ LOCAL_INDEX_ONLY set — skipping Pinecone upsert.")
+        raise SystemExit(0)
+
     # ---------------------------
     # Upsert to Pinecone
     # ---------------------------
@@ -312,11 +355,7 @@ if __name__ == "__main__":
     for start in range(0, len(stories), batch):
         items = []
         for i in range(start, min(start + batch, len(stories))):
-            vec = embeddings[i]
-            meta = build_metadata(stories[i])
-            vec_id = str(meta.get("id") or f"story-{i}")
-            meta["id"] = vec_id
-            items.append((vec_id, vec, meta))
+            items.append((local_ids[i], embeddings[i], local_meta[i]))
 
         if items:
             index.upsert(vectors=items, namespace=PINECONE_NAMESPACE)
@@ -60,6 +60,33 @@ CONFIDENCE_LOW = 0.20  # Raised from 0.15 to filter phantom similarity noise
 W_PC = 1.0  # Pinecone semantic similarity weight
 W_KW = 0.15  # Keyword overlap weight (raised from 0.0 Aug 8, 2026 -- f5641e7)
 
+# Keyword scorer feeding W_KW (utils/scoring.KeywordIndex):
+#   "overlap" - the set-overlap score (_keyword_score_for_story) that W_KW
+#               was tuned for, served from the inverted index
+#   "bm25"    - field-weighted BM25 over the same index; its scores are
+#               distributed differently, so switching needs an eval run and
+#               a re-tuned W_KW. The local no-hits fallback
+#               (services/rag_service.py) ranks with BM25 explicitly.
+KEYWORD_SCORER = "overlap"
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Reciprocal-rank fusion constant for the local hybrid fallback
+# (services/rag_service.py) when Pinecone returns no hits. 60 is the standard
+# value from Cormack et al.; larger values flatten the head of each ranking.
+RRF_K = 60
+
+# =============================================================================
+# SYNTHESIS RETRIEVAL
+# =============================================================================
+# backend_service.get_synthesis_stories(): one wide query filtered to
+# Theme $in SYNTHESIS_THEMES, bucketed by Theme in-process, instead of one
+# filtered query per theme. top_k covers the whole corpus (capped at Pinecone's
+# include_metadata limit) so buckets match per-theme queries.
+
+SYNTHESIS_SINGLE_QUERY = True
+SYNTHESIS_WIDE_TOP_K = 1000
+
 # =============================================================================
 # PINECONE THRESHOLDS
 # =============================================================================
@@ -67,6 +94,90 @@ W_KW = 0.15  # Keyword overlap weight (raised from 0.0 Aug 8, 2026 -- f5641e7)
 PINECONE_MIN_SIM = 0.15  # Minimum similarity for Pinecone results
 SEARCH_TOP_K = 10  # Stories to fetch from Pinecone (headroom for reranking/filtering)
 
+# =============================================================================
+# LOCAL VECTOR INDEX
+# =============================================================================
+# In-process NumPy index used when VECTOR_BACKEND is "faiss" (the default) or
+# "local". build_custom_embeddings.py writes <prefix>.npy (float32 matrix, one
+# row per story) and <prefix>.manifest.json (ids, model, Pinecone-shaped
+# metadata). When the files are absent the app falls back to Pinecone.
+
+LOCAL_VECTOR_INDEX_PREFIX = "data/story_vectors"
+LOCAL_VECTOR_BACKENDS = frozenset({"faiss", "local"})
+
+# =============================================================================
+# BINARY CORPUS SNAPSHOT
+# =============================================================================
+# utils/corpus_binary.py writes <corpus jsonl><suffix>: normalized stories,
+# facet/vocab views and story vectors in one file. Loaders use it only while
+# its recorded sha256 matches the JSONL; otherwise they parse the JSONL.
+# Rebuild with: python -m utils.corpus_binary
+
+CORPUS_SNAPSHOT_SUFFIX = ".snapshot"
+
+# =============================================================================
+# QUERY EMBEDDING CACHE
+# =============================================================================
+# services/embedding_cache.py: in-memory LRU in front of a SQLite store, keyed
+# by (embedding model, whitespace-normalized text). Landing-page and follow-up
+# chips repeat the same strings, so most of them never hit the API.
+
+EMBEDDING_CACHE_PATH = "data/embedding_cache.sqlite3"
+EMBEDDING_CACHE_MAX_ENTRIES = 2048  # in-memory LRU bound (~12 MB at 1536 dims)
+
+# =============================================================================
+# OPENAI CLIENT POOL
+# =============================================================================
+# services/openai_client.py builds one OpenAI client per credential set on a
+# single keep-alive HTTP pool. The SDK retries 429/5xx/connection errors with
+# exponential backoff up to OPENAI_MAX_RETRIES times.
+
+OPENAI_TIMEOUT_SECONDS = 60.0  # read/write budget per request (chat can be slow)
+OPENAI_CONNECT_TIMEOUT_SECONDS = 5.0
+OPENAI_MAX_RETRIES = 3
+OPENAI_MAX_CONNECTIONS = 20  # Role Match fans out concurrent requests
+OPENAI_KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+# =============================================================================
+# ROLE MATCH RESULT CACHE
+# =============================================================================
+# services/assessment_cache.py: content-addressed cache for Role Match stage 1
+# (JD extraction) and stage 3 (per-requirement assessment) LLM results. Keys
+# hash the normalized input, model, prompt text and corpus version, so a prompt
+# or corpus change is a miss rather than a stale hit. Entries expire after the
+# TTL; both tiers are LRU-bounded.
+
+ASSESSMENT_CACHE_PATH = "data/assessment_cache.sqlite3"
+ASSESSMENT_CACHE_MAX_ENTRIES = 512  # in-memory LRU bound
+ASSESSMENT_CACHE_MAX_DISK_ENTRIES = 20000  # least recently used rows pruned
+ASSESSMENT_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+# =============================================================================
+# TELEMETRY SPOOL
+# =============================================================================
+# services/telemetry_spool.py: every logging path (query log, off-domain and
+# borderline CSVs) appends to a local SQLite spool first. A background
+# replayer forwards records to their sink (Google Sheet, CSV file) in batches
+# of TELEMETRY_BATCH_SIZE, at most TELEMETRY_FLUSH_SECONDS after they were
+# written. A failing sink is retried with exponential backoff; its records
+# stay spooled until it succeeds. Forwarded rows are kept for local analytics
+# for the retention period; the table is capped at TELEMETRY_SPOOL_MAX_ROWS.
+
+TELEMETRY_SPOOL_PATH = "data/telemetry_spool.sqlite3"
+TELEMETRY_BATCH_SIZE = 50
+TELEMETRY_FLUSH_SECONDS = 2.0
+TELEMETRY_RETRY_BASE_SECONDS = 1.0  # doubles per consecutive failure
+TELEMETRY_RETRY_MAX_SECONDS = 300.0
+TELEMETRY_SPOOL_RETENTION_SECONDS = 30 * 24 * 3600
+TELEMETRY_SPOOL_MAX_ROWS = 200_000
+
+# services/csv_log_writer.py: the off-domain and borderline CSV sinks keep
+# their file handles open, write each replayed batch under an exclusive
+# lock (safe with several app processes) and rotate a file past
+# CSV_LOG_MAX_BYTES to <path>.1 .. <path>.<CSV_LOG_BACKUPS>.
+CSV_LOG_MAX_BYTES = 5 * 1024 * 1024
+CSV_LOG_BACKUPS = 3
+
 # Intent families where "Matt"/"Matt's" is substituted with "he"/"his" in the
 # retrieval query so self-referential name tokens don't bias embeddings toward
 # Independent Project stories. The LLM receives the original query verbatim.
@@ -158,6 +269,12 @@ PINECONE_LOWERCASE_FIELDS = {"division", "employer", "project", "place"}
 
 EXCLUDED_DIVISION_VALUES = {"Technology"}  # "technology experience" ≠ Division filter
 
+# Context exclusions (Jan 2026 - Sovereign Narrative Update): an entity
+# preceded by one of these transitional phrases is what the query is ABOUT
+# ("career transition after Accenture"), not a filter TO that entity, so
+# detect_entity() returns None.
+EXCLUSION_PREFIXES = ("after ", "leaving ", "before ", "transition from ", "left ")
+
 # =============================================================================
 # ENTITY ALIASES
 # =============================================================================
@@ -231,7 +348,7 @@ def get_private_bypass_token() -> str | None:
 # =============================================================================
 # Editorial-description layer for Solution/Offering values surfaced on landing
 # pages (Banking, Cross-Industry). Mirrors the ERA_SUBTITLES pattern in
-# ui/components/timeline_view.py: short descriptive phrase per category, falls
+# utils/eras.py: short descriptive phrase per category, falls
 # through to empty string when a key is missing (cards render without
 # description in that case).
 #
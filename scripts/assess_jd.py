@@ -18,6 +18,8 @@ Environment:
     Optional:
       STORIES_JSONL — path to STAR story corpus JSONL
                       (default: echo_star_stories_nlp.jsonl)
+      ROLE_MATCH_NO_CACHE=1 — bypass the Role Match result cache
+                      (data/assessment_cache.sqlite3) and force fresh LLM calls
 
 Exit codes:
     0 = success, JSON on stdout
@@ -72,7 +74,8 @@ def main() -> int:
         stories = load_stories()
 
         # Layer 1: capability (matcher + recommender)
-        assessment = run_assessment(jd_text, stories)
+        use_cache = os.getenv("ROLE_MATCH_NO_CACHE", "") not in ("1", "true")
+        assessment = run_assessment(jd_text, stories, use_cache=use_cache)
         results = assessment.get("results", [])
         extraction = assessment.get("extraction", {})
         recommendation = compute_recommendation(results)
@@ -0,0 +1,214 @@
+"""Persistent result cache for the Role Match pipeline.
+
+The same JD is assessed over and over (demo JD, share links, recruiters
+re-pasting), and every run used to repeat the stage 1 extraction and one
+stage 3 assessment per requirement. This cache stores those LLM results
+under content-addressed keys built by services/jd_assessor.py:
+
+- extraction: normalized JD + model + prompt hash + corpus version
+- assessment: requirement text + candidate story ids + model + prompt hash
+
+Two tiers, like services/embedding_cache.py:
+- A bounded in-memory LRU (ASSESSMENT_CACHE_MAX_ENTRIES)
+- A SQLite table at ASSESSMENT_CACHE_PATH that survives restarts. Rows track
+  last use; the least recently used beyond ASSESSMENT_CACHE_MAX_DISK_ENTRIES
+  are pruned.
+
+Entries older than ASSESSMENT_CACHE_TTL_SECONDS are treated as misses. If the
+database cannot be opened the cache degrades to memory-only.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from config.constants import (
+    ASSESSMENT_CACHE_MAX_DISK_ENTRIES,
+    ASSESSMENT_CACHE_MAX_ENTRIES,
+    ASSESSMENT_CACHE_PATH,
+    ASSESSMENT_CACHE_TTL_SECONDS,
+)
+from config.debug import DEBUG
+
+
+def content_key(*parts: Any) -> str:
+    """sha256 over the JSON encoding of parts (order-sensitive)."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AssessmentCache:
+    """Thread-safe two-tier cache of JSON-serializable results.
+
+    Args:
+        db_path: SQLite file path, or None for a memory-only cache.
+        max_entries: In-memory LRU capacity.
+        max_disk_entries: Row cap for the SQLite table (LRU by last use).
+        ttl_seconds: Age after which an entry is ignored and replaced.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = ASSESSMENT_CACHE_PATH,
+        max_entries: int = ASSESSMENT_CACHE_MAX_ENTRIES,
+        max_disk_entries: int = ASSESSMENT_CACHE_MAX_DISK_ENTRIES,
+        ttl_seconds: float = ASSESSMENT_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.max_disk_entries = max(1, int(max_disk_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        # (kind, key) -> (created_at, JSON text)
+        self._lru: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        if db_path:
+            self._conn = self._open(db_path)
+
+    def _open(self, db_path: str) -> sqlite3.Connection | None:
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " kind TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (kind, key))"
+            )
+            conn.execute(
+                "DELETE FROM results WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            conn.commit()
+            return conn
+        except Exception as e:
+            if DEBUG:
+                print(f"DEBUG assessment cache: disk store disabled ({e})")
+            return None
+
+    @property
+    def persistent(self) -> bool:
+        return self._conn is not None
+
+    def _expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl_seconds
+
+    def _remember(self, key: tuple[str, str], entry: tuple[float, str]) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, kind: str, key: str) -> Any | None:
+        """Return a fresh copy of the cached value, or None."""
+        k = (kind, key)
+        with self._lock:
+            entry = self._lru.get(k)
+            if entry is not None and self._expired(entry[0]):
+                del self._lru[k]
+                entry = None
+            if entry is not None:
+                self._lru.move_to_end(k)
+            elif self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT created_at, value FROM results"
+                        " WHERE kind = ? AND key = ?",
+                        k,
+                    ).fetchone()
+                    if row is not None and not self._expired(row[0]):
+                        entry = (row[0], row[1])
+                        self._remember(k, entry)
+                        self._conn.execute(
+                            "UPDATE results SET last_used = ?"
+                            " WHERE kind = ? AND key = ?",
+                            (time.time(), *k),
+                        )
+                        self._conn.commit()
+                except Exception as e:
+                    if DEBUG:
+                        print(f"DEBUG assessment cache read error: {e}")
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Decode per hit so callers can mutate the result freely
+        return json.loads(entry[1])
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        """Store a JSON-serializable value in both tiers."""
+        try:
+            text = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        now = time.time()
+        k = (kind, key)
+        with self._lock:
+            self._remember(k, (now, text))
+            if self._conn is None:
+                return
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (*k, text, now, now),
+                )
+                self._conn.execute(
+                    "DELETE FROM results WHERE rowid IN ("
+                    " SELECT rowid FROM results ORDER BY last_used DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+                self._conn.commit()
+            except Exception as e:
+                if DEBUG:
+                    print(f"DEBUG assessment cache write error: {e}")
+
+    def stats(self) -> dict:
+        """Counters for the DEBUG sidebar."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._lru),
+                "persistent": self.persistent,
+            }
+
+    def clear(self) -> None:
+        """Drop every entry in both tiers and reset counters."""
+        with self._lock:
+            self._lru.clear()
+            self.hits = self.misses = 0
+            if self._conn is not None:
+                try:
+                    self._conn.execute("DELETE FROM results")
+                    self._conn.commit()
+                except Exception as e:
+                    if DEBUG:
+                        print(f"DEBUG assessment cache clear error: {e}")
+
+
+_CACHE: AssessmentCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_assessment_cache() -> AssessmentCache:
+    """Process-wide cache used by services/jd_assessor.py."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = AssessmentCache()
+    return _CACHE
@@ -0,0 +1,151 @@
+"""Rotating, lock-safe CSV writer for the local diagnostic logs.
+
+log_offdomain() and semantic_router._log_borderline() only spool their
+record (services/telemetry_spool.py); the spool's replayer thread hands
+the records to a CsvLogWriter, registered as the sink for each stream.
+Nothing here runs in the request path.
+
+A CsvLogWriter:
+- writes each batch before returning, as one write per file, and lets
+  OSError propagate so the spool keeps the records and retries the batch;
+- keeps one append handle per file open between writes;
+- rotates a file that has reached max_bytes: <path> becomes <path>.1,
+  .1 becomes .2, and so on up to backups; the oldest is dropped;
+- holds an exclusive flock on <path>.lock while it rotates and writes,
+  and reopens its handle if another process rotated the file, so several
+  app processes can append to one log (POSIX; without fcntl it writes
+  unlocked).
+
+A new or rotated file starts with the header row.
+"""
+
+import csv
+import io
+import os
+import threading
+from typing import Any
+
+from config.constants import CSV_LOG_BACKUPS, CSV_LOG_MAX_BYTES
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process appends only
+    fcntl = None
+
+
+class _CsvFile:
+    """One log file: the open handle and its lock file."""
+
+    def __init__(self, path: str, header: list[str], max_bytes: int, backups: int):
+        self.path = path
+        self.header = header
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._fh: io.TextIOWrapper | None = None
+        self._lock_fh: io.TextIOWrapper | None = None
+
+    def _lock(self) -> None:
+        if self._lock_fh is None:
+            self._lock_fh = open(f"{self.path}.lock", "a")
+        if fcntl is not None:
+            fcntl.flock(self._lock_fh, fcntl.LOCK_EX)
+
+    def _unlock(self) -> None:
+        if fcntl is not None and self._lock_fh is not None:
+            fcntl.flock(self._lock_fh, fcntl.LOCK_UN)
+
+    def _current_handle(self) -> io.TextIOWrapper:
+        """Open handle on self.path, reopened if the file was rotated away."""
+        if self._fh is not None:
+            try:
+                if os.fstat(self._fh.fileno()).st_ino == os.stat(self.path).st_ino:
+                    return self._fh
+            except FileNotFoundError:
+                pass
+            self._fh.close()
+        self._fh = open(self.path, "a", newline="", encoding="utf-8")
+        return self._fh
+
+    def _rotate(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for n in range(self.backups - 1, 0, -1):
+            src = f"{self.path}.{n}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{n + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def write(self, rows: list[list[Any]]) -> None:
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        text = buf.getvalue()
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock()
+        try:
+            fh = self._current_handle()
+            # fstat, not tell(): other processes append to the same file
+            if os.fstat(fh.fileno()).st_size >= self.max_bytes:
+                self._rotate()
+                fh = self._current_handle()
+            if os.fstat(fh.fileno()).st_size == 0:
+                csv.writer(fh).writerow(self.header)
+            fh.write(text)
+            fh.flush()
+        finally:
+            self._unlock()
+
+    def close(self) -> None:
+        for fh in (self._fh, self._lock_fh):
+            if fh is not None:
+                fh.close()
+        self._fh = self._lock_fh = None
+
+
+class CsvLogWriter:
+    """Telemetry-spool sink appending records to the CSV file in their target.
+
+    Args:
+        header: Column names; records are written in this order (missing
+            fields blank).
+        max_bytes: Size at which a file is rotated.
+        backups: Rotated files kept per log.
+    """
+
+    def __init__(
+        self,
+        header: list[str],
+        max_bytes: int = CSV_LOG_MAX_BYTES,
+        backups: int = CSV_LOG_BACKUPS,
+    ):
+        self.header = list(header)
+        self.max_bytes = int(max_bytes)
+        self.backups = int(backups)
+        self._files: dict[str, _CsvFile] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, batch: list[tuple[str, dict[str, Any]]]) -> None:
+        """Append a batch of (path, record) pairs; raises OSError on failure."""
+        with self._lock:
+            by_path: dict[str, list[list[Any]]] = {}
+            for path, record in batch:
+                by_path.setdefault(path, []).append(
+                    [record.get(c, "") for c in self.header]
+                )
+            for path, rows in by_path.items():
+                f = self._files.get(path)
+                if f is None:
+                    f = _CsvFile(path, self.header, self.max_bytes, self.backups)
+                    self._files[path] = f
+                f.write(rows)
+
+    def close(self) -> None:
+        """Close every handle."""
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
@@ -0,0 +1,187 @@
+"""Query embedding cache shared by retrieval and the semantic router.
+
+Two tiers, keyed by (embedding model, whitespace-normalized text):
+- A bounded in-memory LRU (EMBEDDING_CACHE_MAX_ENTRIES)
+- A SQLite table at EMBEDDING_CACHE_PATH that survives restarts, so
+  landing-page chips, follow-up chips, eval golden queries, and probe
+  scripts skip the OpenAI round-trip after the first run.
+
+Vectors are stored as float32 blobs. Writes from one batch share a single
+transaction (put_many), and the WAL database runs with synchronous=NORMAL
+so a commit does not fsync in the request path. If the database cannot be opened
+(read-only filesystem on a hosted deploy, locked file), the cache degrades
+to memory-only instead of failing the query.
+
+Hit/miss counters are exposed via stats() for the DEBUG sidebar.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+from config.constants import EMBEDDING_CACHE_MAX_ENTRIES, EMBEDDING_CACHE_PATH
+from config.debug import DEBUG
+
+
+def normalize_text(text: str | None) -> str:
+    """Collapse whitespace runs and strip. Case is preserved (it affects embeddings)."""
+    return " ".join((text or "").split())
+
+
+class EmbeddingCache:
+    """Thread-safe two-tier embedding cache.
+
+    Args:
+        db_path: SQLite file path, or None for a memory-only cache.
+        max_entries: In-memory LRU capacity.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = EMBEDDING_CACHE_PATH,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self._lru: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if db_path:
+            self._conn = self._open(db_path)
+
+    @staticmethod
+    def _open(db_path: str) -> sqlite3.Connection | None:
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Durable enough for a cache: a crash can only lose recent rows
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " model TEXT NOT NULL,"
+                " text TEXT NOT NULL,"
+                " dim INTEGER NOT NULL,"
+                " vec BLOB NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " PRIMARY KEY (model, text))"
+            )
+            conn.commit()
+            return conn
+        except Exception as e:
+            if DEBUG:
+                print(f"DEBUG embedding cache: disk store disabled ({e})")
+            return None
+
+    @property
+    def persistent(self) -> bool:
+        return self._conn is not None
+
+    def _remember(self, key: tuple[str, str], vector: list[float]) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, model: str, text: str | None) -> list[float] | None:
+        """Return the cached vector or None (and count the hit/miss)."""
+        key = (model, normalize_text(text))
+        if not key[1]:
+            return None
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return vec
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT vec FROM embeddings WHERE model = ? AND text = ?",
+                        key,
+                    ).fetchone()
+                except Exception:
+                    row = None
+                if row is not None:
+                    vec = np.frombuffer(row[0], dtype=np.float32).tolist()
+                    self._remember(key, vec)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return vec
+
+            self.misses += 1
+            return None
+
+    def put(self, model: str, text: str | None, vector: list[float]) -> None:
+        """Store a vector in both tiers. Empty text and zero vectors are ignored."""
+        self.put_many(model, [(text, vector)])
+
+    def put_many(
+        self, model: str, items: Iterable[tuple[str | None, list[float]]]
+    ) -> None:
+        """Store (text, vector) pairs in both tiers with one disk commit.
+
+        Empty texts and zero vectors are ignored, as in put().
+        """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vector in items:
+                key = (model, normalize_text(text))
+                if not key[1] or not vector or not any(vector):
+                    continue
+                self._remember(key, list(vector))
+                if self._conn is not None:
+                    blob = np.asarray(vector, dtype=np.float32).tobytes()
+                    rows.append((*key, len(vector), blob, now))
+            if rows:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    self._conn.commit()
+                except Exception as e:
+                    if DEBUG:
+                        print(f"DEBUG embedding cache write error: {e}")
+
+    def stats(self) -> dict:
+        """Counters for the DEBUG sidebar."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._lru),
+                "persistent": self.persistent,
+            }
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier and reset counters (disk store untouched)."""
+        with self._lock:
+            self._lru.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+
+_CACHE: EmbeddingCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Process-wide cache shared by pinecone_service and semantic_router."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = EmbeddingCache()
+    return _CACHE
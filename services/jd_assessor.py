@@ -10,13 +10,21 @@ Architecture: Three-step pipeline (see ADR 016)
   3. LLM assessment pass — requirements + candidate stories → match report
 """
 
+import hashlib
 import json
-import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from openai import OpenAI
 
-from services.pinecone_service import pinecone_semantic_search
+from services.assessment_cache import (
+    AssessmentCache,
+    content_key,
+    get_assessment_cache,
+)
+from services.embedding_cache import normalize_text
+from services.openai_client import get_openai_client
+from services.pinecone_service import EmbeddingContext, pinecone_semantic_search
 
 # =============================================================================
 # JD EXTRACTION PROMPT
@@ -185,14 +193,15 @@ ASSESSMENT_MODEL = "gpt-4o"
 ASSESSMENT_TEMPERATURE = 0.0
 DEFAULT_TOP_K = 5
 
+# Stage 3 runs per requirement on a bounded thread pool. The cap keeps a
+# 15-requirement JD well under gpt-4o TPM limits; rate-limited calls are
+# retried by the pooled client's SDK backoff (OPENAI_MAX_RETRIES).
+MAX_CONCURRENT_REQUIREMENTS = 6
+
 
 def _get_openai_client() -> OpenAI:
-    """Build an OpenAI client using the same env-var pattern as the rest of the app."""
-    return OpenAI(
-        api_key=os.getenv("OPENAI_API_KEY"),
-        project=os.getenv("OPENAI_PROJECT_ID"),
-        organization=os.getenv("OPENAI_ORG_ID"),
-    )
+    """Shared pooled OpenAI client (OPENAI_API_KEY / _PROJECT_ID / _ORG_ID env vars)."""
+    return get_openai_client()
 
 
 def extract_requirements(client: OpenAI, jd_text: str) -> dict:
@@ -213,18 +222,24 @@ def extract_requirements(client: OpenAI, jd_text: str) -> dict:
 
 
 def retrieve_stories(
-    requirement_text: str, stories: list, top_k: int = DEFAULT_TOP_K
+    requirement_text: str,
+    stories: list,
+    top_k: int = DEFAULT_TOP_K,
+    embedding_ctx: EmbeddingContext | None = None,
 ) -> list:
     """Stage 2 — query Pinecone for candidate stories matching a requirement.
 
     Returns a list of trimmed story dicts (title, client, id, score, STAR fields)
     suitable for inclusion in the assessment prompt. Empty list if no hits.
+    Pass an embedding_ctx pre-filled by retrieve_stories_batch() / embed_many()
+    to skip the per-requirement embedding call.
     """
     results = pinecone_semantic_search(
         query=requirement_text,
         filters={},
         stories=stories,
         top_k=top_k,
+        embedding_ctx=embedding_ctx,
     )
     if not results:
         return []
@@ -243,6 +258,27 @@ def retrieve_stories(
     ]
 
 
+def retrieve_stories_batch(
+    requirements: list[str],
+    stories: list,
+    top_k: int = DEFAULT_TOP_K,
+    embedding_ctx: EmbeddingContext | None = None,
+) -> list[list]:
+    """Stage 2 for a whole JD — one embeddings call, then one query per requirement.
+
+    All requirement texts are embedded with a single embeddings.create(input=[...])
+    (cache misses only), then each vector query runs as in retrieve_stories().
+
+    Returns one candidate list per requirement, in input order.
+    """
+    ctx = embedding_ctx if embedding_ctx is not None else EmbeddingContext()
+    ctx.embed_many(requirements)
+    return [
+        retrieve_stories(text, stories, top_k=top_k, embedding_ctx=ctx)
+        for text in requirements
+    ]
+
+
 def _format_candidates_for_prompt(candidate_stories: list) -> str:
     """Format retrieved stories as the user-message body for the assessment LLM."""
     out = ""
@@ -294,12 +330,118 @@ def assess_requirement(
     return json.loads(response.choices[0].message.content)
 
 
-def run_assessment(jd_text: str, stories: list[dict]) -> dict:
+# Corpus version memo: (stories list, its length, version hash)
+_CORPUS_VERSION: tuple[list, int, str] | None = None
+
+
+def corpus_version(stories: list[dict]) -> str:
+    """Content hash of the story corpus, memoized per list object.
+
+    Any story edit (not just add/remove) changes the version, so cached
+    assessments citing the old text are not reused.
+    """
+    global _CORPUS_VERSION
+    memo = _CORPUS_VERSION
+    if memo is not None and memo[0] is stories and memo[1] == len(stories):
+        return memo[2]
+    version = content_key(stories)[:16]
+    _CORPUS_VERSION = (stories, len(stories), version)
+    return version
+
+
+def _prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def extraction_cache_key(jd_text: str, stories: list[dict]) -> str:
+    """Stage 1 cache key: normalized JD + model + prompt hash + corpus version."""
+    return content_key(
+        "extraction",
+        normalize_text(jd_text),
+        ASSESSMENT_MODEL,
+        ASSESSMENT_TEMPERATURE,
+        _prompt_hash(JD_EXTRACTION_PROMPT),
+        corpus_version(stories),
+    )
+
+
+def assessment_cache_key(
+    requirement: str, candidate_stories: list, prompt_hash: str, corpus: str = ""
+) -> str:
+    """Stage 3 cache key: requirement + candidate story ids + model + prompt hash.
+
+    Candidate order is part of the key (it is part of the prompt).
+    """
+    return content_key(
+        "assessment",
+        normalize_text(requirement),
+        [c.get("id", "") for c in candidate_stories],
+        ASSESSMENT_MODEL,
+        ASSESSMENT_TEMPERATURE,
+        prompt_hash,
+        corpus,
+    )
+
+
+def _assess_one(
+    client: OpenAI,
+    req: dict,
+    candidates: list,
+    stories: list[dict],
+    cache: AssessmentCache | None = None,
+    prompt_hash: str = "",
+) -> dict:
+    """Stage 3 for one requirement. Never raises — failures become gap entries.
+
+    Error entries carry an "error" key so callers can tell "no evidence" from
+    "couldn't assess". They are never cached.
+    """
+    try:
+        key = None
+        assessment = None
+        if cache is not None:
+            key = assessment_cache_key(
+                req["text"], candidates, prompt_hash, corpus_version(stories)
+            )
+            assessment = cache.get("assessment", key)
+        if assessment is None:
+            assessment = assess_requirement(client, req["text"], candidates)
+            if key is not None:
+                cache.put("assessment", key, assessment)
+    except Exception as e:
+        assessment = {
+            "requirement": req["text"],
+            "match_status": "gap",
+            "evidence": [],
+            "gap_explanation": "Note: assessment unavailable for this requirement.",
+            "confidence": "low",
+            "error": f"{type(e).__name__}: {e}",
+        }
+    assessment["category"] = req["category"]
+    return assessment
+
+
+def run_assessment(
+    jd_text: str,
+    stories: list[dict],
+    max_workers: int = MAX_CONCURRENT_REQUIREMENTS,
+    use_cache: bool = True,
+) -> dict:
     """Run the full three-stage pipeline against a job description.
 
+    Stage 2 (retrieve) runs on the calling thread: pinecone_semantic_search()
+    records its hits in st.session_state. Stage 3 (assess) runs concurrently
+    across requirements, at most max_workers in flight, so wall-clock time
+    tracks the slowest single LLM call rather than the sum. Results keep
+    extraction order.
+
     Args:
         jd_text: Raw JD text pasted by the user.
         stories: Full story corpus loaded by app.py.
+        max_workers: Max requirements in flight (1 = serial).
+        use_cache: Read/write the persistent result cache
+            (services/assessment_cache.py). False forces fresh LLM calls and
+            leaves the cache untouched.
 
     Returns:
         {
@@ -312,17 +454,31 @@ def run_assessment(jd_text: str, stories: list[dict]) -> dict:
                     "evidence": [...],
                     "gap_explanation": "...",
                     "confidence": "high" | "medium" | "low",
+                    "error": "...",  # only when the requirement failed
                 },
                 ...
             ],
         }
 
+    A requirement that fails after retries comes back as a low-confidence gap
+    with an "error" key. If every requirement fails (e.g. OpenAI is down), the
+    first error is raised so the UI shows its error state instead of a report
+    of all gaps.
+
     The returned shape is compatible with compute_recommendation().
     """
     client = _get_openai_client()
+    cache = get_assessment_cache() if use_cache else None
 
     # Stage 1
-    extraction = extract_requirements(client, jd_text)
+    extraction = None
+    if cache is not None:
+        extraction_key = extraction_cache_key(jd_text, stories)
+        extraction = cache.get("extraction", extraction_key)
+    if extraction is None:
+        extraction = extract_requirements(client, jd_text)
+        if cache is not None:
+            cache.put("extraction", extraction_key, extraction)
 
     # Build flat list with category attached so the UI can group by required vs preferred
     all_requirements = []
@@ -338,13 +494,32 @@ def run_assessment(jd_text: str, stories: list[dict]) -> dict:
     for r in extraction.get("implicit_requirements", []) or []:
         all_requirements.append({"text": r["requirement"], "category": "required"})
 
-    # Stages 2 + 3
+    # Stage 2, then stage 3 — executor.map preserves requirement order
     match_results = []
-    for req in all_requirements:
-        candidates = retrieve_stories(req["text"], stories, top_k=DEFAULT_TOP_K)
-        assessment = assess_requirement(client, req["text"], candidates)
-        assessment["category"] = req["category"]
-        match_results.append(assessment)
+    if all_requirements:
+        candidates = retrieve_stories_batch(
+            [req["text"] for req in all_requirements], stories
+        )
+        # Profile-dependent prompt: hash once per run, not per requirement
+        prompt_hash = (
+            _prompt_hash(build_assessment_prompt()) if cache is not None else ""
+        )
+
+        workers = max(1, min(int(max_workers), len(all_requirements)))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="role-match"
+        ) as pool:
+            match_results = list(
+                pool.map(
+                    lambda req, found: _assess_one(
+                        client, req, found, stories, cache, prompt_hash
+                    ),
+                    all_requirements,
+                    candidates,
+                )
+            )
+        if all(r.get("error") for r in match_results):
+            raise RuntimeError(match_results[0]["error"])
 
     return {
         "extraction": extraction,
@@ -0,0 +1,105 @@
+"""Shared OpenAI client registry.
+
+Every service used to build its own `OpenAI(...)`, several of them on every
+call, so each embedding or chat request paid for a fresh TLS handshake.
+get_openai_client() returns one client per (api_key, project, organization),
+all sharing a single keep-alive httpx pool with explicit timeouts and SDK
+retry/backoff (OPENAI_* settings in config/constants.py).
+
+The OpenAI class is resolved from the `openai` module at call time, and the
+registry is keyed on it, so tests that patch `openai.OpenAI` still get
+their mock.
+"""
+
+import os
+import threading
+
+from dotenv import load_dotenv
+
+from config.constants import (
+    OPENAI_CONNECT_TIMEOUT_SECONDS,
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_RETRIES,
+    OPENAI_TIMEOUT_SECONDS,
+)
+
+load_dotenv()
+
+_CLIENTS: dict[tuple, tuple[type, object]] = {}
+_HTTP_CLIENT = None
+_LOCK = threading.Lock()
+
+
+def _timeout():
+    import httpx
+
+    return httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+
+
+def _get_http_client():
+    """Process-wide keep-alive pool shared by every OpenAI client."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        import httpx
+        import openai
+
+        # DefaultHttpxClient keeps the SDK's own defaults (redirects, etc.)
+        factory = getattr(openai, "DefaultHttpxClient", httpx.Client)
+        _HTTP_CLIENT = factory(
+            timeout=_timeout(),
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_CONNECTIONS,
+                keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+    return _HTTP_CLIENT
+
+
+def get_openai_client(
+    api_key: str | None = None,
+    *,
+    project: str | None = None,
+    organization: str | None = None,
+):
+    """Return the shared OpenAI client for these credentials.
+
+    Unset arguments fall back to OPENAI_API_KEY / OPENAI_PROJECT_ID /
+    OPENAI_ORG_ID, the env-var pattern used across the app. Construction
+    errors (e.g. missing key) propagate and nothing is cached, so callers'
+    existing try/except fallbacks behave as before.
+    """
+    import openai
+
+    cls = openai.OpenAI
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+    project = project or os.getenv("OPENAI_PROJECT_ID")
+    organization = organization or os.getenv("OPENAI_ORG_ID")
+    key = (id(cls), api_key, project, organization)
+
+    entry = _CLIENTS.get(key)
+    if entry is not None and entry[0] is cls:
+        return entry[1]
+
+    with _LOCK:
+        entry = _CLIENTS.get(key)
+        if entry is not None and entry[0] is cls:
+            return entry[1]
+        client = cls(
+            api_key=api_key,
+            project=project,
+            organization=organization,
+            timeout=_timeout(),
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=_get_http_client(),
+        )
+        # Holding cls keeps id(cls) from being reused by another class
+        _CLIENTS[key] = (cls, client)
+        return client
+
+
+def reset_openai_clients() -> None:
+    """Drop cached clients (tests, credential rotation). The pool is kept."""
+    with _LOCK:
+        _CLIENTS.clear()
@@ -3,13 +3,14 @@
 import os
 from typing import Any
 
+import numpy as np
 import streamlit as st
 from dotenv import load_dotenv
-from openai import OpenAI
 
 from config.constants import (
     DEFAULT_EMBEDDING_MODEL,
     ENTITY_SEARCH_FIELDS,
+    LOCAL_VECTOR_BACKENDS,
     PINECONE_LOWERCASE_FIELDS,
     PINECONE_MIN_SIM,
     SEARCH_TOP_K,
@@ -18,7 +19,13 @@ from config.constants import (
 )
 from config.debug import DEBUG
 from config.settings import get_conf
-from utils.scoring import _hybrid_score, _keyword_score_for_story
+from services.embedding_cache import get_embedding_cache
+from services.openai_client import get_openai_client
+from services.vector_index import load_local_index
+from utils.corpus_index import get_corpus_index
+from utils.corpus_loader import corpus_for
+from utils.scoring import _hybrid_score, get_keyword_index
+from utils.tracing import span, traced
 
 load_dotenv()
 
@@ -137,6 +144,87 @@ def _init_pinecone():
         return None
 
 
+# =========================
+# Local vector index (VECTOR_BACKEND=faiss / local)
+# =========================
+_LOCAL_INDEX = None
+_LOCAL_INDEX_TRIED = False
+
+
+def _init_local_index():
+    """Lazy load of the in-process NumPy index (None if not built)."""
+    global _LOCAL_INDEX, _LOCAL_INDEX_TRIED
+    if _LOCAL_INDEX is not None or _LOCAL_INDEX_TRIED:
+        return _LOCAL_INDEX
+    _LOCAL_INDEX_TRIED = True
+    _LOCAL_INDEX = load_local_index(model=EMBEDDING_MODEL)
+    if DEBUG:
+        n = len(_LOCAL_INDEX) if _LOCAL_INDEX is not None else 0
+        print(f"DEBUG local index: loaded={_LOCAL_INDEX is not None} vectors={n}")
+    return _LOCAL_INDEX
+
+
+def _get_vector_index():
+    """Return the vector index selected by VECTOR_BACKEND.
+
+    "faiss" (default) and "local" use the in-process index when
+    build_custom_embeddings.py has written it, falling back to Pinecone so
+    existing deployments keep working. "pinecone" always uses Pinecone.
+    Both backends expose the same query() / describe_index_stats() API.
+    """
+    if VECTOR_BACKEND in LOCAL_VECTOR_BACKENDS:
+        local = _init_local_index()
+        if local is not None:
+            return local
+    return _init_pinecone()
+
+
+def local_vector_scores(
+    query: str,
+    stories: list[dict],
+    embedding_ctx: "EmbeddingContext | None" = None,
+) -> np.ndarray | None:
+    """Cosine scores from the local story index, aligned to story order.
+
+    Used by the degraded-mode ranker in rag_service, so it never calls the
+    embeddings API: the query vector must already be in embedding_ctx or the
+    shared embedding cache (pinecone_semantic_search() puts it there when the
+    embedding succeeded). Stories missing from the index score NaN.
+
+    When stories is the app corpus loaded from a binary snapshot, its
+    vectors are already in story order and one product scores them all.
+
+    Returns None when there is no local index or no usable query vector.
+    """
+    idx = _init_local_index()
+    if idx is None or not query:
+        return None
+    vec = embedding_ctx.get(query) if embedding_ctx else None
+    if vec is None:
+        vec = get_embedding_cache().get(EMBEDDING_MODEL, query.strip())
+    if not vec or not any(vec) or len(vec) != idx.dimension:
+        return None
+
+    corpus = corpus_for(stories)
+    if (
+        corpus is not None
+        and corpus.vectors is not None
+        and corpus.vector_model == EMBEDDING_MODEL
+        and corpus.vectors.shape == (len(stories), idx.dimension)
+    ):
+        q = np.asarray(vec, dtype=np.float32)
+        return (corpus.vectors @ (q / np.linalg.norm(q))).astype(np.float64)
+
+    sims = idx.scores(vec)
+    row_by_id = {sid: row for row, sid in enumerate(idx.ids)}
+    out = np.full(len(stories), np.nan, dtype=np.float64)
+    for i, s in enumerate(stories):
+        row = row_by_id.get(str(s.get("id")))
+        if row is not None:
+            out[i] = sims[row]
+    return out
+
+
 def _safe_json(obj):
     """Convert Pinecone objects to JSON-serializable dicts."""
     try:
@@ -175,10 +263,15 @@ def _summarize_index_stats(stats: dict) -> dict:
     }
 
 
+@traced("pinecone_search")
 def pinecone_semantic_search(
-    query: str, filters: dict, stories: list, top_k: int = SEARCH_TOP_K
+    query: str,
+    filters: dict,
+    stories: list,
+    top_k: int = SEARCH_TOP_K,
+    embedding_ctx: "EmbeddingContext | None" = None,
 ) -> list[dict] | None:
-    idx = _init_pinecone()
+    idx = _get_vector_index()
     if not idx or not query:
         if DEBUG:
             print(
@@ -225,22 +318,25 @@ def pinecone_semantic_search(
             )
 
     try:
-        qvec = _embed(query)
+        with span("embedding"):
+            qvec = embedding_ctx.embed(query) if embedding_ctx else _embed(query)
         if DEBUG:
             print(f"DEBUG Embeddings: qvec_dim={len(qvec)} model={EMBEDDING_MODEL}")
             print(
                 f"DEBUG Pinecone query → index={_PINECONE_INDEX or PINECONE_INDEX_NAME}, namespace={PINECONE_NAMESPACE}"
             )
 
-        res = idx.query(
-            vector=qvec,
-            top_k=top_k,
-            include_metadata=True,
-            namespace=PINECONE_NAMESPACE,
-            filter=pc_filter or None,
-        )
+        with span("vector_query"):
+            res = idx.query(
+                vector=qvec,
+                top_k=top_k,
+                include_metadata=True,
+                namespace=PINECONE_NAMESPACE,
+                filter=pc_filter or None,
+            )
 
         matches = getattr(res, "matches", []) or []
+        corpus = get_corpus_index(stories)
 
         # --- DEBUG: snapshot Pinecone info to session (compact) ---
         if DEBUG:
@@ -248,7 +344,7 @@ def pinecone_semantic_search(
                 preview = []
                 for m in matches[:8]:
                     sid, score, meta = _extract_match_fields(m)
-                    found = any(str(s.get("id")) == str(sid) for s in stories)
+                    found = sid in corpus
                     title = (meta or {}).get("title") or ""
                     client = (meta or {}).get("client") or ""
                     if title and client:
@@ -295,15 +391,23 @@ def pinecone_semantic_search(
         if pc_snippets:
             pc_snippets.clear()
 
+        resolved = []
         for m in matches:
             sid, score, meta = _extract_match_fields(m)
             if not sid:
                 continue
 
-            story = next((s for s in stories if str(s.get("id")) == str(sid)), None)
+            story = corpus.get(sid)
             if not story:
                 continue
+            resolved.append((sid, score, meta, story))
+
+        # One pass over the inverted index scores every hit
+        kw_scores = get_keyword_index(stories).scores_for(
+            [r[3] for r in resolved], query
+        )
 
+        for (sid, score, meta, story), kw in zip(resolved, kw_scores, strict=True):
             snip = meta.get("summary") or meta.get("snippet") or ""
             if snip and pc_snippets is not None:
                 try:
@@ -311,7 +415,6 @@ def pinecone_semantic_search(
                 except Exception:
                     pass
 
-            kw = _keyword_score_for_story(story, query)
             blended = _hybrid_score(score, kw)
             if pc_last_ids is not None:
                 try:
@@ -339,15 +442,18 @@ def pinecone_semantic_search(
                 }
             )
 
-        st.session_state["last_results"] = hits
-        st.session_state["last_sources"] = [
-            {
-                "id": h["story"].get("id"),
-                "title": h["story"].get("title"),
-                "client": h["story"].get("client"),
-            }
-            for h in hits[:5]
-        ]
+        _safe_session_set("last_results", hits)
+        _safe_session_set(
+            "last_sources",
+            [
+                {
+                    "id": h["story"].get("id"),
+                    "title": h["story"].get("title"),
+                    "client": h["story"].get("client"),
+                }
+                for h in hits[:5]
+            ],
+        )
 
         hits.sort(key=lambda h: h.get("score", 0.0), reverse=True)
 
@@ -355,9 +461,9 @@ def pinecone_semantic_search(
             h for h in hits if (h.get("pc_score", 0.0) or 0.0) >= PINECONE_MIN_SIM
         ]
         if strong:
-            st.session_state["__pc_suppressed__"] = False
+            _safe_session_set("__pc_suppressed__", False)
             return strong
-        st.session_state["__pc_suppressed__"] = True
+        _safe_session_set("__pc_suppressed__", True)
         return hits[:3]
 
     except Exception as e:
@@ -369,29 +475,31 @@ def pinecone_semantic_search(
 # =========================
 # OpenAI Embeddings
 # =========================
-_OPENAI_CLIENT = None
-
-
 def _get_openai_client():
-    """Lazy init OpenAI client."""
-    global _OPENAI_CLIENT
-    if _OPENAI_CLIENT is None:
-        _OPENAI_CLIENT = OpenAI(api_key=OPENAI_API_KEY)
-    return _OPENAI_CLIENT
+    """Shared pooled OpenAI client (services/openai_client.py)."""
+    return get_openai_client(OPENAI_API_KEY)
 
 
 def _embed(text: str) -> list[float]:
     """
     Generate query embedding using OpenAI text-embedding-3-small.
     Must match the model used in build_custom_embeddings.py.
+    Served from the shared embedding cache when the text was seen before.
     """
     if not text:
         return [0.0] * _DEF_DIM
 
+    cache = get_embedding_cache()
+    cached = cache.get(EMBEDDING_MODEL, text)
+    if cached is not None:
+        return cached
+
     try:
         client = _get_openai_client()
         response = client.embeddings.create(model=EMBEDDING_MODEL, input=text)
-        return response.data[0].embedding
+        vec = response.data[0].embedding
+        cache.put(EMBEDDING_MODEL, text, vec)
+        return vec
     except Exception as e:
         if DEBUG:
             print(f"DEBUG OpenAI embedding error: {e}")
@@ -399,6 +507,92 @@ def _embed(text: str) -> list[float]:
         return [0.0] * _DEF_DIM
 
 
+def _embed_batch(texts: list[str]) -> list[list[float]]:
+    """
+    Embed many texts with a single embeddings.create(input=[...]) call.
+
+    Cached texts are served from the shared embedding cache; only misses go
+    to OpenAI. Output is aligned with texts. Empty texts and failures get a
+    zero vector, matching _embed().
+    """
+    cache = get_embedding_cache()
+    out: list[list[float] | None] = []
+    missing: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        vec = cache.get(EMBEDDING_MODEL, text) if text else [0.0] * _DEF_DIM
+        out.append(vec)
+        if vec is None:
+            missing.setdefault(text, []).append(i)
+
+    if missing:
+        batch = list(missing)
+        try:
+            client = _get_openai_client()
+            response = client.embeddings.create(model=EMBEDDING_MODEL, input=batch)
+            # The API may return items out of order; .index maps back to input
+            fresh = [(batch[item.index], item.embedding) for item in response.data]
+            for text, vec in fresh:
+                for i in missing[text]:
+                    out[i] = vec
+            cache.put_many(EMBEDDING_MODEL, fresh)
+        except Exception as e:
+            if DEBUG:
+                print(f"DEBUG OpenAI batch embedding error: {e}")
+
+    return [vec if vec is not None else [0.0] * _DEF_DIM for vec in out]
+
+
+class EmbeddingContext:
+    """Per-request memo of query embeddings.
+
+    One Ask Agy turn embeds the same question in the semantic router,
+    in retrieval, and again in synthesis. Create one context per turn and
+    pass it through; each distinct string (after strip) is embedded once.
+    A changed string -- e.g. _build_retrieval_query() substituting "Matt"
+    -- is a new key and gets its own embedding.
+
+    Zero vectors from a failed _embed() call are not memoized, so a later
+    stage can retry.
+    """
+
+    def __init__(self):
+        self._vectors: dict[str, list[float]] = {}
+
+    @staticmethod
+    def _key(text: str | None) -> str:
+        return (text or "").strip()
+
+    def get(self, text: str | None) -> list[float] | None:
+        """Return the memoized vector for text, or None."""
+        return self._vectors.get(self._key(text))
+
+    def put(self, text: str | None, vector: list[float]) -> None:
+        """Memoize a vector computed elsewhere (e.g. by the semantic router)."""
+        key = self._key(text)
+        if key and vector and any(vector):
+            self._vectors[key] = vector
+
+    def embed(self, text: str | None) -> list[float]:
+        """Return the memoized vector, embedding via _embed() on a miss."""
+        vec = self.get(text)
+        if vec is None:
+            vec = _embed(self._key(text))
+            self.put(text, vec)
+        return vec
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Like embed() for several texts; all misses share one API call."""
+        keys = [self._key(t) for t in texts]
+        missing = list(dict.fromkeys(k for k in keys if k and self.get(k) is None))
+        if missing:
+            for key, vec in zip(missing, _embed_batch(missing), strict=True):
+                self.put(key, vec)
+        return [self.get(k) or [0.0] * _DEF_DIM for k in keys]
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+
 def _extract_match_fields(m) -> tuple[str, float, dict]:
     """
     Normalize a Pinecone match object or dict into (sid, score, metadata).
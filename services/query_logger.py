@@ -1,10 +1,12 @@
 from datetime import datetime
-from threading import Thread
 
 import gspread
 import streamlit as st
 from google.oauth2.service_account import Credentials
 
+from services import telemetry_spool
+from utils.tracing import Trace, current_trace
+
 SHEET_ID = "1Xxsh7hBx6yh8K2Vn1r6ST6JTACIblUBOGbQ2QBvrAk4"
 HEADERS = [
     "Event Type",
@@ -43,6 +45,25 @@ HEADERS = [
     "Top Score",
 ]
 
+# Ask Agy stage timings (utils/tracing span name -> column), in milliseconds.
+# Kept out of HEADERS and appended after it so existing columns never move;
+# blank when the stage did not run (e.g. no Pinecone call on a rules reject).
+STAGE_HEADERS = {
+    "total": "Total ms",
+    "nonsense_rules": "Rules ms",
+    "semantic_router": "Router ms",
+    "entity_detection": "Entity ms",
+    "token_overlap": "Overlap ms",
+    "semantic_search": "Search ms",
+    "pinecone_search": "Pinecone ms",
+    "embedding": "Embed ms",
+    "vector_query": "Vector Query ms",
+    "diversification": "Rank ms",
+    "synthesis_retrieval": "Synthesis ms",
+    "llm": "LLM ms",
+}
+SHEET_HEADERS = HEADERS + list(STAGE_HEADERS.values())
+
 _headers_checked = False
 
 
@@ -51,7 +72,7 @@ def is_bot() -> bool:
 
     Reads the User-Agent from st.context and checks against the
     MONITORING_BOT_SIGNATURES list in config/constants.py. Call from the
-    main Streamlit thread (before spawning daemon threads) since
+    main Streamlit thread (before handing rows to the writer thread) since
     st.context is thread-local.
 
     Used by Role Match logging call sites to skip logging for bot
@@ -90,8 +111,8 @@ def _ensure_headers(sheet):
         return
     try:
         row1 = sheet.row_values(1)
-        if not row1 or len(row1) != len(HEADERS):
-            sheet.update(values=[HEADERS], range_name="A1")
+        if not row1 or len(row1) != len(SHEET_HEADERS):
+            sheet.update(values=[SHEET_HEADERS], range_name="A1")
         _headers_checked = True
     except Exception:
         pass
@@ -123,25 +144,52 @@ def _capture_context():
     return user_agent, screen_size, timezone, referrer
 
 
-def _append_row(row):
-    """Append a single row to the sheet. Called from daemon threads.
+class _SheetSink:
+    """Telemetry-spool sink that appends query-log records to the sheet.
+
+    Every log_* call spools its row (services/telemetry_spool.py); the
+    spool's replayer hands them here in batches, written with one
+    append_rows call. The authorized sheet is kept between batches and
+    dropped after a failed write, so the replayer's retry re-authorizes.
     To suppress logging during evals, set st.session_state['__suppress_logging__'] = True
-    in the eval runner before calling any log_* functions."""
-    try:
-        sheet = get_sheet()
-        if sheet:
-            _ensure_headers(sheet)
-            sheet.append_row(row)
-        else:
-            pass
-    except Exception:
-        pass
+    in the eval runner before calling any log_* functions.
+    """
+
+    def __init__(self):
+        self._sheet = None
+
+    def __call__(self, batch):
+        if self._sheet is None:
+            self._sheet = get_sheet()
+            if self._sheet is None:
+                raise RuntimeError("query log sheet unavailable")
+        rows = [[record.get(h, "") for h in SHEET_HEADERS] for _, record in batch]
+        try:
+            _ensure_headers(self._sheet)
+            self._sheet.append_rows(rows)
+        except Exception:
+            self._sheet = None
+            raise
+
+
+_sheet_sink = _SheetSink()
+telemetry_spool.register_sink("query_log", _sheet_sink)
+
+
+def _enqueue(row):
+    """Spool a row for the sheet. Never waits on the network."""
+    telemetry_spool.spool("query_log", dict(zip(SHEET_HEADERS, row, strict=True)))
+
+
+def flush() -> bool:
+    """Forward every spooled row now; True if none is left pending."""
+    return telemetry_spool.flush()
 
 
 def _build_row(event_type, **fields):
-    """Build a row list matching HEADERS order. Missing fields default to empty."""
+    """Build a row list matching SHEET_HEADERS order. Missing fields default to empty."""
     row = []
-    for header in HEADERS:
+    for header in SHEET_HEADERS:
         if header == "Event Type":
             row.append(event_type)
         elif header == "Timestamp":
@@ -151,6 +199,19 @@ def _build_row(event_type, **fields):
     return row
 
 
+def _stage_fields(trace: Trace | None) -> dict[str, int]:
+    """Stage timing columns for a trace, rounded to whole milliseconds."""
+    if trace is None:
+        return {}
+    durations = trace.durations()
+    durations["total"] = trace.total_ms
+    return {
+        column: round(durations[stage])
+        for stage, column in STAGE_HEADERS.items()
+        if stage in durations
+    }
+
+
 def log_query(
     query: str,
     page: str = "Ask Agy",
@@ -160,6 +221,7 @@ def log_query(
     redirect_reason: str = "",
     top_score: float
     | str = "",  # "" = no search ran; 0.0 = search ran, no hits; float = real score
+    trace: Trace | None = None,  # default: the trace of the running turn
 ):
     # Skip logging for known monitoring bots (HeadlessChrome regression runs,
     # UptimeRobot keep-alive pings, etc.). Mirrors the page_load filter in
@@ -169,7 +231,7 @@ def log_query(
     # tests/unit/test_query_logger.py::TestLogQueryBotFilter.
     if is_bot():
         return
-    # Capture context in main thread before spawning daemon
+    # Capture context in main thread before handing the row to the writer
     user_agent, screen_size, timezone, referrer = _capture_context()
     row = _build_row(
         "query",
@@ -185,9 +247,10 @@ def log_query(
             "User-Agent": user_agent,
             "Screen Width": screen_size,
             "Top Score": top_score,
+            **_stage_fields(trace or current_trace()),
         },
     )
-    Thread(target=_append_row, args=(row,), daemon=True).start()
+    _enqueue(row)
 
 
 def log_page_load(
@@ -216,7 +279,7 @@ def log_page_load(
             "UTM Term": utm_term,
         },
     )
-    Thread(target=_append_row, args=(row,), daemon=True).start()
+    _enqueue(row)
 
 
 def log_feedback(
@@ -237,7 +300,7 @@ def log_feedback(
             "Msg Hash": str(msg_hash),
         },
     )
-    Thread(target=_append_row, args=(row,), daemon=True).start()
+    _enqueue(row)
 
 
 # =============================================================================
@@ -296,7 +359,7 @@ def log_role_match_assessment(
             "UTM Content": utm_content,
         },
     )
-    Thread(target=_append_row, args=(row,), daemon=True).start()
+    _enqueue(row)
 
 
 def log_role_match_chip_click(
@@ -317,7 +380,7 @@ def log_role_match_chip_click(
             "Session ID": session_id,
         },
     )
-    Thread(target=_append_row, args=(row,), daemon=True).start()
+    _enqueue(row)
 
 
 def log_role_match_action(
@@ -338,4 +401,4 @@ def log_role_match_action(
             "Session ID": session_id,
         },
     )
-    Thread(target=_append_row, args=(row,), daemon=True).start()
+    _enqueue(row)
@@ -1,12 +1,18 @@
 """RAG (Retrieval-Augmented Generation) service - semantic search orchestration."""
 
+import math
+
+import numpy as np
 import streamlit as st
 
 from config.constants import CONFIDENCE_HIGH, CONFIDENCE_LOW, SEARCH_TOP_K
 from config.debug import DEBUG
-from services.pinecone_service import pinecone_semantic_search
+from services.pinecone_service import local_vector_scores, pinecone_semantic_search
+from utils.corpus_loader import build_vocab
 from utils.formatting import build_5p_summary
-from utils.validation import _tokenize
+from utils.scoring import keyword_scores, reciprocal_rank_fusion
+from utils.story_record import StoryHit
+from utils.tracing import traced
 
 
 def _safe_session_set(key: str, value):
@@ -25,27 +31,79 @@ _KNOWN_VOCAB: set[str] = set()
 # CONFIDENCE_LOW = 0.20   # Raised from 0.15 to filter phantom similarity noise
 
 
-def initialize_vocab(stories: list[dict]):
-    """Build vocabulary from story corpus. Call once at startup."""
+def initialize_vocab(stories: list[dict], vocab: set[str] | None = None):
+    """Build vocabulary from story corpus. Call once at startup.
+
+    Pass vocab to install a prebuilt one (e.g. from the corpus snapshot).
+    """
     global _KNOWN_VOCAB
     if _KNOWN_VOCAB:
         return  # Already built
 
-    for s in stories:
-        # Add tokens from key fields
-        for field in ["title", "client", "domain", "5PSummary"]:
-            if s.get(field):
-                _KNOWN_VOCAB.update(_tokenize(str(s[field])))
-
-        # Add tags
-        if s.get("tags"):
-            for tag in s["tags"]:
-                _KNOWN_VOCAB.update(_tokenize(str(tag)))
+    _KNOWN_VOCAB.update(vocab if vocab is not None else build_vocab(stories))
 
     if DEBUG:
         print(f"📚 Built vocab: {len(_KNOWN_VOCAB)} unique tokens")
 
 
+def _local_hybrid_search(
+    query: str,
+    filters: dict,
+    stories: list,
+    top_k: int = SEARCH_TOP_K,
+    embedding_ctx=None,
+) -> list[dict]:
+    """Degraded-mode ranking when Pinecone returns nothing.
+
+    Ranks the facet-matching stories two ways — BM25 over the keyword index
+    and cosine similarity from the local story vectors (when built, using an
+    already-computed query vector) — and fuses the rankings with
+    reciprocal-rank fusion. When neither ranking has a story (no keyword hit,
+    no vector score above CONFIDENCE_LOW, or no vectors at all), falls back
+    to the facet-matching stories in corpus order.
+
+    Returns:
+        Up to top_k StoryHit views, best first: each reads through to the
+        corpus story (never copied) and overlays "pc" (local cosine or 0.0),
+        "kw" (BM25) and "rrf" (fused score).
+    """
+    from utils.facet_index import get_facet_index
+
+    candidates = np.flatnonzero(get_facet_index(stories).mask(filters)).tolist()
+    if not candidates:
+        return []
+
+    kw = keyword_scores(stories, query, method="bm25")
+    kw_rank = sorted((i for i in candidates if kw[i] > 0), key=lambda i: -kw[i])
+
+    vec = local_vector_scores(query, stories, embedding_ctx)
+    vec_rank = []
+    if vec is not None:
+        vec_rank = sorted(
+            (i for i in candidates if vec[i] >= CONFIDENCE_LOW),
+            key=lambda i: -vec[i],
+        )
+
+    results = []
+    for i, fused in reciprocal_rank_fusion([kw_rank, vec_rank])[:top_k]:
+        pc = 0.0 if vec is None or math.isnan(vec[i]) else float(vec[i])
+        results.append(StoryHit(stories[i], pc=pc, kw=float(kw[i]), rrf=fused))
+    if not results:
+        # Previous facet-only fallback, so degraded mode still answers
+        results = [
+            StoryHit(stories[i], pc=0.0, kw=0.0, rrf=0.0) for i in candidates[:top_k]
+        ]
+
+    if DEBUG:
+        print(
+            f"DEBUG Local hybrid fallback: candidates={len(candidates)} "
+            f"kw_ranked={len(kw_rank)} vec_ranked={len(vec_rank)} "
+            f"returned={len(results)}"
+        )
+    return results
+
+
+@traced("semantic_search")
 def semantic_search(
     query: str,
     filters: dict,
@@ -54,10 +112,18 @@ def semantic_search(
     min_overlap: float = 0.0,
     stories: list,
     top_k: int = SEARCH_TOP_K,
+    embedding_ctx=None,
 ) -> dict:
     """
     Pinecone-first semantic retrieval with confidence gating.
 
+    When Pinecone returns nothing, _local_hybrid_search() ranks the
+    facet-matching stories locally (BM25 + local vectors, fused with RRF)
+    and returns the top_k with "low" confidence.
+
+    Pass the turn's EmbeddingContext as embedding_ctx to reuse a query
+    vector already computed by the semantic router.
+
     Returns:
         {
             "results": List of relevant stories (each with "pc" score attached),
@@ -78,7 +144,12 @@ def semantic_search(
         return {"results": [], "confidence": "none", "top_score": 0.0}
 
     # 1) Try Pinecone first
-    hits = pinecone_semantic_search(q, filters, stories, top_k=top_k) or []
+    hits = (
+        pinecone_semantic_search(
+            q, filters, stories, top_k=top_k, embedding_ctx=embedding_ctx
+        )
+        or []
+    )
     st.session_state["__pc_suppressed__"] = False
 
     # 2) No hits from Pinecone
@@ -92,8 +163,10 @@ def semantic_search(
                 st.session_state["__dbg_pc_hits"] = 0
                 return {"results": [], "confidence": "none", "top_score": 0.0}
 
-        # Local keyword fallback
-        local = [s for s in stories if matches_filters(s, filters)]
+        # Local hybrid fallback (BM25 + local vectors, RRF)
+        local = _local_hybrid_search(
+            q, filters, stories, top_k=top_k, embedding_ctx=embedding_ctx
+        )
         st.session_state["__dbg_pc_hits"] = 0
         st.session_state["__last_ranked_sources__"] = [s["id"] for s in local[:10]]
 
@@ -159,9 +232,12 @@ def semantic_search(
     ui_filters = {k: v for k, v in filters.items() if k != "q"} if filters else {}
     filtered_stories = []
     for h in confident_hits:
-        story = h["story"].copy()  # Don't mutate original
-        story["pc"] = h.get("pc_score", 0.0) or 0.0
-        story["kw"] = h.get("kw_score", 0.0) or 0.0
+        # Scores live on the hit; the corpus story is shared, never copied
+        story = StoryHit(
+            h["story"],
+            pc=h.get("pc_score", 0.0) or 0.0,
+            kw=h.get("kw_score", 0.0) or 0.0,
+        )
         if matches_filters(story, ui_filters):
             filtered_stories.append(story)
 
@@ -173,8 +249,7 @@ def semantic_search(
         }
         relaxed_count = 0
         for h in confident_hits:
-            story = h["story"].copy()
-            if matches_filters(story, relaxed_filters):
+            if matches_filters(h["story"], relaxed_filters):
                 relaxed_count += 1
 
         # Build list of which filters are active
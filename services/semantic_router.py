@@ -8,19 +8,27 @@ Features:
 - Intent families for organized debugging
 - Dual threshold (hard accept / soft accept / reject)
 - Returns best matching intent for telemetry
+- Vectorized scoring: one matvec against a pre-normalized intent matrix
+- score_query_intents() exposes top-k intents and per-family max scores
 - Caches embeddings to disk
 
-DEPENDENCY WARNING:
-If you modify VALID_INTENTS (add/remove/rename intents), you MUST delete
-data/intent_embeddings.json to regenerate the cache. Otherwise the router
-will use stale embeddings that don't match the new intent definitions.
+Intent embedding cache:
+data/intent_embeddings.npy + .manifest.json hold one row per intent, keyed
+by a hash of (embedding model, intent text). Editing VALID_INTENTS is safe:
+new or reworded intents are embedded in one batched call on the next load,
+removed ones are pruned, and a model change re-embeds everything. No manual
+cache deletion needed.
 """
 
+import hashlib
+import json
 import os
 
 import numpy as np
 
 from config.constants import DEFAULT_EMBEDDING_MODEL, HARD_ACCEPT, SOFT_ACCEPT
+from services import telemetry_spool
+from services.csv_log_writer import CsvLogWriter
 
 # Thresholds imported from config/constants.py
 # HARD_ACCEPT = 0.80  # Clearly on-topic, no question
@@ -235,25 +243,30 @@ INVALID_INTENTS = [
 # =============================================================================
 # CACHE
 # =============================================================================
+INTENT_CACHE_PREFIX = "data/intent_embeddings"  # .npy matrix + .manifest.json
+LEGACY_INTENT_CACHE_PATH = "data/intent_embeddings.json"  # migrated on first load
+
 _intent_embeddings_cache: dict | None = None
+# (source embeddings dict, intents, families, normalized matrix, family -> row idx)
+_intent_matrix_cache: tuple | None = None
 
 
 def _get_embedding(text: str) -> list[float]:
-    """Get embedding for a single text using OpenAI."""
-    from dotenv import load_dotenv
-    from openai import OpenAI
-
-    load_dotenv()
+    """Get embedding for a single text using OpenAI (via the shared cache)."""
+    from services.embedding_cache import get_embedding_cache
+    from services.openai_client import get_openai_client
 
-    client = OpenAI(
-        api_key=os.getenv("OPENAI_API_KEY"),
-        project=os.getenv("OPENAI_PROJECT_ID"),
-        organization=os.getenv("OPENAI_ORG_ID"),
-    )
+    cache = get_embedding_cache()
+    cached = cache.get(DEFAULT_EMBEDDING_MODEL, text)
+    if cached is not None:
+        return cached
 
+    client = get_openai_client()
     response = client.embeddings.create(input=text, model=DEFAULT_EMBEDDING_MODEL)
 
-    return response.data[0].embedding
+    vec = response.data[0].embedding
+    cache.put(DEFAULT_EMBEDDING_MODEL, text, vec)
+    return vec
 
 
 def _cosine_similarity(a: list[float], b: list[float]) -> float:
@@ -263,52 +276,221 @@ def _cosine_similarity(a: list[float], b: list[float]) -> float:
     return float(np.dot(a_np, b_np) / (np.linalg.norm(a_np) * np.linalg.norm(b_np)))
 
 
-def _get_intent_embeddings() -> dict[str, list[float]]:
-    """Get cached embeddings for all valid intents."""
+def _get_embeddings_batch(texts: list[str]) -> list[list[float]]:
+    """Embed several texts in a single embeddings.create call."""
+    from services.openai_client import get_openai_client
+
+    client = get_openai_client()
+    response = client.embeddings.create(input=texts, model=DEFAULT_EMBEDDING_MODEL)
+    # The API returns one item per input, tagged with its input index
+    ordered = sorted(response.data, key=lambda d: getattr(d, "index", 0))
+    return [d.embedding for d in ordered]
+
+
+def _intent_key(intent: str, model: str = DEFAULT_EMBEDDING_MODEL) -> str:
+    """Content hash identifying one intent's vector: changes with text or model."""
+    return hashlib.sha256(f"{model}\x00{intent}".encode()).hexdigest()[:16]
+
+
+def _load_intent_cache(prefix: str) -> dict[str, np.ndarray]:
+    """Read the binary cache as {intent_key: vector}; empty if absent/corrupt."""
+    npy_path = f"{prefix}.npy"
+    manifest_path = f"{prefix}.manifest.json"
+    if not (os.path.exists(npy_path) and os.path.exists(manifest_path)):
+        return {}
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        matrix = np.load(npy_path)
+        keys = manifest.get("keys") or []
+        if matrix.ndim != 2 or matrix.shape[0] != len(keys):
+            return {}
+        return {k: matrix[i] for i, k in enumerate(keys)}
+    except Exception:
+        return {}
+
+
+def _load_legacy_intent_json(path: str) -> dict[str, np.ndarray]:
+    """Seed from the old data/intent_embeddings.json (flat or {"embeddings": ...})."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        data = data.get("embeddings", data)
+        return {
+            _intent_key(intent): np.asarray(vec, dtype=np.float32)
+            for intent, vec in data.items()
+        }
+    except Exception:
+        return {}
+
+
+def _save_intent_cache(
+    prefix: str, intents: list[str], keys: list[str], matrix: np.ndarray
+) -> None:
+    """Write <prefix>.npy + <prefix>.manifest.json (best-effort)."""
+    try:
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+        np.save(f"{prefix}.npy", matrix.astype(np.float32))
+        with open(f"{prefix}.manifest.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": 1,
+                    "model": DEFAULT_EMBEDDING_MODEL,
+                    "dim": int(matrix.shape[1]),
+                    "keys": keys,
+                    "intents": intents,
+                },
+                f,
+                ensure_ascii=False,
+                indent=1,
+            )
+    except Exception:
+        pass  # Read-only deploys just re-use the in-memory vectors
+
+
+def _get_intent_embeddings() -> dict[str, np.ndarray]:
+    """Get embeddings for all valid intents, self-invalidating on change.
+
+    Vectors are cached in INTENT_CACHE_PREFIX.npy with a manifest of
+    content keys (hash of model + intent text). On load, every intent whose
+    key is already cached is reused; only new or reworded intents are
+    embedded, in one batched call. Removed intents are pruned when the
+    cache is rewritten.
+    """
     global _intent_embeddings_cache
 
     if _intent_embeddings_cache is not None:
         return _intent_embeddings_cache
 
-    # Check for cached file first
-    cache_path = "data/intent_embeddings.json"
-    if os.path.exists(cache_path):
-        try:
-            import json
-
-            with open(cache_path) as f:
-                data = json.load(f)
-            # Handle both old format (flat) and new format (nested with "embeddings" key)
-            if "embeddings" in data:
-                _intent_embeddings_cache = data["embeddings"]
-            else:
-                _intent_embeddings_cache = data
-            return _intent_embeddings_cache
-        except Exception:
-            pass
-
-    # Generate embeddings
-    _intent_embeddings_cache = {}
-    for intent in ALL_VALID_INTENTS:
-        _intent_embeddings_cache[intent] = _get_embedding(intent)
-
-    # Cache to disk
-    try:
-        os.makedirs("data", exist_ok=True)
-        import json
+    on_disk = _load_intent_cache(INTENT_CACHE_PREFIX)
+    cached = dict(on_disk) or _load_legacy_intent_json(LEGACY_INTENT_CACHE_PATH)
 
-        with open(cache_path, 'w') as f:
-            json.dump(_intent_embeddings_cache, f)
-    except Exception:
-        pass
+    keys = [_intent_key(intent) for intent in ALL_VALID_INTENTS]
+    missing = [i for i, k in enumerate(keys) if k not in cached]
+    if missing:
+        vectors = _get_embeddings_batch([ALL_VALID_INTENTS[i] for i in missing])
+        for i, vec in zip(missing, vectors, strict=True):
+            cached[keys[i]] = np.asarray(vec, dtype=np.float32)
 
+    matrix = np.vstack([cached[k] for k in keys]).astype(np.float32)
+    if list(on_disk) != keys:
+        # New, reworded, removed or reordered intents (or legacy migration)
+        _save_intent_cache(INTENT_CACHE_PREFIX, list(ALL_VALID_INTENTS), keys, matrix)
+
+    _intent_embeddings_cache = {
+        intent: matrix[i] for i, intent in enumerate(ALL_VALID_INTENTS)
+    }
     return _intent_embeddings_cache
 
 
+def _get_intent_matrix() -> tuple[list[str], list[str], np.ndarray, dict]:
+    """Row-normalized float32 intent matrix built from the cached embeddings.
+
+    Rebuilt only when _get_intent_embeddings() hands back a different dict,
+    so scoring a query is one matrix-vector product instead of ~140 Python
+    cosine calls.
+
+    Returns:
+        (intents, families, matrix, family_rows) where matrix row i is the
+        unit vector for intents[i] and family_rows maps family -> row indices.
+    """
+    global _intent_matrix_cache
+
+    embeddings = _get_intent_embeddings()
+    if _intent_matrix_cache is not None and _intent_matrix_cache[0] is embeddings:
+        return _intent_matrix_cache[1:]
+
+    intents = list(embeddings.keys())
+    families = [INTENT_TO_FAMILY.get(i, "unknown") for i in intents]
+    matrix = np.asarray([embeddings[i] for i in intents], dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix = matrix / norms
+
+    family_rows: dict[str, list[int]] = {}
+    for row, fam in enumerate(families):
+        family_rows.setdefault(fam, []).append(row)
+    family_rows_np = {f: np.asarray(rows) for f, rows in family_rows.items()}
+
+    _intent_matrix_cache = (embeddings, intents, families, matrix, family_rows_np)
+    return intents, families, matrix, family_rows_np
+
+
+def _score_embedding(query_embedding: list[float], top_k: int = 5) -> dict:
+    """Score a query vector against every intent in one matvec.
+
+    Returns:
+        {
+            "score": best cosine similarity (0.0 if none is positive),
+            "intent": best matching intent ("" if none),
+            "family": its family ("unknown" if none),
+            "top_intents": [{"intent", "family", "score"}, ...] (top_k, desc),
+            "family_scores": {family: max similarity within family},
+        }
+    """
+    intents, families, matrix, family_rows = _get_intent_matrix()
+    q = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+    q_norm = float(np.linalg.norm(q))
+    if not intents or q_norm == 0.0:
+        return {
+            "score": 0.0,
+            "intent": "",
+            "family": "unknown",
+            "top_intents": [],
+            "family_scores": {},
+        }
+
+    sims = matrix @ (q / q_norm)
+    best = int(np.argmax(sims))
+    best_score = float(sims[best])
+    # Match the old loop: similarity had to beat 0.0 to count as a match
+    best_intent = intents[best] if best_score > 0.0 else ""
+
+    k = min(max(int(top_k), 0), len(intents))
+    top_rows = np.argsort(-sims, kind="stable")[:k]
+    return {
+        "score": max(best_score, 0.0),
+        "intent": best_intent,
+        "family": INTENT_TO_FAMILY.get(best_intent, "unknown"),
+        "top_intents": [
+            {"intent": intents[r], "family": families[r], "score": float(sims[r])}
+            for r in top_rows
+        ],
+        "family_scores": {
+            fam: float(sims[rows].max()) for fam, rows in family_rows.items()
+        },
+    }
+
+
+def score_query_intents(query: str, top_k: int = 5, embedding_ctx=None) -> dict:
+    """Full intent breakdown for a query: best match, top-k, per-family max.
+
+    Same scoring as is_portfolio_query_semantic() but returns the detail
+    for debugging/telemetry. Unlike the router it does NOT fail open --
+    embedding errors propagate to the caller.
+
+    Example:
+        >>> scores = score_query_intents("How does Matt lead teams?", top_k=3)
+        >>> scores["family"]
+        "leadership"
+        >>> [t["intent"] for t in scores["top_intents"]]
+        ["How does Matt lead teams?", "How does Matt lead?", ...]
+    """
+    query_embedding = embedding_ctx.get(query) if embedding_ctx else None
+    if query_embedding is None:
+        query_embedding = _get_embedding(query)
+        if embedding_ctx is not None:
+            embedding_ctx.put(query, query_embedding)
+    return _score_embedding(query_embedding, top_k=top_k)
+
+
 def is_portfolio_query_semantic(
     query: str,
     hard_threshold: float = HARD_ACCEPT,
     soft_threshold: float = SOFT_ACCEPT,
+    embedding_ctx=None,
 ) -> tuple[bool, float, str, str]:
     """
     Check if query is relevant to Matt's portfolio using embedding similarity.
@@ -317,6 +499,9 @@ def is_portfolio_query_semantic(
         query: User's query string
         hard_threshold: Score above this = clearly valid (default 0.80)
         soft_threshold: Score above this = valid but borderline (default 0.72)
+        embedding_ctx: Optional per-request EmbeddingContext
+            (services.pinecone_service). A memoized vector is reused; a
+            freshly computed one is stored so retrieval doesn't re-embed.
 
     Returns:
         Tuple of (is_valid, max_similarity_score, best_matching_intent, intent_family)
@@ -329,19 +514,10 @@ def is_portfolio_query_semantic(
         "background"
     """
     try:
-        query_embedding = _get_embedding(query)
-        intent_embeddings = _get_intent_embeddings()
-
-        max_similarity = 0.0
-        best_intent = ""
-
-        for intent, intent_emb in intent_embeddings.items():
-            similarity = _cosine_similarity(query_embedding, intent_emb)
-            if similarity > max_similarity:
-                max_similarity = similarity
-                best_intent = intent
-
-        family = INTENT_TO_FAMILY.get(best_intent, "unknown")
+        scores = score_query_intents(query, top_k=1, embedding_ctx=embedding_ctx)
+        max_similarity = scores["score"]
+        best_intent = scores["intent"]
+        family = scores["family"]
         is_valid = max_similarity >= soft_threshold
 
         # Log borderline cases for review
@@ -364,40 +540,36 @@ def is_portfolio_query_semantic(
         return True, 1.0, "", "error_fallback"
 
 
+BORDERLINE_CSV_PATH = "data/borderline_queries.csv"
+BORDERLINE_CSV_HEADER = ["timestamp", "query", "score", "matched_intent", "family"]
+telemetry_spool.register_sink("borderline", CsvLogWriter(BORDERLINE_CSV_HEADER))
+
+
 def _log_borderline(query: str, score: float, intent: str, family: str):
-    """Log borderline queries for later review."""
-    import csv
+    """Log borderline queries for later review (spooled, then appended to CSV)."""
     from datetime import UTC, datetime
 
-    path = "data/borderline_queries.csv"
-    try:
-        os.makedirs("data", exist_ok=True)
-        write_header = not os.path.exists(path)
-
-        with open(path, "a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            if write_header:
-                w.writerow(["timestamp", "query", "score", "matched_intent", "family"])
-            w.writerow(
-                [
-                    datetime.now(UTC).isoformat(timespec="seconds"),
-                    query,
-                    f"{score:.3f}",
-                    intent,
-                    family,
-                ]
-            )
-    except Exception:
-        pass  # Don't break the app for logging
+    telemetry_spool.spool(
+        "borderline",
+        {
+            "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+            "query": query,
+            "score": f"{score:.3f}",
+            "matched_intent": intent,
+            "family": family,
+        },
+        target=BORDERLINE_CSV_PATH,
+    )
 
 
 def warm_cache():
-    """Pre-compute and cache intent embeddings."""
+    """Pre-compute and cache intent embeddings and the scoring matrix."""
     from config.debug import DEBUG
 
     if DEBUG:
         print("Warming semantic router cache...")
     embeddings = _get_intent_embeddings()
+    _get_intent_matrix()
     if DEBUG:
         print(
             f"Cached {len(embeddings)} intent embeddings across {len(VALID_INTENTS)} families"
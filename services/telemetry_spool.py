@@ -0,0 +1,467 @@
+"""Local durable spool for telemetry.
+
+Every logging path -- the Google Sheet query log (services/query_logger.py),
+the off-domain CSV (backend_service.log_offdomain) and the borderline CSV
+(semantic_router._log_borderline) -- appends its record here first: one
+INSERT into a SQLite table in WAL mode at TELEMETRY_SPOOL_PATH. The request
+path never waits on the network or a CSV file, and records survive Sheets
+outages and restarts.
+
+A background replayer thread forwards records, in order, to the sink
+registered for their stream (register_sink): in batches of
+TELEMETRY_BATCH_SIZE, at most TELEMETRY_FLUSH_SECONDS after they were
+written. A sink that raises is retried with exponential backoff; its
+records stay pending until it succeeds. Streams without a sink are kept
+for local analytics only.
+
+query() and count_by() read the spool for local analytics:
+
+    >>> spool = get_telemetry_spool()
+    >>> spool.count_by("offdomain", "reason", since=time.time() - 86400)
+    Counter({'low_confidence': 12, 'rule:profanity': 3})
+
+Forwarded records are kept for TELEMETRY_SPOOL_RETENTION_SECONDS and the
+table is capped at TELEMETRY_SPOOL_MAX_ROWS (oldest first). The cap never
+drops a record still pending for a registered sink: during a long sink
+outage the table grows past it instead. If the database cannot be opened
+the spool runs in memory and is not durable.
+
+Several app processes may share one spool file: a replay round holds an
+exclusive flock on <path>.replay.lock, so only one process forwards at a
+time and a record marked forwarded by one is not sent again by another
+(POSIX; without fcntl one process should own the file).
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from config.constants import (
+    TELEMETRY_BATCH_SIZE,
+    TELEMETRY_FLUSH_SECONDS,
+    TELEMETRY_RETRY_BASE_SECONDS,
+    TELEMETRY_RETRY_MAX_SECONDS,
+    TELEMETRY_SPOOL_MAX_ROWS,
+    TELEMETRY_SPOOL_PATH,
+    TELEMETRY_SPOOL_RETENTION_SECONDS,
+)
+from config.debug import DEBUG
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process per spool file
+    fcntl = None
+
+# A sink receives (target, record) pairs in spool order and raises to have
+# the whole batch retried later. Records are marked forwarded only after the
+# sink returns, so a sink must not return before the batch is written.
+Sink = Callable[[list[tuple[str, dict[str, Any]]]], None]
+
+_SINKS: dict[str, Sink] = {}
+
+_PRUNE_EVERY_SECONDS = 3600.0
+
+
+def register_sink(stream: str, sink: Sink) -> None:
+    """Forward records of stream to sink (replacing any earlier sink)."""
+    _SINKS[stream] = sink
+
+
+class TelemetrySpool:
+    """Append-only SQLite log of telemetry records with a replayer thread.
+
+    Args:
+        db_path: SQLite file path, or None for an in-memory spool.
+        batch_size: Records per sink call; this many pending records also
+            wake the replayer early.
+        flush_seconds: Replayer interval.
+        retry_base_seconds: First backoff after a sink failure (doubles per
+            consecutive failure, capped at retry_max_seconds).
+        retry_max_seconds: Backoff cap.
+        retention_seconds: Age after which forwarded records are pruned.
+        max_rows: Row cap for the table (oldest records pruned first).
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = TELEMETRY_SPOOL_PATH,
+        batch_size: int = TELEMETRY_BATCH_SIZE,
+        flush_seconds: float = TELEMETRY_FLUSH_SECONDS,
+        retry_base_seconds: float = TELEMETRY_RETRY_BASE_SECONDS,
+        retry_max_seconds: float = TELEMETRY_RETRY_MAX_SECONDS,
+        retention_seconds: float = TELEMETRY_SPOOL_RETENTION_SECONDS,
+        max_rows: int = TELEMETRY_SPOOL_MAX_ROWS,
+    ):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_seconds = float(flush_seconds)
+        self.retry_base_seconds = float(retry_base_seconds)
+        self.retry_max_seconds = float(retry_max_seconds)
+        self.retention_seconds = float(retention_seconds)
+        self.max_rows = max(1, int(max_rows))
+        self._lock = threading.Lock()
+        self._replay_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._unsent = 0
+        self._failures: dict[str, int] = {}
+        self._retry_at: dict[str, float] = {}
+        self._last_prune = 0.0
+        self.forwarded = 0
+        self.sink_errors = 0
+        conn = self._open(db_path) if db_path else None
+        self.durable = conn is not None
+        self._conn = conn or self._open(":memory:")
+        self._replay_lock_path = f"{db_path}.replay.lock" if self.durable else None
+
+    def _open(self, db_path: str) -> sqlite3.Connection | None:
+        try:
+            if db_path != ":memory:":
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " stream TEXT NOT NULL,"
+                " ts REAL NOT NULL,"
+                " target TEXT NOT NULL,"
+                " record TEXT NOT NULL,"
+                " forwarded_at REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS events_pending"
+                " ON events (stream, seq) WHERE forwarded_at IS NULL"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS events_stream_ts ON events (stream, ts)"
+            )
+            conn.commit()
+            return conn
+        except Exception as e:
+            if DEBUG:
+                print(f"DEBUG telemetry spool: {db_path} unavailable ({e})")
+            return None
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, stream: str, record: dict[str, Any], target: str = "") -> bool:
+        """Spool one record. Never raises; False if it could not be stored.
+
+        Args:
+            stream: Record kind ("query_log", "offdomain", ...); selects the sink.
+            record: JSON-serializable field -> value mapping.
+            target: Sink-specific destination (e.g. the CSV path).
+        """
+        try:
+            text = json.dumps(record, ensure_ascii=False, default=str)
+        except (TypeError, ValueError):
+            return False
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT INTO events (stream, ts, target, record)"
+                    " VALUES (?, ?, ?, ?)",
+                    (stream, time.time(), target, text),
+                )
+                self._conn.commit()
+            except Exception as e:
+                if DEBUG:
+                    print(f"DEBUG telemetry spool write error: {e}")
+                return False
+            self._unsent += 1
+            wake = self._unsent >= self.batch_size
+        if stream in _SINKS:
+            self._ensure_started()
+            if wake:
+                self._wake.set()
+        return True
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="telemetry-replayer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.replay()
+            if time.time() - self._last_prune > _PRUNE_EVERY_SECONDS:
+                self.prune()
+
+    def _pending(self, stream: str) -> list[tuple[int, str, str]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT seq, target, record FROM events"
+                " WHERE stream = ? AND forwarded_at IS NULL"
+                " ORDER BY seq LIMIT ?",
+                (stream, self.batch_size),
+            ).fetchall()
+
+    def _mark_forwarded(self, seqs: list[int]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE events SET forwarded_at = ? WHERE seq = ?",
+                [(now, seq) for seq in seqs],
+            )
+            self._conn.commit()
+            self._unsent = 0
+
+    @contextmanager
+    def _replaying(self) -> Iterator[None]:
+        """Hold the cross-process replay lock of a file-backed spool."""
+        fh = None
+        if fcntl is not None and self._replay_lock_path is not None:
+            try:
+                fh = open(self._replay_lock_path, "a")
+                fcntl.flock(fh, fcntl.LOCK_EX)
+            except OSError as e:
+                if DEBUG:
+                    print(f"DEBUG telemetry spool replay lock unavailable: {e}")
+                if fh is not None:
+                    fh.close()
+                fh = None
+        try:
+            yield
+        finally:
+            if fh is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+                fh.close()
+
+    def replay(self, force: bool = False) -> int:
+        """Forward pending records to their sinks; return how many were sent.
+
+        A stream whose sink failed is skipped until its backoff expires,
+        unless force is set; a failure stops that stream for this round.
+        """
+        sent = 0
+        with self._replay_lock, self._replaying():
+            for stream, sink in list(_SINKS.items()):
+                if not force and time.time() < self._retry_at.get(stream, 0.0):
+                    continue
+                while True:
+                    try:
+                        batch = self._pending(stream)
+                    except Exception as e:
+                        if DEBUG:
+                            print(f"DEBUG telemetry spool read error: {e}")
+                        break
+                    if not batch:
+                        break
+                    try:
+                        sink([(target, json.loads(text)) for _, target, text in batch])
+                    except Exception as e:
+                        self.sink_errors += 1
+                        failures = self._failures.get(stream, 0) + 1
+                        self._failures[stream] = failures
+                        delay = self.retry_base_seconds * 2 ** (failures - 1)
+                        self._retry_at[stream] = time.time() + min(
+                            delay, self.retry_max_seconds
+                        )
+                        if DEBUG:
+                            print(f"DEBUG telemetry sink {stream!r} failed: {e}")
+                        break
+                    self._failures.pop(stream, None)
+                    self._retry_at.pop(stream, None)
+                    self._mark_forwarded([seq for seq, _, _ in batch])
+                    sent += len(batch)
+        self.forwarded += sent
+        return sent
+
+    def flush(self) -> bool:
+        """Replay now, in the calling thread, ignoring backoff.
+
+        Returns True when no record for a registered sink is left pending.
+        """
+        self.replay(force=True)
+        return self.pending_count(streams=list(_SINKS)) == 0
+
+    def prune(self) -> None:
+        """Drop forwarded records past retention and rows beyond max_rows.
+
+        The row cap removes the oldest forwarded records and records of
+        streams without a sink; records pending for a sink are kept.
+        """
+        self._last_prune = time.time()
+        streams = list(_SINKS)
+        pending_sql = (
+            f"forwarded_at IS NULL AND stream IN ({', '.join('?' * len(streams))})"
+            if streams
+            else "0"
+        )
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "DELETE FROM events WHERE forwarded_at IS NOT NULL AND ts < ?",
+                    (time.time() - self.retention_seconds,),
+                )
+                (excess,) = self._conn.execute(
+                    "SELECT COUNT(*) - ? FROM events", (self.max_rows,)
+                ).fetchone()
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM events WHERE seq IN (SELECT seq FROM events"
+                        f" WHERE NOT ({pending_sql}) ORDER BY seq LIMIT ?)",
+                        (*streams, excess),
+                    )
+                self._conn.commit()
+                if DEBUG and excess > 0:
+                    (rows,) = self._conn.execute(
+                        "SELECT COUNT(*) FROM events"
+                    ).fetchone()
+                    if rows > self.max_rows:
+                        print(
+                            f"DEBUG telemetry spool over max_rows: {rows} rows,"
+                            " the rest pending for a sink"
+                        )
+            except Exception as e:
+                if DEBUG:
+                    print(f"DEBUG telemetry spool prune error: {e}")
+
+    # ------------------------------------------------------------------
+    # Local analytics
+    # ------------------------------------------------------------------
+
+    def pending_count(self, streams: list[str] | None = None) -> int:
+        """Records not yet forwarded (optionally only for some streams)."""
+        sql = "SELECT COUNT(*) FROM events WHERE forwarded_at IS NULL"
+        params: list[Any] = []
+        if streams is not None:
+            if not streams:
+                return 0
+            sql += f" AND stream IN ({', '.join('?' * len(streams))})"
+            params.extend(streams)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def query(
+        self,
+        stream: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        where: dict[str, Any] | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Spooled records, oldest first.
+
+        Args:
+            stream: Only this stream.
+            since / until: Epoch-seconds bounds on the spool time.
+            where: Field -> value equality filters on the record.
+            limit: Maximum records returned.
+
+        Returns:
+            Record dicts with "_stream", "_ts" and "_forwarded" added.
+        """
+        clauses, params = [], []
+        if stream is not None:
+            clauses.append("stream = ?")
+            params.append(stream)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        sql = "SELECT stream, ts, record, forwarded_at FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY seq"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        out = []
+        for row_stream, ts, text, forwarded_at in rows:
+            record = json.loads(text)
+            if where and any(record.get(k) != v for k, v in where.items()):
+                continue
+            record.update(
+                _stream=row_stream, _ts=ts, _forwarded=forwarded_at is not None
+            )
+            out.append(record)
+            if limit is not None and len(out) >= limit:
+                break
+        return out
+
+    def count_by(
+        self,
+        stream: str,
+        field: str,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> Counter:
+        """How often each value of field occurs in stream."""
+        return Counter(
+            record.get(field, "")
+            for record in self.query(stream, since=since, until=until)
+        )
+
+    def stats(self) -> dict:
+        """Counters for the DEBUG sidebar."""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        return {
+            "records": total,
+            "pending": self.pending_count(),
+            "forwarded": self.forwarded,
+            "sink_errors": self.sink_errors,
+            "durable": self.durable,
+        }
+
+    def close(self) -> None:
+        """Final replay at shutdown (one attempt per stream, no backoff)."""
+        try:
+            self.flush()
+        except Exception as e:
+            if DEBUG:
+                print(f"DEBUG telemetry spool close error: {e}")
+
+
+_SPOOL: TelemetrySpool | None = None
+_SPOOL_LOCK = threading.Lock()
+
+
+def get_telemetry_spool() -> TelemetrySpool:
+    """Process-wide spool shared by every logging path."""
+    global _SPOOL
+    if _SPOOL is None:
+        with _SPOOL_LOCK:
+            if _SPOOL is None:
+                _SPOOL = TelemetrySpool()
+    return _SPOOL
+
+
+def spool(stream: str, record: dict[str, Any], target: str = "") -> bool:
+    """Append a record to the process-wide spool."""
+    return get_telemetry_spool().append(stream, record, target=target)
+
+
+def flush() -> bool:
+    """Forward everything spooled so far; True if nothing is left pending."""
+    return get_telemetry_spool().flush()
+
+
+@atexit.register
+def _shutdown() -> None:
+    if _SPOOL is not None:
+        _SPOOL.close()
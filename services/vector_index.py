@@ -0,0 +1,288 @@
+"""Local in-process vector index (NumPy backend for VECTOR_BACKEND=faiss).
+
+Loads the story vectors written by build_custom_embeddings.py into a
+row-normalized float32 matrix and answers top-k queries with a single
+matrix-vector product. The class mirrors the slice of the Pinecone Index API
+the app uses -- query() and describe_index_stats() -- including the
+$eq / $in / $or metadata filters that pinecone_semantic_search() builds from
+ENTITY_SEARCH_FIELDS, so callers can swap backends without branching.
+
+On-disk layout (prefix from LOCAL_VECTOR_INDEX_PREFIX):
+    <prefix>.npy            float32 matrix, shape (n_stories, dim)
+    <prefix>.manifest.json  {"model", "dim", "ids": [...], "metadata": [...]}
+
+No network, no Pinecone client, no Streamlit -- safe to use in tests and
+probe scripts.
+"""
+
+import json
+import os
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+
+from config.constants import DEFAULT_EMBEDDING_MODEL, LOCAL_VECTOR_INDEX_PREFIX
+from config.debug import DEBUG
+
+MANIFEST_VERSION = 1
+
+
+def _index_paths(prefix: str) -> tuple[Path, Path]:
+    return Path(f"{prefix}.npy"), Path(f"{prefix}.manifest.json")
+
+
+# =============================================================================
+# METADATA FILTERS (Pinecone filter language subset)
+# =============================================================================
+
+
+def _value_matches(op: str, actual: Any, expected: Any) -> bool:
+    """Evaluate one operator against one metadata value.
+
+    List-valued metadata (tags, Use Case(s), ...) follows Pinecone semantics:
+    $eq / $in match when ANY element matches, $ne / $nin when NONE do.
+    """
+    values = actual if isinstance(actual, list) else [actual]
+    if op == "$eq":
+        return expected in values
+    if op == "$ne":
+        return expected not in values
+    if op == "$in":
+        return any(v in expected for v in values)
+    if op == "$nin":
+        return not any(v in expected for v in values)
+    if op == "$exists":
+        return (actual is not None) == bool(expected)
+    if op in ("$gt", "$gte", "$lt", "$lte"):
+        try:
+            a, e = float(actual), float(expected)
+        except (TypeError, ValueError):
+            return False
+        return {
+            "$gt": a > e,
+            "$gte": a >= e,
+            "$lt": a < e,
+            "$lte": a <= e,
+        }[op]
+    raise ValueError(f"Unsupported metadata filter operator: {op}")
+
+
+def matches_metadata_filter(meta: dict[str, Any], flt: dict[str, Any] | None) -> bool:
+    """Return True if a metadata dict satisfies a Pinecone-style filter.
+
+    Supports implicit AND across top-level keys, $and / $or combinators, and
+    per-field operator dicts or bare values (implicit $eq).
+
+    Example:
+        >>> meta = {"client": "RBC", "employer": "accenture"}
+        >>> matches_metadata_filter(meta, {"$or": [{"client": {"$eq": "JPMC"}},
+        ...                                        {"employer": {"$eq": "accenture"}}]})
+        True
+    """
+    if not flt:
+        return True
+    for key, cond in flt.items():
+        if key == "$and":
+            if not all(matches_metadata_filter(meta, c) for c in cond):
+                return False
+        elif key == "$or":
+            if not any(matches_metadata_filter(meta, c) for c in cond):
+                return False
+        else:
+            actual = meta.get(key)
+            ops = cond if isinstance(cond, dict) else {"$eq": cond}
+            for op, expected in ops.items():
+                if op != "$exists" and actual is None:
+                    return False
+                if not _value_matches(op, actual, expected):
+                    return False
+    return True
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+
+class LocalVectorIndex:
+    """Cosine-similarity index over a normalized float32 matrix.
+
+    Args:
+        ids: Vector ids, aligned with matrix rows (story ids).
+        vectors: Array-like of shape (n, dim). Rows are L2-normalized on load
+            so query scores are cosine similarities, matching the Pinecone
+            index metric.
+        metadata: Per-row metadata dicts (build_custom_embeddings.build_metadata
+            shape). Used for filters and returned with matches.
+        model: Embedding model the vectors were built with.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        vectors,
+        metadata: list[dict[str, Any]] | None = None,
+        model: str = DEFAULT_EMBEDDING_MODEL,
+    ):
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError(
+                f"vectors shape {matrix.shape} does not match {len(ids)} ids"
+            )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+        self.ids = [str(i) for i in ids]
+        self.metadata = list(metadata) if metadata is not None else [{}] * len(ids)
+        if len(self.metadata) != len(self.ids):
+            raise ValueError("metadata length does not match ids")
+        self.model = model
+        self._mask_cache: dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.matrix.shape[1])
+
+    def filter_mask(self, flt: dict[str, Any] | None) -> np.ndarray | None:
+        """Boolean row mask for a metadata filter (None = no filter).
+
+        Masks are memoized per filter, so repeated entity / theme filters
+        cost one dict lookup after the first evaluation.
+        """
+        if not flt:
+            return None
+        key = json.dumps(flt, sort_keys=True, default=str)
+        mask = self._mask_cache.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (matches_metadata_filter(m, flt) for m in self.metadata),
+                dtype=bool,
+                count=len(self.metadata),
+            )
+            self._mask_cache[key] = mask
+        return mask
+
+    def scores(self, vector) -> np.ndarray:
+        """Cosine similarity of a query vector against every row."""
+        q = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(q))
+        if norm == 0.0:
+            return np.zeros(len(self.ids), dtype=np.float32)
+        return self.matrix @ (q / norm)
+
+    def query(
+        self,
+        vector,
+        top_k: int = 10,
+        filter: dict[str, Any] | None = None,  # noqa: A002 - Pinecone kwarg name
+        include_metadata: bool = True,
+        namespace: str | None = None,
+        **_ignored,
+    ):
+        """Pinecone-compatible query. Returns an object with a ``matches`` list.
+
+        Each match is a dict ``{"id", "score", "metadata"}`` -- the shape
+        _extract_match_fields() already normalizes. ``namespace`` is accepted
+        for signature compatibility and ignored (one corpus per index file).
+        """
+        scores = self.scores(vector)
+        mask = self.filter_mask(filter)
+        if mask is not None:
+            candidates = np.flatnonzero(mask)
+        else:
+            candidates = np.arange(len(self.ids))
+
+        k = min(int(top_k or 0), len(candidates))
+        if k <= 0:
+            return SimpleNamespace(matches=[])
+
+        cand_scores = scores[candidates]
+        if k < len(candidates):
+            part = np.argpartition(-cand_scores, k - 1)[:k]
+        else:
+            part = np.arange(len(candidates))
+        order = part[np.argsort(-cand_scores[part], kind="stable")]
+
+        matches = []
+        for pos in order:
+            row = int(candidates[pos])
+            match = {"id": self.ids[row], "score": float(cand_scores[pos])}
+            if include_metadata:
+                match["metadata"] = self.metadata[row]
+            matches.append(match)
+        return SimpleNamespace(matches=matches)
+
+    def describe_index_stats(self) -> dict[str, Any]:
+        """Pinecone-shaped stats dict for the DEBUG sidebar."""
+        return {
+            "dimension": self.dimension,
+            "total_vector_count": len(self.ids),
+            "namespaces": {"": {"vector_count": len(self.ids)}},
+        }
+
+
+# =============================================================================
+# PERSISTENCE
+# =============================================================================
+
+
+def save_local_index(
+    ids: list[str],
+    vectors,
+    metadata: list[dict[str, Any]],
+    prefix: str = LOCAL_VECTOR_INDEX_PREFIX,
+    model: str = DEFAULT_EMBEDDING_MODEL,
+) -> None:
+    """Write the matrix + manifest pair consumed by load_local_index()."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    npy_path, manifest_path = _index_paths(prefix)
+    npy_path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(npy_path, matrix)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "model": model,
+        "dim": int(matrix.shape[1]) if matrix.ndim == 2 else 0,
+        "ids": [str(i) for i in ids],
+        "metadata": metadata,
+    }
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, default=str)
+
+
+def load_local_index(
+    prefix: str = LOCAL_VECTOR_INDEX_PREFIX,
+    model: str = DEFAULT_EMBEDDING_MODEL,
+) -> LocalVectorIndex | None:
+    """Load the local index, or None if files are missing or incompatible.
+
+    A manifest built with a different embedding model is rejected: query
+    vectors would live in a different space and every score would be noise.
+    """
+    npy_path, manifest_path = _index_paths(prefix)
+    if not (os.path.exists(npy_path) and os.path.exists(manifest_path)):
+        if DEBUG:
+            print(f"DEBUG local index: no files at {prefix}.*")
+        return None
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("model") != model:
+            if DEBUG:
+                print(
+                    f"DEBUG local index: model mismatch "
+                    f"({manifest.get('model')} != {model}), ignoring"
+                )
+            return None
+        vectors = np.load(npy_path, mmap_mode="r")
+        return LocalVectorIndex(
+            manifest["ids"], vectors, manifest.get("metadata"), model=model
+        )
+    except Exception as e:
+        if DEBUG:
+            print(f"DEBUG local index load error: {e}")
+        return None
@@ -25,23 +25,6 @@ from pytest_bdd import given, parsers, scenarios, then, when
 scenarios("../features/query_logger_top_score.feature")
 
 
-class _SyncThread:
-    """Thread stand-in that runs target synchronously in the calling thread.
-
-    log_query spawns a daemon thread to call _append_row; we can't inspect
-    the row until that thread runs. Patching services.query_logger.Thread
-    with this class makes start() call target immediately so assertions can
-    read the resulting call args without a join or sleep.
-    """
-
-    def __init__(self, target=None, args=(), daemon=False, **kwargs):
-        self._target = target
-        self._args = args
-
-    def start(self):
-        self._target(*self._args)
-
-
 @pytest.fixture
 def ctx():
     return {}
@@ -76,23 +59,22 @@ def then_last_header(ctx, header):
 
 @given("a non-bot user agent is active")
 def given_non_bot_ua(ctx):
-    """Set up patches so log_query proceeds past the bot filter and its
-    daemon thread runs synchronously against a captured _append_row mock.
+    """Set up patches so log_query proceeds past the bot filter and hands
+    its row to a captured _enqueue mock instead of the background writer.
     Patches are stopped by _teardown() in the Then step so state does not
     leak into other scenarios.
     """
     ctx["_patches"] = [
         patch("services.query_logger.is_bot", return_value=False),
-        patch("services.query_logger._append_row"),
-        patch("services.query_logger.Thread", _SyncThread),
+        patch("services.query_logger._enqueue"),
         patch(
             "services.query_logger._capture_context",
             return_value=("test-agent", "", "", ""),
         ),
     ]
     started = [p.start() for p in ctx["_patches"]]
-    # _append_row mock is the second patch; capture its handle for assertions.
-    ctx["_append_row_mock"] = started[1]
+    # _enqueue mock is the second patch; capture its handle for assertions.
+    ctx["_enqueue_mock"] = started[1]
 
 
 @when(parsers.parse("log_query is called with top_score {score:g}"))
@@ -118,8 +100,8 @@ def _teardown(ctx):
 
 
 def _get_row(ctx):
-    call_args = ctx["_append_row_mock"].call_args
-    assert call_args is not None, "_append_row was not called by log_query"
+    call_args = ctx["_enqueue_mock"].call_args
+    assert call_args is not None, "_enqueue was not called by log_query"
     return call_args.args[0]
 
 
@@ -6,7 +6,6 @@ the Google Sheet. Scenarios requiring Streamlit runtime (chip clicks,
 action buttons) are skipped with reason.
 """
 
-import time
 import uuid
 from unittest.mock import MagicMock, patch
 
@@ -146,10 +145,13 @@ def mock_env(log_context):
         **log_context["utm"],
     }
 
+    from services.query_logger import _sheet_sink
+
     with (
         patch("services.query_logger.get_sheet", return_value=mock_sheet),
         patch("services.query_logger.st") as mock_st,
         patch("services.query_logger._headers_checked", False),
+        patch.object(_sheet_sink, "_sheet", None),
     ):
         mock_st.session_state = MagicMock()
         mock_st.session_state.get = lambda k, d="": session_state.get(k, d)
@@ -171,7 +173,7 @@ def given_jd_submitted():
 
 @given("the assessment completes successfully", target_fixture="assessment_logged")
 def given_assessment_success(mock_env, log_context):
-    from services.query_logger import log_role_match_assessment
+    from services.query_logger import flush, log_role_match_assessment
 
     log_role_match_assessment(
         role_title="Director of Engineering",
@@ -183,7 +185,7 @@ def given_assessment_success(mock_env, log_context):
         partial_count=2,
         gap_count=1,
     )
-    time.sleep(0.3)  # Wait for daemon thread
+    flush()  # Replay the spooled row to the sheet
     return mock_env
 
 
@@ -282,7 +284,7 @@ def given_helpful_click():
 
 @when("the assessment completes successfully", target_fixture="assessment_logged")
 def when_assessment_completes(mock_env, log_context):
-    from services.query_logger import log_role_match_assessment
+    from services.query_logger import flush, log_role_match_assessment
 
     log_role_match_assessment(
         role_title="Director of Engineering",
@@ -294,7 +296,7 @@ def when_assessment_completes(mock_env, log_context):
         partial_count=2,
         gap_count=1,
     )
-    time.sleep(0.3)
+    flush()
     return mock_env
 
 
@@ -335,25 +337,29 @@ def when_export():
 
 @then(parsers.parse('a row with event type "{event_type}" is logged'))
 def then_row_logged(assessment_logged, event_type):
-    sheet = assessment_logged
-    rows = sheet.append_row.call_args_list
+    rows = _logged_rows(assessment_logged)
     assert any(
-        call.args[0][0] == event_type for call in rows
-    ), f"No row with event type '{event_type}' was logged. Rows: {[c.args[0][0] for c in rows]}"
+        row[0] == event_type for row in rows
+    ), f"No row with event type '{event_type}' was logged. Rows: {[r[0] for r in rows]}"
 
 
 @then(parsers.parse('no "{event_type}" row is logged'))
 def then_no_row_logged(mock_env, event_type):
-    rows = mock_env.append_row.call_args_list
+    rows = _logged_rows(mock_env)
     assert not any(
-        call.args[0][0] == event_type for call in rows
+        row[0] == event_type for row in rows
     ), f"Unexpected row with event type '{event_type}'"
 
 
+def _logged_rows(sheet):
+    """Rows the writer appended, across all append_rows batches."""
+    return [row for call in sheet.append_rows.call_args_list for row in call.args[0]]
+
+
 def _last_row(sheet):
     from services.query_logger import HEADERS
 
-    row = sheet.append_row.call_args_list[-1].args[0]
+    row = _logged_rows(sheet)[-1]
     return dict(zip(HEADERS, row, strict=False))
 
 
@@ -178,3 +178,36 @@ def mock_pinecone_response(sample_search_results):
             for r in sample_search_results
         ]
     }
+
+
+@pytest.fixture(autouse=True)
+def isolated_telemetry_spool(monkeypatch, tmp_path):
+    """Give each test its own in-memory telemetry spool and local stores.
+
+    By default logging paths spool to data/telemetry_spool.sqlite3, the CSV
+    sinks append to data/offdomain_queries.csv and data/borderline_queries.csv,
+    and the embedding and assessment caches persist under data/; tests must
+    neither write there nor see state left by other tests. Relative CSV
+    targets are redirected into tmp_path, and the spool's replayer thread is
+    not started (it could outlive the test): call flush() to forward.
+    """
+    from services import assessment_cache, embedding_cache, telemetry_spool
+    from services.csv_log_writer import CsvLogWriter
+
+    spool = telemetry_spool.TelemetrySpool(db_path=None)
+    monkeypatch.setattr(spool, "_ensure_started", lambda: None)
+    monkeypatch.setattr(telemetry_spool, "_SPOOL", spool)
+    monkeypatch.setattr(
+        embedding_cache, "_CACHE", embedding_cache.EmbeddingCache(db_path=None)
+    )
+    monkeypatch.setattr(
+        assessment_cache, "_CACHE", assessment_cache.AssessmentCache(db_path=None)
+    )
+
+    write = CsvLogWriter.__call__
+
+    def write_under_tmp_path(self, batch):
+        write(self, [(str(tmp_path / path), record) for path, record in batch])
+
+    monkeypatch.setattr(CsvLogWriter, "__call__", write_under_tmp_path)
+    return spool
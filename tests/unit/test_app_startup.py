@@ -0,0 +1,31 @@
+"""
+Startup smoke test for app.py - the default deploy has no binary corpus
+snapshot, so every corpus-derived view is built on first use.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+class TestAppStartup:
+    def test_starts_without_corpus_snapshot(self, tmp_path, monkeypatch):
+        corpus = tmp_path / "stories.jsonl"
+        shutil.copy(ROOT / "echo_star_stories_nlp.jsonl", corpus)
+        assert not Path(f"{corpus}.snapshot").exists()
+        monkeypatch.setenv("STORIES_JSONL", str(corpus))
+
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=30)
+        # Skip the first-mount rerun and the browser screen-size probe
+        at.session_state["__first_mount_rerun__"] = True
+        at.session_state["_browser_screen_size"] = "1400"
+        at.run()
+
+        assert not at.exception
+        assert "temporarily unavailable" not in " ".join(m.value for m in at.markdown)
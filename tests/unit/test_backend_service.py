@@ -8,78 +8,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-
-class TestBuildKnownVocab:
-    """Tests for build_known_vocab() function."""
-
-    def test_extracts_words_from_stories(self, sample_stories):
-        """Should extract vocabulary from story fields."""
-        # Import here to avoid import errors if module structure changes
-        try:
-            from ui.pages.ask_mattgpt.backend_service import build_known_vocab
-        except ImportError:
-            pytest.skip("build_known_vocab not available")
-
-        vocab = build_known_vocab(sample_stories)
-
-        # Should contain words from titles (lowercased)
-        assert "payments" in vocab
-        assert "agile" in vocab
-
-        # Should be a set
-        assert isinstance(vocab, set)
-
-    def test_empty_stories_returns_empty_vocab(self):
-        """Should return empty set for empty story list."""
-        try:
-            from ui.pages.ask_mattgpt.backend_service import build_known_vocab
-        except ImportError:
-            pytest.skip("build_known_vocab not available")
-
-        vocab = build_known_vocab([])
-        assert vocab == set()
-
-    def test_filters_short_tokens(self, sample_stories):
-        """Should exclude tokens shorter than 3 characters."""
-        try:
-            from ui.pages.ask_mattgpt.backend_service import build_known_vocab
-        except ImportError:
-            pytest.skip("build_known_vocab not available")
-
-        # Add story with short tokens
-        stories = [
-            {
-                "Title": "AI ML Platform",  # "AI" and "ML" should be excluded
-                "Client": "XY Corp",  # "XY" should be excluded
-                "Role": "Director",
-                "Industry": "Tech",
-                "Sub-category": "Platform",
-            }
-        ]
-
-        vocab = build_known_vocab(stories)
-
-        # Short tokens should be filtered
-        assert "ai" not in vocab
-        assert "ml" not in vocab
-        assert "xy" not in vocab
-
-        # Valid tokens should be included
-        assert "platform" in vocab
-        assert "director" in vocab
-
-    def test_handles_missing_fields(self):
-        """Should handle stories with missing fields gracefully."""
-        try:
-            from ui.pages.ask_mattgpt.backend_service import build_known_vocab
-        except ImportError:
-            pytest.skip("build_known_vocab not available")
-
-        stories = [{"Title": "Test Story"}]  # Missing other fields
-        vocab = build_known_vocab(stories)
-
-        assert "test" in vocab
-        assert "story" in vocab
+from services import telemetry_spool
 
 
 class TestScoreStoryForPrompt:
@@ -212,7 +141,7 @@ class TestDiversifyResults:
 
 
 class TestLogOffdomain:
-    """Tests for log_offdomain() function."""
+    """Tests for log_offdomain() function (spooled, then replayed to the CSV)."""
 
     def test_logs_to_csv(self, tmp_path):
         """Should append query to CSV file."""
@@ -223,6 +152,7 @@ class TestLogOffdomain:
 
         csv_path = tmp_path / "offdomain.csv"
         log_offdomain("test query", "nonsense", path=str(csv_path))
+        telemetry_spool.flush()
 
         assert csv_path.exists()
         content = csv_path.read_text()
@@ -238,6 +168,7 @@ class TestLogOffdomain:
 
         csv_path = tmp_path / "new_offdomain.csv"
         log_offdomain("first query", "rule:profanity", path=str(csv_path))
+        telemetry_spool.flush()
 
         content = csv_path.read_text()
         lines = content.strip().split("\n")
@@ -262,6 +193,7 @@ class TestLogOffdomain:
 
         # Log second query
         log_offdomain("query 2", "reason 2", path=str(csv_path))
+        telemetry_spool.flush()
 
         content = csv_path.read_text()
         lines = content.strip().split("\n")
@@ -369,6 +301,231 @@ class TestGenerateAgyResponse:
             assert "🐾" in response
 
 
+def _stream_chunks(*deltas):
+    """Fake chat.completions stream chunks for the given content deltas."""
+    return [MagicMock(choices=[MagicMock(delta=MagicMock(content=d))]) for d in deltas]
+
+
+class TestAgyAnswerStream:
+    """Tests for AgyAnswerStream (rag_answer(..., stream=True))."""
+
+    def test_yields_progressive_snapshots_then_final_text(self, sample_stories):
+        """Snapshots grow token by token; the final text is post-processed."""
+        from ui.pages.ask_mattgpt.backend_service import AgyAnswerStream
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_client = mock_openai_class.return_value
+            mock_client.chat.completions.create.return_value = _stream_chunks(
+                "🐾 Matt ", "saved $2M", None, " for the bank."
+            )
+
+            stream = AgyAnswerStream("q", sample_stories[:3], "fallback")
+            snapshots = list(stream)
+
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+        assert snapshots[0] == "🐾 Matt "
+        assert snapshots[1] == "🐾 Matt saved \\$2M"
+        assert snapshots[-1] == stream.text
+        assert "\\$2M" in stream.text
+        assert stream.rate_limited is False
+
+    def test_finalize_fills_answer_and_narrative(self, sample_stories):
+        from ui.pages.ask_mattgpt.backend_service import AgyAnswerStream
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_openai_class.return_value.chat.completions.create.return_value = (
+                _stream_chunks("🐾 Done.")
+            )
+            stream = AgyAnswerStream("q", sample_stories[:3], "fallback")
+            resp = {
+                "answer_md": "",
+                "sources": [{"id": "s1"}],
+                "modes": {"narrative": "", "key_points": "kp"},
+                "answer_stream": stream,
+            }
+            final = stream.finalize(resp)
+
+        assert "answer_stream" not in final
+        assert final["answer_md"] == "🐾 Done."
+        assert final["modes"]["narrative"] == "🐾 Done."
+        assert final["modes"]["key_points"] == "kp"
+        assert final["sources"] == [{"id": "s1"}]
+
+    def test_logs_turn_once_when_complete(self, sample_stories):
+        from ui.pages.ask_mattgpt.backend_service import AgyAnswerStream
+
+        with (
+            patch("openai.OpenAI") as mock_openai_class,
+            patch("ui.pages.ask_mattgpt.backend_service.log_query") as mock_log,
+        ):
+            mock_openai_class.return_value.chat.completions.create.return_value = (
+                _stream_chunks("🐾 Done.")
+            )
+            stream = AgyAnswerStream("q", sample_stories[:3], "fallback")
+            stream.log_kwargs = {"query": "q"}
+            stream.finalize({"answer_md": "", "sources": []})
+            list(stream)
+
+        mock_log.assert_called_once()
+        assert mock_log.call_args.kwargs["query"] == "q"
+
+    def test_logs_turn_when_closed_mid_answer(self, sample_stories):
+        """A rerun or stop closes the stream: still logged, LLM ms blank."""
+        from ui.pages.ask_mattgpt.backend_service import AgyAnswerStream
+        from utils.tracing import start_trace
+
+        stages = []
+        with (
+            patch("openai.OpenAI") as mock_openai_class,
+            patch("ui.pages.ask_mattgpt.backend_service.log_query") as mock_log,
+            start_trace() as trace,
+        ):
+            mock_log.side_effect = lambda **kw: stages.append(
+                set(kw["trace"].durations())
+            )
+            mock_openai_class.return_value.chat.completions.create.return_value = (
+                _stream_chunks("🐾 Matt ", "saved ", "$2M")
+            )
+            stream = AgyAnswerStream("q", sample_stories[:3], "fallback")
+            stream.log_kwargs = {"query": "q"}
+            snapshots = iter(stream)
+            next(snapshots)
+            snapshots.close()
+
+        assert mock_log.call_count == 1
+        assert mock_log.call_args.kwargs["trace"] is trace
+        assert "llm" not in stages[0]
+
+    def test_text_after_early_close_is_the_partial_answer(self, sample_stories):
+        from ui.pages.ask_mattgpt.backend_service import AgyAnswerStream
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            create = mock_openai_class.return_value.chat.completions.create
+            create.return_value = _stream_chunks("🐾 Matt ", "saved $2M.")
+            stream = AgyAnswerStream("q", sample_stories[:3], "fallback")
+            snapshots = iter(stream)
+            next(snapshots)
+            snapshots.close()
+
+            assert stream.text == "🐾 Matt"
+            assert list(stream) == ["🐾 Matt"]
+            assert create.call_count == 1
+
+    def test_api_failure_uses_fallback_context(self, sample_stories):
+        from ui.pages.ask_mattgpt.backend_service import AgyAnswerStream
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_openai_class.side_effect = Exception("API Error")
+            stream = AgyAnswerStream("q", sample_stories[:3], "fallback context")
+            snapshots = list(stream)
+
+        assert len(snapshots) == 1
+        assert "fallback context" in stream.text
+
+    def test_rate_limit_returns_breather_without_sources(self, sample_stories):
+        from ui.pages.ask_mattgpt.backend_service import (
+            RATE_LIMIT_MESSAGE,
+            AgyAnswerStream,
+        )
+
+        with patch("openai.OpenAI") as mock_openai_class:
+            mock_openai_class.return_value.chat.completions.create.side_effect = (
+                Exception("Error code: 429 - rate_limit_exceeded")
+            )
+            stream = AgyAnswerStream("q", sample_stories[:3], "fallback")
+            final = stream.finalize({"answer_md": "", "sources": [{"id": "s1"}]})
+
+        assert stream.rate_limited is True
+        assert final["answer_md"] == RATE_LIMIT_MESSAGE
+        assert final["sources"] == []
+
+
+class TestGetSynthesisStories:
+    """Tests for get_synthesis_stories() theme-bucketed retrieval."""
+
+    THEMES = ["Execution", "Strategy", "Talent"]
+
+    def _corpus(self):
+        from services.vector_index import LocalVectorIndex
+
+        stories = []
+        vectors = []
+        for i in range(9):
+            theme = self.THEMES[i % 3]
+            client = "RBC" if i < 3 else "JPMC"
+            stories.append({"id": f"s{i}", "Theme": theme, "Client": client})
+            vectors.append([1.0, i / 10.0])
+        meta = [
+            {"id": s["id"], "Theme": s["Theme"], "client": s["Client"]} for s in stories
+        ]
+        index = LocalVectorIndex([s["id"] for s in stories], vectors, meta)
+        return stories, index
+
+    def _run(
+        self, stories, index, entity=None, single_query=True, query_vector=(1.0, 0.0)
+    ):
+        from services.pinecone_service import EmbeddingContext
+        from ui.pages.ask_mattgpt import backend_service
+
+        ctx = EmbeddingContext()
+        ctx.put("show me patterns", list(query_vector))
+        for theme in self.THEMES:
+            ctx.put(theme, [0.0, 1.0])
+        index.query = MagicMock(wraps=index.query)
+        with (
+            patch.object(backend_service, "_get_vector_index", return_value=index),
+            patch.object(backend_service, "SYNTHESIS_THEMES", self.THEMES),
+            patch.object(backend_service, "SYNTHESIS_SINGLE_QUERY", single_query),
+            patch.object(backend_service, "detect_entity", return_value=entity),
+        ):
+            pool = backend_service.get_synthesis_stories(
+                stories, top_per_theme=2, query="show me patterns", embedding_ctx=ctx
+            )
+        return pool, index.query
+
+    def test_one_query_bucketed_by_theme(self):
+        stories, index = self._corpus()
+        pool, query = self._run(stories, index)
+
+        query.assert_called_once()
+        assert query.call_args.kwargs["filter"] == {"Theme": {"$in": self.THEMES}}
+        by_theme = {}
+        for s in pool:
+            by_theme.setdefault(s["_matched_theme"], []).append(s["id"])
+        assert {t: len(ids) for t, ids in by_theme.items()} == dict.fromkeys(
+            self.THEMES, 2
+        )
+
+    def test_matches_per_theme_queries(self):
+        stories, index = self._corpus()
+        single, _ = self._run(stories, index)
+        per_theme, query = self._run(stories, index, single_query=False)
+
+        assert query.call_count == len(self.THEMES)
+        key = lambda s: (s["id"], s["_matched_theme"])  # noqa: E731
+        assert sorted(map(key, single)) == sorted(map(key, per_theme))
+
+    def test_entity_scoped_variant(self):
+        stories, index = self._corpus()
+        pool, query = self._run(stories, index, entity=("Client", "RBC"))
+
+        query.assert_called_once()
+        assert query.call_args.kwargs["filter"]["client"] == {"$eq": "RBC"}
+        assert sorted(s["id"] for s in pool) == ["s0", "s1", "s2"]
+
+    def test_zero_query_vector_searches_by_theme_name(self):
+        stories, index = self._corpus()
+        for single_query in (True, False):
+            _, query = self._run(
+                stories, index, single_query=single_query, query_vector=(0.0, 0.0)
+            )
+
+            assert query.call_count == len(self.THEMES)
+            assert all(
+                call.kwargs["vector"] == [0.0, 1.0] for call in query.call_args_list
+            )
+
+
 class TestSendToBackend:
     """Tests for send_to_backend() legacy wrapper."""
 
@@ -3,7 +3,7 @@ Unit tests for CAPABILITY_SUBTITLES dict in config/constants.py.
 
 CAPABILITY_SUBTITLES is the editorial-description layer for Solution/Offering
 values surfaced on landing pages (Banking, Cross-Industry). It mirrors the
-ERA_SUBTITLES pattern in ui/components/timeline_view.py — short descriptive
+ERA_SUBTITLES pattern in utils/eras.py — short descriptive
 phrase per category, falls through to empty string on miss.
 
 The dict has one hard invariant enforced by these tests: every key MUST
@@ -0,0 +1,133 @@
+"""
+Unit tests for utils/corpus_binary.py - the binary corpus snapshot and the
+loaders' JSONL fallback.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+import pytest
+
+from services.vector_index import save_local_index
+from utils.corpus_binary import build_snapshot, read_snapshot, snapshot_path
+from utils.corpus_loader import (
+    build_facets,
+    get_corpus,
+    load_stories,
+    parse_corpus_lines,
+)
+from utils.story_record import StoryRecord
+
+ROWS = [
+    {"id": 1, "Title": "A", "Industry": "Healthcare", "Process": "one"},
+    {"id": "s2", "Title": "B", "Industry": "Retail", "public_tags": "x, y"},
+    {"Title": "no id"},
+    {"id": "s3", "Title": "C", "Client": "Kaiser"},
+]
+
+
+def _write(path, rows):
+    path.write_text(
+        "\n".join(r if isinstance(r, str) else json.dumps(r) for r in rows) + "\n",
+        encoding="utf-8",
+    )
+
+
+def _sha(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.fixture
+def corpus_file(tmp_path):
+    path = tmp_path / "stories.jsonl"
+    _write(path, ROWS)
+    return path
+
+
+class TestSnapshotRoundTrip:
+    def test_matches_jsonl_parse(self, corpus_file):
+        build_snapshot(str(corpus_file), index_prefix=str(corpus_file) + "-none")
+        snap = read_snapshot(str(corpus_file), _sha(corpus_file))
+
+        stories, skipped, errors = parse_corpus_lines(corpus_file.read_bytes())
+        assert snap.stories == stories
+        assert snap.skipped_no_id == skipped == 1
+        assert snap.parse_errors == errors == []
+        assert snap.views["facets"] == tuple(build_facets(stories))
+        assert snap.vectors is None
+
+    def test_stale_when_source_changes(self, corpus_file):
+        build_snapshot(str(corpus_file))
+        _write(corpus_file, [{"id": "s9", "Title": "Z"}])
+
+        assert read_snapshot(str(corpus_file), _sha(corpus_file)) is None
+        assert [s["id"] for s in load_stories(str(corpus_file))] == ["s9"]
+
+    def test_corrupt_file_is_ignored(self, corpus_file):
+        build_snapshot(str(corpus_file))
+        path = snapshot_path(str(corpus_file))
+        path.write_bytes(path.read_bytes()[:40])
+
+        assert read_snapshot(str(corpus_file), _sha(corpus_file)) is None
+
+    def test_missing_file_is_ignored(self, corpus_file):
+        assert read_snapshot(str(corpus_file), _sha(corpus_file)) is None
+
+
+class TestLoadersUseSnapshot:
+    def test_load_stories_same_result(self, corpus_file):
+        expected = load_stories(str(corpus_file))
+        build_snapshot(str(corpus_file))
+
+        assert load_stories(str(corpus_file)) == expected
+
+    def test_load_stories_still_raises_on_bad_json(self, corpus_file):
+        _write(corpus_file, [{"id": "ok"}, "{not json"])
+        build_snapshot(str(corpus_file))
+
+        with pytest.raises(json.JSONDecodeError):
+            load_stories(str(corpus_file))
+
+    def test_get_corpus_preloads_views(self, corpus_file):
+        build_snapshot(str(corpus_file))
+        corpus = get_corpus(str(corpus_file))
+
+        assert all(isinstance(s, StoryRecord) for s in corpus.stories)
+        assert [s["id"] for s in corpus.stories] == ["1", "s2", "s3"]
+        assert corpus.skipped_no_id == 1
+
+        def unexpected(stories):
+            raise AssertionError("view should come from the snapshot")
+
+        assert corpus.derived("facets", unexpected)[0] == ["Healthcare", "Retail"]
+
+
+class TestSnapshotVectors:
+    @pytest.fixture
+    def index_prefix(self, tmp_path):
+        prefix = str(tmp_path / "vectors")
+        # s2 is not in the index; rows are stored out of corpus order
+        save_local_index(["s3", "1"], [[0.0, 2.0], [3.0, 4.0]], [{}, {}], prefix=prefix)
+        return prefix
+
+    def test_vectors_aligned_to_corpus_order(self, corpus_file, index_prefix):
+        build_snapshot(str(corpus_file), index_prefix=index_prefix)
+        snap = read_snapshot(
+            str(corpus_file), _sha(corpus_file), index_prefix=index_prefix
+        )
+
+        assert snap.vectors.shape == (3, 2)
+        np.testing.assert_allclose(snap.vectors[0], [0.6, 0.8], rtol=1e-6)
+        assert np.isnan(snap.vectors[1]).all()
+        np.testing.assert_allclose(snap.vectors[2], [0.0, 1.0])
+
+    def test_vectors_dropped_when_index_rebuilt(self, corpus_file, index_prefix):
+        build_snapshot(str(corpus_file), index_prefix=index_prefix)
+        save_local_index(["1"], [[1.0, 0.0]], [{}], prefix=index_prefix)
+        snap = read_snapshot(
+            str(corpus_file), _sha(corpus_file), index_prefix=index_prefix
+        )
+
+        assert snap is not None
+        assert snap.vectors is None
@@ -0,0 +1,133 @@
+"""
+Unit tests for utils/corpus_index.py - CorpusIndex and get_corpus_index().
+
+Lookup semantics must match the linear `next(...)` scans they replaced:
+first story wins, ids compare as strings, titles/clients are matched
+case-insensitively with whitespace collapsed.
+"""
+
+import threading
+import time
+
+from utils.corpus_index import CorpusIndex, IdentityCache, get_corpus_index
+
+
+def _stories():
+    return [
+        {"id": "s1", "Title": "Launchpad:  Empowering Clients", "Client": "JPMC"},
+        {"id": "s2", "Title": "Payments Platform", "Client": "RBC"},
+        {"id": "s3", "Title": "Payments Platform", "Client": "JPMC"},
+        {"id": "s2", "Title": "Duplicate id", "Client": "Other"},
+        {"id": 42, "Title": "Numeric id", "Client": "Takeda"},
+    ]
+
+
+class TestCorpusIndexById:
+    """Id lookups."""
+
+    def test_get_returns_same_object(self):
+        stories = _stories()
+        idx = CorpusIndex(stories)
+        assert idx.get("s1") is stories[0]
+
+    def test_first_story_wins_on_duplicate_id(self):
+        idx = CorpusIndex(_stories())
+        assert idx.get("s2")["Title"] == "Payments Platform"
+
+    def test_ids_compare_as_strings(self):
+        idx = CorpusIndex(_stories())
+        assert idx.get(42)["Client"] == "Takeda"
+        assert idx.get("42")["Client"] == "Takeda"
+        assert 42 in idx
+
+    def test_missing_and_none(self):
+        idx = CorpusIndex(_stories())
+        assert idx.get("nope") is None
+        assert idx.get(None) is None
+        assert None not in idx
+
+    def test_get_many_preserves_order_and_drops_missing(self):
+        idx = CorpusIndex(_stories())
+        got = idx.get_many(["s3", "missing", "s1"])
+        assert [s["id"] for s in got] == ["s3", "s1"]
+
+
+class TestCorpusIndexByTitleClient:
+    """Title/client lookups used by Role Match evidence chips."""
+
+    def test_title_only_returns_first_match(self):
+        idx = CorpusIndex(_stories())
+        assert idx.find_by_title_client("payments platform", None)["id"] == "s2"
+
+    def test_title_and_client(self):
+        idx = CorpusIndex(_stories())
+        assert idx.find_by_title_client("Payments Platform", "jpmc")["id"] == "s3"
+
+    def test_whitespace_collapse(self):
+        idx = CorpusIndex(_stories())
+        assert idx.find_by_title_client("Launchpad: Empowering Clients", "JPMC")
+
+    def test_client_mismatch_returns_none(self):
+        idx = CorpusIndex(_stories())
+        assert idx.find_by_title_client("Payments Platform", "Takeda") is None
+
+    def test_empty_title_returns_none(self):
+        idx = CorpusIndex(_stories())
+        assert idx.find_by_title_client("", "JPMC") is None
+        assert idx.find_by_title_client(None, None) is None
+
+
+class TestGetCorpusIndex:
+    """Identity-keyed index cache."""
+
+    def test_reuses_index_for_same_list(self):
+        stories = _stories()
+        assert get_corpus_index(stories) is get_corpus_index(stories)
+
+    def test_rebuilds_when_list_grows(self):
+        stories = _stories()
+        first = get_corpus_index(stories)
+        stories.append({"id": "s9", "Title": "New"})
+        second = get_corpus_index(stories)
+        assert second is not first
+        assert second.get("s9") is stories[-1]
+
+
+class TestIdentityCache:
+    """Locked identity-keyed cache shared by the corpus-derived indexes."""
+
+    def test_concurrent_callers_share_one_build(self):
+        builds = []
+
+        def slow_build(stories):
+            builds.append(stories)
+            time.sleep(0.02)
+            return object()
+
+        cache = IdentityCache(slow_build)
+        stories = _stories()
+        start = threading.Barrier(8)
+        views = []
+
+        def worker():
+            start.wait()
+            views.append(cache.get(stories))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(builds) == 1
+        assert all(v is views[0] for v in views)
+
+    def test_evicts_oldest_past_max_entries(self):
+        cache = IdentityCache(lambda s: object(), max_entries=2)
+        lists = [_stories() for _ in range(3)]
+        first = cache.get(lists[0])
+        cache.get(lists[1])
+        cache.get(lists[2])
+
+        assert cache.get(lists[2]) is cache.get(lists[2])
+        assert cache.get(lists[0]) is not first
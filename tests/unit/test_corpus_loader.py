@@ -0,0 +1,106 @@
+"""
+Unit tests for utils/corpus_loader.py - the process-wide corpus provider.
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.corpus_loader import get_corpus
+from utils.story_record import StoryRecord
+
+
+def _write(path, rows, mtime_ns=None):
+    path.write_text(
+        "\n".join(r if isinstance(r, str) else json.dumps(r) for r in rows) + "\n",
+        encoding="utf-8",
+    )
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def corpus_file(tmp_path):
+    path = tmp_path / "stories.jsonl"
+    _write(
+        path,
+        [{"id": 1, "Title": "A", "Process": "one"}, {"id": "s2", "Title": "B"}],
+        mtime_ns=1_000_000_000,
+    )
+    return path
+
+
+class TestGetCorpus:
+    def test_loads_and_normalizes(self, corpus_file):
+        corpus = get_corpus(str(corpus_file))
+
+        assert [s["id"] for s in corpus.stories] == ["1", "s2"]
+        assert corpus.stories[0]["Process"] == ["one"]
+        assert len(corpus.sha256) == 64
+
+    def test_stories_are_read_only_records(self, corpus_file):
+        story = get_corpus(str(corpus_file)).stories[0]
+
+        assert isinstance(story, StoryRecord)
+        with pytest.raises(TypeError):
+            story["Title"] = "changed"
+
+    def test_same_object_shared_across_calls(self, corpus_file):
+        first = get_corpus(str(corpus_file))
+        assert get_corpus(str(corpus_file)) is first
+
+    def test_touch_without_content_change_keeps_corpus(self, corpus_file):
+        first = get_corpus(str(corpus_file))
+        os.utime(corpus_file, ns=(2_000_000_000, 2_000_000_000))
+
+        assert get_corpus(str(corpus_file)) is first
+
+    def test_content_change_reloads(self, corpus_file):
+        first = get_corpus(str(corpus_file))
+        _write(corpus_file, [{"id": "s3", "Title": "C"}], mtime_ns=3_000_000_000)
+
+        second = get_corpus(str(corpus_file))
+        assert second is not first
+        assert [s["id"] for s in second.stories] == ["s3"]
+        assert second.sha256 != first.sha256
+
+    def test_bad_rows_recorded_not_raised(self, tmp_path):
+        path = tmp_path / "bad.jsonl"
+        _write(path, [{"id": "ok"}, "{not json", {"Title": "no id"}])
+
+        corpus = get_corpus(str(path))
+        assert [s["id"] for s in corpus.stories] == ["ok"]
+        assert [line for line, _ in corpus.parse_errors] == [2]
+        assert corpus.skipped_no_id == 1
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert get_corpus(str(tmp_path / "missing.jsonl")) is None
+
+
+class TestDerived:
+    def test_computed_once_per_corpus_version(self, corpus_file):
+        calls = []
+
+        def build(stories):
+            calls.append(len(stories))
+            return len(stories)
+
+        corpus = get_corpus(str(corpus_file))
+        assert corpus.derived("count", build) == 2
+        assert get_corpus(str(corpus_file)).derived("count", build) == 2
+        assert calls == [2]
+
+        _write(corpus_file, [{"id": "s3"}], mtime_ns=4_000_000_000)
+        assert get_corpus(str(corpus_file)).derived("count", build) == 1
+        assert calls == [2, 1]
+
+    def test_failures_are_not_cached(self, corpus_file):
+        corpus = get_corpus(str(corpus_file))
+
+        def broken(stories):
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            corpus.derived("init", broken)
+        assert corpus.derived("init", lambda stories: "ok") == "ok"
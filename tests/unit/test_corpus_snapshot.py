@@ -0,0 +1,118 @@
+"""
+Unit tests for utils/corpus_snapshot.py - one immutable bundle of every
+corpus-derived view, shared per corpus version.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from utils.corpus_loader import build_facets, get_corpus
+from utils.corpus_snapshot import (
+    CorpusSnapshot,
+    derive_career_years,
+    get_corpus_snapshot,
+)
+from utils.eras import group_stories_by_era
+from utils.validation import build_known_vocab
+
+STORIES = [
+    {
+        "id": "s1",
+        "Title": "Payments Platform Modernization",
+        "Client": "JP Morgan Chase",
+        "Industry": "Financial Services / Banking",
+        "Theme": "Execution & Delivery",
+        "Era": "Financial Services Platform Modernization",
+        "Category": "Delivery",
+        "Start_Date": "2012-03",
+        "End_Date": "2014-06",
+        "public_tags": ["Payments", "Cloud"],
+    },
+    {
+        "id": "s2",
+        "Title": "Cloud Innovation Center",
+        "Client": "Multiple Clients",
+        "Industry": "Cross Industry",
+        "Theme": "Org Transformation",
+        "Era": "Enterprise Innovation & Transformation",
+        "Category": "Transformation",
+        "Start_Date": "2019-01",
+        "End_Date": "2023-09",
+    },
+    {
+        "id": "s3",
+        "Title": "My Leadership Journey",
+        "Client": "Career Narrative",
+        "Theme": "Professional Narrative",
+        "Era": "Leadership & Professional Narrative",
+        "Category": "Professional Narrative",
+        "Start_Date": "2005-03",
+        "End_Date": "2023-09",
+    },
+]
+
+
+class TestCorpusSnapshotViews:
+    def test_views_match_their_builders(self):
+        snap = CorpusSnapshot(STORIES, "abc")
+
+        assert snap.facets == tuple(tuple(f) for f in build_facets(STORIES))
+        assert snap.known_vocab == build_known_vocab(STORIES)
+        assert (snap.career_start_year, snap.career_end_year) == derive_career_years(
+            STORIES
+        )
+        assert snap.career_span_years == 2023 - 2005
+        assert "JP Morgan Chase" in snap.known_clients
+        assert snap.narrative_titles == ("my leadership journey",)
+        assert "Professional Narrative" in snap.synthesis_themes
+
+    def test_default_view_and_era_groups(self):
+        snap = CorpusSnapshot(STORIES, "abc")
+
+        assert [s["id"] for s in snap.default_view] == ["s2", "s1"]
+        assert dict(snap.era_groups) == group_stories_by_era(list(snap.default_view))
+
+    def test_is_immutable(self):
+        snap = CorpusSnapshot(STORIES, "abc")
+
+        with pytest.raises(AttributeError):
+            snap.known_clients = frozenset()
+        with pytest.raises(TypeError):
+            snap.era_groups["x"] = {}
+
+
+    def test_does_not_import_ui_layer(self):
+        code = (
+            "import sys, utils.corpus_snapshot; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] == 'ui'))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert out.stdout.strip() == "[]"
+
+
+class TestGetCorpusSnapshot:
+    def test_cached_per_story_list(self):
+        stories = list(STORIES)
+        first = get_corpus_snapshot(stories)
+        assert get_corpus_snapshot(stories) is first
+
+        stories.append(dict(STORIES[0], id="s4", Client="Capital One"))
+        rebuilt = get_corpus_snapshot(stories)
+        assert rebuilt is not first
+        assert rebuilt.sha256 != first.sha256
+        assert "Capital One" in rebuilt.known_clients
+
+    def test_keyed_by_corpus_hash(self, tmp_path):
+        path = tmp_path / "stories.jsonl"
+        path.write_text("\n".join(json.dumps(s) for s in STORIES), encoding="utf-8")
+        corpus = get_corpus(str(path))
+
+        snap = get_corpus_snapshot(corpus.stories)
+        assert snap.sha256 == corpus.sha256
+        assert get_corpus_snapshot(corpus.stories) is snap
+        assert snap.facets == tuple(tuple(f) for f in corpus.derived("facets", None))
@@ -0,0 +1,87 @@
+"""
+Unit tests for services/csv_log_writer.py - the rotating CSV sink
+behind log_offdomain() and the borderline-query log.
+"""
+
+import csv
+import os
+
+import pytest
+
+from services import telemetry_spool
+from services.csv_log_writer import CsvLogWriter
+from services.telemetry_spool import TelemetrySpool
+
+HEADER = ["ts", "query"]
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "logs" / "queries.csv")
+
+
+class TestCsvLogWriter:
+    def test_writes_before_returning(self, log_path):
+        writer = CsvLogWriter(HEADER)
+        writer([(log_path, {"ts": "1", "query": "a"})])
+
+        assert _read(log_path) == [HEADER, ["1", "a"]]
+
+    def test_unwritable_target_raises_and_spool_keeps_rows(self, tmp_path, monkeypatch):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        path = str(blocker / "queries.csv")
+        writer = CsvLogWriter(HEADER)
+        with pytest.raises(OSError):
+            writer([(path, {"query": "a"})])
+
+        monkeypatch.setitem(telemetry_spool._SINKS, "test", writer)
+        spool = TelemetrySpool(db_path=None)
+        spool.append("test", {"query": "a"}, target=path)
+        assert not spool.flush()
+        assert spool.pending_count() == 1
+
+    def test_header_written_once_and_handle_reused(self, log_path):
+        writer = CsvLogWriter(HEADER)
+        writer([(log_path, {"ts": "1", "query": "a"})])
+        handle = writer._files[log_path]._fh
+        writer([(log_path, {"query": "b"})])
+
+        assert writer._files[log_path]._fh is handle
+        assert _read(log_path) == [HEADER, ["1", "a"], ["", "b"]]
+
+    def test_appends_to_existing_file_without_header(self, log_path):
+        first = CsvLogWriter(HEADER)
+        first([(log_path, {"query": "a"})])
+        first.close()
+
+        second = CsvLogWriter(HEADER)
+        second([(log_path, {"query": "b"})])
+        second.close()
+
+        assert _read(log_path) == [HEADER, ["", "a"], ["", "b"]]
+
+    def test_rotates_by_size(self, log_path):
+        writer = CsvLogWriter(HEADER, max_bytes=1, backups=2)
+        for q in ["a", "b", "c", "d"]:
+            writer([(log_path, {"query": q})])
+
+        assert _read(log_path) == [HEADER, ["", "d"]]
+        assert _read(f"{log_path}.1") == [HEADER, ["", "c"]]
+        assert _read(f"{log_path}.2") == [HEADER, ["", "b"]]
+        assert not os.path.exists(f"{log_path}.3")
+
+    def test_reopens_after_rotation_by_another_process(self, log_path):
+        ours, theirs = CsvLogWriter(HEADER), CsvLogWriter(HEADER, max_bytes=1)
+        ours([(log_path, {"query": "a"})])
+        theirs([(log_path, {"query": "b"})])  # rotates "a" away
+
+        ours([(log_path, {"query": "c"})])
+
+        assert _read(f"{log_path}.1") == [HEADER, ["", "a"]]
+        assert _read(log_path) == [HEADER, ["", "b"], ["", "c"]]
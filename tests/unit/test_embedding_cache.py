@@ -0,0 +1,124 @@
+"""
+Unit tests for services/embedding_cache.py - two-tier query embedding cache.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.embedding_cache import EmbeddingCache, normalize_text
+
+MODEL = "text-embedding-3-small"
+
+
+class TestNormalizeText:
+    def test_collapses_whitespace_and_keeps_case(self):
+        assert normalize_text("  Tell  me\tabout\nRBC ") == "Tell me about RBC"
+
+    def test_none(self):
+        assert normalize_text(None) == ""
+
+
+class TestMemoryTier:
+    """LRU behaviour with persistence disabled."""
+
+    def test_miss_then_hit(self):
+        cache = EmbeddingCache(db_path=None)
+        assert cache.get(MODEL, "q") is None
+        cache.put(MODEL, "q", [0.1, 0.2])
+        assert cache.get(MODEL, " q ") == [0.1, 0.2]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_keyed_by_model(self):
+        cache = EmbeddingCache(db_path=None)
+        cache.put(MODEL, "q", [0.1, 0.2])
+        assert cache.get("other-model", "q") is None
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(db_path=None, max_entries=2)
+        cache.put(MODEL, "a", [1.0])
+        cache.put(MODEL, "b", [2.0])
+        cache.get(MODEL, "a")  # a is now most recent
+        cache.put(MODEL, "c", [3.0])
+        assert cache.get(MODEL, "b") is None
+        assert cache.get(MODEL, "a") == [1.0]
+
+    def test_zero_vector_and_empty_text_not_stored(self):
+        cache = EmbeddingCache(db_path=None)
+        cache.put(MODEL, "q", [0.0, 0.0])
+        cache.put(MODEL, "   ", [1.0])
+        assert cache.stats()["memory_entries"] == 0
+
+
+class TestDiskTier:
+    """SQLite persistence across cache instances."""
+
+    def test_survives_new_instance(self, tmp_path):
+        db = str(tmp_path / "emb.sqlite3")
+        EmbeddingCache(db_path=db).put(MODEL, "Who is Matt?", [0.25, 0.5])
+
+        fresh = EmbeddingCache(db_path=db)
+        assert fresh.get(MODEL, "Who is Matt?") == pytest.approx([0.25, 0.5])
+        assert fresh.stats()["disk_hits"] == 1
+
+    def test_put_many_commits_once(self, tmp_path):
+        db = str(tmp_path / "emb.sqlite3")
+        cache = EmbeddingCache(db_path=db)
+        cache._conn = MagicMock(wraps=cache._conn)
+        cache.put_many(MODEL, [("a", [1.0]), ("", [1.0]), ("b", [0.0]), ("c", [2.0])])
+
+        cache._conn.commit.assert_called_once()
+        fresh = EmbeddingCache(db_path=db)
+        assert fresh.get(MODEL, "a") == [1.0]
+        assert fresh.get(MODEL, "c") == [2.0]
+        assert fresh.get(MODEL, "b") is None
+
+    def test_unwritable_path_degrades_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        cache = EmbeddingCache(db_path=str(blocker / "sub" / "emb.sqlite3"))
+        assert cache.persistent is False
+        cache.put(MODEL, "q", [1.0])
+        assert cache.get(MODEL, "q") == [1.0]
+
+
+class TestEmbedUsesCache:
+    """pinecone_service._embed consults the shared cache before the API."""
+
+    def test_second_call_skips_api(self):
+        from services import pinecone_service
+
+        cache = EmbeddingCache(db_path=None)
+        client = MagicMock()
+        client.embeddings.create.return_value.data = [MagicMock(embedding=[0.3, 0.4])]
+
+        with (
+            patch.object(pinecone_service, "get_embedding_cache", return_value=cache),
+            patch.object(pinecone_service, "_get_openai_client", return_value=client),
+        ):
+            assert pinecone_service._embed("show me payments") == [0.3, 0.4]
+            assert pinecone_service._embed("show me  payments") == [0.3, 0.4]
+
+        client.embeddings.create.assert_called_once()
+
+    def test_batch_misses_are_stored_in_one_write(self):
+        from services import pinecone_service
+
+        cache = EmbeddingCache(db_path=None)
+        client = MagicMock()
+        client.embeddings.create.return_value.data = [
+            MagicMock(index=1, embedding=[0.2]),
+            MagicMock(index=0, embedding=[0.1]),
+        ]
+
+        with (
+            patch.object(pinecone_service, "get_embedding_cache", return_value=cache),
+            patch.object(pinecone_service, "_get_openai_client", return_value=client),
+            patch.object(cache, "put_many", wraps=cache.put_many) as put_many,
+        ):
+            vecs = pinecone_service._embed_batch(["a", "b", "a"])
+
+        assert vecs == [[0.1], [0.2], [0.1]]
+        put_many.assert_called_once()
+        assert cache.get(MODEL, "b") == [0.2]
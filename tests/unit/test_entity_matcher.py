@@ -0,0 +1,98 @@
+"""
+Unit tests for utils/entity_matcher.py and detect_entity() - the compiled
+single-pass matcher must keep the old priority order and exclusion rules.
+"""
+
+from ui.pages.ask_mattgpt.backend_service import detect_entity
+from utils.entity_matcher import AhoCorasick, EntityMatcher, get_entity_matcher
+
+STORIES = [
+    {"id": "1", "Client": "JP Morgan Chase", "Title": "Payments Platform Rebuild"},
+    {"id": "2", "Client": "JP Morgan", "Employer": "Accenture"},
+    {"id": "3", "Client": "Capital One", "Division": "Cloud Innovation Center"},
+    {"id": "4", "Client": "Multiple Clients", "Division": "Technology"},
+    {"id": "5", "Employer": "Accenture", "Title": "Leadership Culture"},
+]
+
+
+class TestAhoCorasick:
+    def test_reports_overlapping_and_nested_matches(self):
+        ac = AhoCorasick(["he", "she", "hers", "his"])
+        found = sorted(ac.iter("ushers"))
+        assert found == [(1, "she"), (2, "he"), (2, "hers")]
+
+    def test_no_patterns_matches_nothing(self):
+        assert list(AhoCorasick([]).iter("anything")) == []
+
+
+class TestEntityMatcher:
+    def test_alias_beats_field_value(self):
+        matcher = EntityMatcher(STORIES)
+        assert matcher.match("jpmc work at capital one") == (
+            "Client",
+            "JP Morgan Chase",
+            "jpmc",
+            True,
+        )
+
+    def test_alias_requires_word_boundary(self):
+        matcher = EntityMatcher(STORIES)
+        assert matcher.match("how do you hold attention") is None
+        assert matcher.match("work at att")[1] == "AT&T"
+
+    def test_longest_field_value_wins(self):
+        matcher = EntityMatcher(STORIES, aliases={})
+        assert matcher.match("projects for jp morgan chase")[1] == "JP Morgan Chase"
+        assert matcher.match("projects for jp morgan")[1] == "JP Morgan"
+
+    def test_field_order_and_title_fallback(self):
+        matcher = EntityMatcher(STORIES, aliases={})
+        # Client outranks Employer even when Employer appears first
+        assert matcher.match("accenture and capital one")[:2] == (
+            "Client",
+            "Capital One",
+        )
+        # Any field value outranks a title
+        assert matcher.match("leadership culture at accenture")[:2] == (
+            "Employer",
+            "Accenture",
+        )
+        assert matcher.match("tell me more about: leadership culture")[:2] == (
+            "Title",
+            "Leadership Culture",
+        )
+
+    def test_generic_clients_and_excluded_divisions_skipped(self):
+        matcher = EntityMatcher(STORIES, aliases={})
+        assert matcher.match("multiple clients") is None
+        assert matcher.match("technology experience") is None
+
+    def test_cached_per_story_list(self):
+        stories = list(STORIES)
+        first = get_entity_matcher(stories)
+        assert get_entity_matcher(stories) is first
+        stories.append({"id": "6", "Client": "Norfolk Southern"})
+        assert get_entity_matcher(stories) is not first
+
+
+class TestDetectEntity:
+    def test_alias_match(self):
+        assert detect_entity("What did you build at the CIC?", STORIES) == (
+            "Division",
+            "Cloud Innovation Center",
+        )
+
+    def test_title_match(self):
+        query = "Tell me more about: Payments Platform Rebuild"
+        assert detect_entity(query, STORIES) == ("Title", "Payments Platform Rebuild")
+
+    def test_exclusion_prefix_suppresses_filter(self):
+        assert detect_entity("career transition after Accenture", STORIES) is None
+        assert detect_entity("leaving JPMC", STORIES) is None
+        assert detect_entity("my time at Accenture", STORIES) == (
+            "Employer",
+            "Accenture",
+        )
+
+    def test_no_entity(self):
+        assert detect_entity("How do you build trust?", STORIES) is None
@@ -0,0 +1,112 @@
+"""
+Unit tests for utils/facet_index.py - mask-based My Work filtering must
+agree with matches_filters() and give per-option facet counts.
+"""
+
+import pytest
+
+from utils.facet_index import FacetIndex, get_facet_index
+from utils.filters import matches_filters
+
+STORIES = [
+    {
+        "id": "s1",
+        "Title": "Cloud Platform Migration",
+        "Industry": "Financial Services",
+        "Solution / Offering": "Cloud",
+        "Era": "Accenture",
+        "Client": "JP Morgan Chase",
+        "Sub-category": "Platform Engineering",
+        "Role": "Director",
+        "public_tags": ["Cloud", "Agile "],
+        "what": ["Cut costs by 30%"],
+    },
+    {
+        "id": "s2",
+        "Title": "Agile Transformation",
+        "Industry": "Financial Services",
+        "Solution / Offering": "Agile",
+        "Era": "Accenture",
+        "Client": "Capital One",
+        "Sub-category": "Ways of Working",
+        "Role": "Coach",
+        "public_tags": ["agile"],
+        "Process": ["Coached squads"],
+    },
+    {
+        "id": "s3",
+        "Title": "Payments Modernization",
+        "Industry": "Healthcare",
+        "Solution / Offering": "Cloud",
+        "Era": "Independent",
+        "Client": "Kaiser",
+        "Sub-category": "Platform Engineering",
+        "Role": "Director",
+        "public_tags": [],
+        "Performance": ["Improved uptime to 99.9%"],
+        "star": {"result": ["Saved $2M"]},
+    },
+]
+
+FILTER_CASES = [
+    {},
+    {"industry": "Financial Services"},
+    {"capability": "Cloud", "era": "Accenture"},
+    {"clients": ["Capital One", "Kaiser"]},
+    {"domains": ["Platform Engineering"], "roles": ["Director"]},
+    {"tags": ["AGILE"]},
+    {"has_metric": True},
+    {"q": "cloud migration"},
+    {"q": "coached"},
+    {"q": "uptime", "industry": "Healthcare"},
+    {"q": "99.9"},
+    {"q": "nonexistent"},
+    {"industry": "Retail"},
+]
+
+
+class TestFacetIndexFilter:
+    @pytest.mark.parametrize("F", FILTER_CASES)
+    def test_agrees_with_matches_filters(self, F):
+        expected = [s for s in STORIES if matches_filters(s, F)]
+        assert FacetIndex(STORIES).filter(F) == expected
+
+    def test_subset_of_copies_keeps_subset_order(self):
+        index = FacetIndex(STORIES)
+        cached = [dict(STORIES[2], pc=0.9), dict(STORIES[0], pc=0.8)]
+
+        view = index.filter({"roles": ["Director"]}, subset=cached)
+        assert view == cached
+        assert index.filter({"industry": "Healthcare"}, subset=cached) == [cached[0]]
+
+    def test_subset_story_not_in_corpus_falls_back(self):
+        index = FacetIndex(STORIES)
+        outsider = {"id": "x9", "Industry": "Healthcare"}
+
+        assert index.filter({"industry": "Healthcare"}, subset=[outsider]) == [outsider]
+        assert index.filter({"industry": "Retail"}, subset=[outsider]) == []
+
+
+class TestFacetCounts:
+    def test_counts_ignore_own_facet_but_apply_others(self):
+        index = FacetIndex(STORIES)
+        F = {"industry": "Financial Services", "clients": ["Capital One"]}
+
+        assert index.counts(F, "clients") == {"JP Morgan Chase": 1, "Capital One": 1}
+        assert index.counts(F, "industry") == {"Financial Services": 1}
+
+    def test_tag_counts_are_normalized(self):
+        counts = FacetIndex(STORIES).counts({}, "tags")
+        assert counts == {"agile": 2, "cloud": 1}
+
+
+class TestGetFacetIndex:
+    def test_cached_per_story_list(self):
+        stories = list(STORIES)
+        first = get_facet_index(stories)
+        assert get_facet_index(stories) is first
+
+        stories.append({"id": "s4", "Industry": "Retail"})
+        rebuilt = get_facet_index(stories)
+        assert rebuilt is not first
+        assert len(rebuilt.filter({"industry": "Retail"})) == 1
@@ -0,0 +1,265 @@
+"""
+Unit tests for services/jd_assessor.py - concurrent stage 3, batched
+requirement retrieval, and the content-addressed result cache.
+
+The engine is patched at the module level (extract_requirements,
+retrieve_stories, assess_requirement), so no OpenAI/Pinecone traffic.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from services import jd_assessor
+from services.assessment_cache import AssessmentCache
+
+EXTRACTION = {
+    "required_qualifications": [
+        {"requirement": "Cloud migration"},
+        {"requirement": "Agile coaching"},
+        {"requirement": "Payments"},
+    ],
+    "preferred_qualifications": [{"requirement": "MBA"}],
+}
+
+
+def _fake_assess(client, requirement, candidates):
+    return {"requirement": requirement, "match_status": "strong", "evidence": []}
+
+
+@pytest.fixture
+def engine():
+    """Patch the network-bound stages; yields the patch objects."""
+    with (
+        patch.object(jd_assessor, "_get_openai_client", return_value=object()),
+        patch.object(jd_assessor, "extract_requirements", return_value=EXTRACTION),
+        patch.object(jd_assessor, "retrieve_stories", return_value=[]) as retrieve,
+        patch.object(
+            jd_assessor, "assess_requirement", side_effect=_fake_assess
+        ) as assess,
+        patch.object(jd_assessor, "EmbeddingContext"),
+        patch.object(
+            jd_assessor,
+            "get_assessment_cache",
+            return_value=AssessmentCache(db_path=None),
+        ),
+    ):
+        yield retrieve, assess
+
+
+class TestRunAssessmentConcurrency:
+    def test_results_keep_extraction_order(self, engine):
+        _, assess = engine
+        delays = {"Cloud migration": 0.05, "Agile coaching": 0.0, "Payments": 0.02}
+
+        def slow_assess(client, requirement, candidates):
+            time.sleep(delays.get(requirement, 0))
+            return _fake_assess(client, requirement, candidates)
+
+        assess.side_effect = slow_assess
+        result = jd_assessor.run_assessment("jd", [])
+
+        assert [r["requirement"] for r in result["results"]] == [
+            "Cloud migration",
+            "Agile coaching",
+            "Payments",
+            "MBA",
+        ]
+        assert [r["category"] for r in result["results"]] == [
+            "required",
+            "required",
+            "required",
+            "preferred",
+        ]
+
+    def test_requirements_run_in_parallel_up_to_limit(self, engine):
+        _, assess = engine
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def tracking_assess(client, requirement, candidates):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.05)
+            with lock:
+                state["active"] -= 1
+            return _fake_assess(client, requirement, candidates)
+
+        assess.side_effect = tracking_assess
+        jd_assessor.run_assessment("jd", [], max_workers=2)
+
+        assert state["peak"] == 2
+
+    def test_retrieval_stays_on_calling_thread(self, engine):
+        """pinecone_semantic_search() writes st.session_state: no workers."""
+        retrieve, _ = engine
+        threads = []
+        retrieve.side_effect = lambda *a, **kw: (
+            threads.append(threading.current_thread()) or []
+        )
+
+        jd_assessor.run_assessment("jd", [], max_workers=4)
+
+        assert threads == [threading.current_thread()] * 4
+
+    def test_failed_requirement_becomes_error_entry(self, engine):
+        _, assess = engine
+
+        def flaky_assess(client, requirement, candidates):
+            if requirement == "Payments":
+                raise ValueError("bad JSON")
+            return _fake_assess(client, requirement, candidates)
+
+        assess.side_effect = flaky_assess
+        results = jd_assessor.run_assessment("jd", [])["results"]
+
+        failed = results[2]
+        assert failed["requirement"] == "Payments"
+        assert failed["match_status"] == "gap"
+        assert failed["category"] == "required"
+        assert "bad JSON" in failed["error"]
+        assert all("error" not in r for i, r in enumerate(results) if i != 2)
+
+    def test_all_requirements_failing_raises(self, engine):
+        retrieve, _ = engine
+        retrieve.side_effect = RuntimeError("Pinecone down")
+
+        with pytest.raises(RuntimeError, match="Pinecone down"):
+            jd_assessor.run_assessment("jd", [])
+
+    def test_errors_are_not_retried_on_top_of_the_sdk(self, engine):
+        # The pooled client already retries 429s; a failure that gets past it
+        # becomes a gap entry after exactly one call
+        _, assess = engine
+        assess.side_effect = [
+            Exception("Error code: 429 - rate_limit_exceeded"),
+            ValueError("bad JSON"),
+        ] + [_fake_assess(None, r, []) for r in ("Payments", "MBA")]
+        results = jd_assessor.run_assessment("jd", [], max_workers=1)["results"]
+
+        assert "429" in results[0]["error"]
+        assert "bad JSON" in results[1]["error"]
+        assert assess.call_count == 4
+
+
+class TestRetrieveStoriesBatch:
+    def test_embeds_once_and_queries_each_requirement(self):
+        hit = {"story": {"id": "s1", "Title": "Payments"}, "pc_score": 0.8}
+
+        with (
+            patch("services.pinecone_service._embed_batch") as mock_batch,
+            patch("services.pinecone_service._embed") as mock_embed,
+            patch.object(
+                jd_assessor, "pinecone_semantic_search", return_value=[hit]
+            ) as search,
+        ):
+            mock_batch.return_value = [[0.1], [0.2]]
+            results = jd_assessor.retrieve_stories_batch(["Payments", "Cloud"], [])
+
+        mock_batch.assert_called_once_with(["Payments", "Cloud"])
+        mock_embed.assert_not_called()
+        assert [c.kwargs["query"] for c in search.call_args_list] == [
+            "Payments",
+            "Cloud",
+        ]
+        ctx = search.call_args.kwargs["embedding_ctx"]
+        assert ctx.get("Cloud") == [0.2]
+        assert [r[0]["id"] for r in results] == ["s1", "s1"]
+
+    def test_run_assessment_embeds_requirements_in_one_batch(self, engine):
+        retrieve, _ = engine
+        jd_assessor.run_assessment("jd", [])
+
+        ctx = jd_assessor.EmbeddingContext.return_value
+        ctx.embed_many.assert_called_once_with(
+            ["Cloud migration", "Agile coaching", "Payments", "MBA"]
+        )
+        assert all(c.kwargs["embedding_ctx"] is ctx for c in retrieve.call_args_list)
+
+
+class TestAssessmentResultCache:
+    def test_repeat_jd_skips_extraction_and_assessment(self, engine):
+        retrieve, assess = engine
+        retrieve.return_value = [{"id": "s1"}]
+
+        first = jd_assessor.run_assessment("Senior  Director\n", [])
+        second = jd_assessor.run_assessment("Senior Director", [])
+
+        assert jd_assessor.extract_requirements.call_count == 1
+        assert assess.call_count == 4
+        assert second == first
+
+    def test_changed_candidates_are_reassessed(self, engine):
+        retrieve, assess = engine
+        retrieve.return_value = [{"id": "s1"}]
+        jd_assessor.run_assessment("jd", [])
+
+        retrieve.return_value = [{"id": "s2"}]
+        jd_assessor.run_assessment("jd", [])
+
+        assert jd_assessor.extract_requirements.call_count == 1
+        assert assess.call_count == 8
+
+    def test_bypass_flag_forces_fresh_calls(self, engine):
+        _, assess = engine
+        jd_assessor.run_assessment("jd", [])
+        jd_assessor.run_assessment("jd", [], use_cache=False)
+
+        assert jd_assessor.extract_requirements.call_count == 2
+        assert assess.call_count == 8
+
+    def test_error_entries_are_not_cached(self, engine):
+        _, assess = engine
+        assess.side_effect = [ValueError("bad JSON")] + [
+            _fake_assess(None, r, []) for r in ("Agile coaching", "Payments", "MBA")
+        ]
+        jd_assessor.run_assessment("jd", [], max_workers=1)
+
+        assess.side_effect = _fake_assess
+        results = jd_assessor.run_assessment("jd", [], max_workers=1)["results"]
+
+        assert all("error" not in r for r in results)
+        assert assess.call_count == 5
+
+    def test_corpus_edit_changes_extraction_key(self):
+        stories = [{"id": "s1", "Title": "Payments"}]
+        before = jd_assessor.extraction_cache_key("jd", stories)
+        edited = [{"id": "s1", "Title": "Payments modernization"}]
+
+        assert jd_assessor.extraction_cache_key(" jd ", stories) == before
+        assert jd_assessor.extraction_cache_key("jd", edited) != before
+
+
+class TestAssessmentCacheStore:
+    def test_ttl_expiry(self):
+        cache = AssessmentCache(db_path=None, ttl_seconds=-1)
+        cache.put("assessment", "k", {"match_status": "strong"})
+        assert cache.get("assessment", "k") is None
+
+    def test_lru_eviction(self):
+        cache = AssessmentCache(db_path=None, max_entries=2)
+        cache.put("assessment", "a", 1)
+        cache.put("assessment", "b", 2)
+        cache.get("assessment", "a")
+        cache.put("assessment", "c", 3)
+        assert cache.get("assessment", "b") is None
+        assert cache.get("assessment", "a") == 1
+
+    def test_survives_new_instance_and_disk_is_bounded(self, tmp_path):
+        db = str(tmp_path / "assess.sqlite3")
+        cache = AssessmentCache(db_path=db, max_disk_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put("extraction", key, {"key": key})
+
+        fresh = AssessmentCache(db_path=db)
+        assert fresh.get("extraction", "c") == {"key": "c"}
+        assert fresh.get("extraction", "a") is None
+
+    def test_hits_return_independent_copies(self):
+        cache = AssessmentCache(db_path=None)
+        cache.put("assessment", "k", {"evidence": []})
+        cache.get("assessment", "k")["evidence"].append("x")
+        assert cache.get("assessment", "k") == {"evidence": []}
@@ -7,7 +7,7 @@ Behavioral contract:
   is exactly the Solution/Offering values that have >=1 story matching the
   industry filter (after Era exclusion).
 - Era exclusion: stories with Era == "Leadership & Professional Narrative"
-  are excluded from card counts (mirrors timeline_view.py EXCLUDED_ERA).
+  are excluded from card counts (mirrors utils/eras.py EXCLUDED_ERA).
 - Cards are tiered: Core (>=3 stories) vs Specialized (<3 stories).
 - Each card carries title (Solution/Offering value), count, client count,
   subtitle (from CAPABILITY_SUBTITLES, empty string if not curated), tier.
@@ -222,7 +222,7 @@ class TestBuildLandingCards:
         assert len(cards) == 1
         assert cards[0]["subtitle"] == "", (
             "Uncurated capabilities should fall through to empty-string subtitle, "
-            "same fallback behavior as ERA_SUBTITLES.get(era, '') in timeline_view.py."
+            "same fallback behavior as ERA_SUBTITLES.get(era, '') in utils/eras.py."
         )
 
     def test_cards_sorted_by_count_descending(self):
@@ -0,0 +1,61 @@
+"""
+Unit tests for services/openai_client.py - shared OpenAI client registry.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from config.constants import OPENAI_MAX_RETRIES
+from services.openai_client import get_openai_client, reset_openai_clients
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    reset_openai_clients()
+    yield
+    reset_openai_clients()
+
+
+class TestGetOpenAIClient:
+    def test_same_credentials_reuse_one_client(self):
+        with patch("openai.OpenAI") as mock_cls:
+            first = get_openai_client("sk-test")
+            second = get_openai_client("sk-test")
+
+        assert first is second
+        mock_cls.assert_called_once()
+
+    def test_client_configured_with_pool_timeout_and_retries(self):
+        with patch("openai.OpenAI") as mock_cls:
+            get_openai_client("sk-test")
+
+        kwargs = mock_cls.call_args.kwargs
+        assert kwargs["max_retries"] == OPENAI_MAX_RETRIES
+        assert kwargs["http_client"] is not None
+        assert kwargs["timeout"] is not None
+
+    def test_clients_share_one_http_pool(self):
+        with patch("openai.OpenAI") as mock_cls:
+            get_openai_client("sk-a")
+            get_openai_client("sk-b")
+
+        pools = [c.kwargs["http_client"] for c in mock_cls.call_args_list]
+        assert mock_cls.call_count == 2
+        assert pools[0] is pools[1]
+
+    def test_patched_class_is_respected(self):
+        """A new openai.OpenAI patch must not be served a previous mock's client."""
+        with patch("openai.OpenAI") as first_cls:
+            first = get_openai_client("sk-test")
+        with patch("openai.OpenAI") as second_cls:
+            second = get_openai_client("sk-test")
+
+        assert first is first_cls.return_value
+        assert second is second_cls.return_value
+
+    def test_construction_error_is_not_cached(self):
+        with patch("openai.OpenAI", side_effect=[RuntimeError("no key"), "client"]):
+            with pytest.raises(RuntimeError):
+                get_openai_client("sk-test")
+            assert get_openai_client("sk-test") == "client"
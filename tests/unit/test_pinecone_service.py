@@ -0,0 +1,185 @@
+"""
+Unit tests for services/pinecone_service.py - EmbeddingContext and batch embedding.
+
+One Ask Agy turn should embed each distinct query string once, shared by
+the semantic router, retrieval, and synthesis.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from services.embedding_cache import EmbeddingCache
+from services.pinecone_service import EmbeddingContext, _embed_batch
+from services.semantic_router import is_portfolio_query_semantic
+
+
+class TestEmbeddingContext:
+    """Per-request embedding memo."""
+
+    @patch("services.pinecone_service._embed")
+    def test_embeds_each_string_once(self, mock_embed):
+        mock_embed.return_value = [0.1, 0.2]
+        ctx = EmbeddingContext()
+
+        assert ctx.embed("Tell me about RBC") == [0.1, 0.2]
+        assert ctx.embed("Tell me about RBC ") == [0.1, 0.2]  # strip-equal
+
+        mock_embed.assert_called_once_with("Tell me about RBC")
+
+    @patch("services.pinecone_service._embed")
+    def test_changed_string_is_re_embedded(self, mock_embed):
+        mock_embed.side_effect = [[1.0, 0.0], [0.0, 1.0]]
+        ctx = EmbeddingContext()
+
+        ctx.embed("What is your leadership style?")
+        ctx.embed("What is Matt's leadership style?")
+
+        assert mock_embed.call_count == 2
+        assert len(ctx) == 2
+
+    @patch("services.pinecone_service._embed")
+    def test_zero_vector_is_not_memoized(self, mock_embed):
+        mock_embed.side_effect = [[0.0, 0.0], [0.5, 0.5]]
+        ctx = EmbeddingContext()
+
+        assert ctx.embed("q") == [0.0, 0.0]
+        assert ctx.embed("q") == [0.5, 0.5]
+        assert mock_embed.call_count == 2
+
+    @patch("services.pinecone_service._embed")
+    def test_put_vector_is_reused(self, mock_embed):
+        ctx = EmbeddingContext()
+        ctx.put("q", [0.3, 0.4])
+
+        assert ctx.embed("q") == [0.3, 0.4]
+        mock_embed.assert_not_called()
+
+    @patch("services.pinecone_service._embed_batch")
+    def test_embed_many_batches_only_misses(self, mock_batch):
+        mock_batch.return_value = [[0.1, 0.0], [0.0, 0.1]]
+        ctx = EmbeddingContext()
+        ctx.put("known", [0.5, 0.5])
+
+        vecs = ctx.embed_many(["a", "known", "b ", "a"])
+
+        mock_batch.assert_called_once_with(["a", "b"])
+        assert vecs == [[0.1, 0.0], [0.5, 0.5], [0.0, 0.1], [0.1, 0.0]]
+
+
+class TestEmbedBatch:
+    """_embed_batch: one embeddings.create for all cache misses."""
+
+    def _client(self, vectors):
+        client = MagicMock()
+        # Returned out of order on purpose; .index maps back to the input
+        data = [SimpleNamespace(index=i, embedding=v) for i, v in enumerate(vectors)]
+        client.embeddings.create.return_value.data = list(reversed(data))
+        return client
+
+    def test_single_call_aligned_with_input(self):
+        cache = EmbeddingCache(db_path=None)
+        cache.put("text-embedding-3-small", "cached", [9.0])
+        client = self._client([[1.0], [2.0]])
+
+        with (
+            patch("services.pinecone_service.get_embedding_cache", return_value=cache),
+            patch("services.pinecone_service._get_openai_client", return_value=client),
+        ):
+            vecs = _embed_batch(["x", "cached", "y", "x"])
+
+        client.embeddings.create.assert_called_once()
+        assert client.embeddings.create.call_args.kwargs["input"] == ["x", "y"]
+        assert vecs == [[1.0], [9.0], [2.0], [1.0]]
+        assert cache.get("text-embedding-3-small", "y") == [2.0]
+
+    def test_api_error_returns_zero_vectors(self):
+        client = MagicMock()
+        client.embeddings.create.side_effect = Exception("API Error")
+
+        with (
+            patch(
+                "services.pinecone_service.get_embedding_cache",
+                return_value=EmbeddingCache(db_path=None),
+            ),
+            patch("services.pinecone_service._get_openai_client", return_value=client),
+        ):
+            vecs = _embed_batch(["x", ""])
+
+        assert len(vecs) == 2
+        assert not any(vecs[0]) and not any(vecs[1])
+
+
+class TestRouterSharesContext:
+    """is_portfolio_query_semantic() fills and reads the context."""
+
+    @patch("services.semantic_router._log_borderline")
+    @patch("services.semantic_router._get_intent_embeddings")
+    @patch("services.semantic_router._get_embedding")
+    def test_router_stores_vector_for_retrieval(
+        self, mock_get_emb, mock_intents, _mock_log
+    ):
+        mock_get_emb.return_value = [1.0, 0.0]
+        mock_intents.return_value = {"Tell me about Matt's background": [1.0, 0.0]}
+        ctx = EmbeddingContext()
+
+        is_valid, score, _, family = is_portfolio_query_semantic(
+            "Tell me about Matt", embedding_ctx=ctx
+        )
+
+        assert is_valid and family == "background"
+        assert ctx.get("Tell me about Matt") == [1.0, 0.0]
+
+    @patch("services.semantic_router._log_borderline")
+    @patch("services.semantic_router._get_intent_embeddings")
+    @patch("services.semantic_router._get_embedding")
+    def test_router_reuses_memoized_vector(self, mock_get_emb, mock_intents, _log):
+        mock_intents.return_value = {"Tell me about Matt's background": [1.0, 0.0]}
+        ctx = EmbeddingContext()
+        ctx.put("Tell me about Matt", [1.0, 0.0])
+
+        is_portfolio_query_semantic("Tell me about Matt", embedding_ctx=ctx)
+
+        mock_get_emb.assert_not_called()
+
+
+class TestLocalVectorScores:
+    """local_vector_scores: degraded-mode cosine scores, never calls the API."""
+
+    def _index(self):
+        from services.vector_index import LocalVectorIndex
+
+        return LocalVectorIndex(["a", "b"], [[1.0, 0.0], [0.0, 1.0]])
+
+    def test_aligned_to_story_order_with_nan_for_missing(self):
+        from services.pinecone_service import local_vector_scores
+
+        ctx = EmbeddingContext()
+        ctx.put("q", [1.0, 0.0])
+        stories = [{"id": "b"}, {"id": "zzz"}, {"id": "a"}]
+
+        with patch(
+            "services.pinecone_service._init_local_index", return_value=self._index()
+        ):
+            scores = local_vector_scores("q", stories, ctx)
+
+        assert scores[0] == 0.0
+        assert scores[1] != scores[1]  # NaN
+        assert scores[2] == 1.0
+
+    @patch("services.pinecone_service._embed")
+    def test_unknown_query_vector_returns_none(self, mock_embed):
+        from services.pinecone_service import local_vector_scores
+
+        with (
+            patch(
+                "services.pinecone_service._init_local_index",
+                return_value=self._index(),
+            ),
+            patch(
+                "services.pinecone_service.get_embedding_cache",
+                return_value=EmbeddingCache(db_path=None),
+            ),
+        ):
+            assert local_vector_scores("q", [{"id": "a"}]) is None
+
+        mock_embed.assert_not_called()
@@ -9,14 +9,14 @@ queries leaked into the production query log alongside real user queries,
 making conversion / bounce analysis unreliable.
 
 These tests pin the contract: log_query() consults is_bot() and short-
-circuits before spawning the daemon thread that writes to the sheet.
+circuits before queueing a row for the writer thread that appends to the sheet.
 """
 
 from unittest.mock import MagicMock, patch
 
 
 class TestLogQueryBotFilter:
-    """log_query() must not spawn a write thread for monitoring-bot traffic."""
+    """log_query() must not queue a row for monitoring-bot traffic."""
 
     def _mock_context(self, user_agent: str) -> MagicMock:
         """Build a MagicMock that mimics st.context with the given UA header.
@@ -46,10 +46,10 @@ class TestLogQueryBotFilter:
         )
         with (
             patch.object(query_logger.st, "context", ctx),
-            patch.object(query_logger, "Thread") as mock_thread,
+            patch.object(query_logger, "_enqueue") as mock_enqueue,
         ):
             query_logger.log_query("banking", page="My Work")
-            mock_thread.assert_not_called()
+            mock_enqueue.assert_not_called()
 
     def test_log_query_skipped_for_uptimerobot(self):
         """UptimeRobot UA must not trigger a row append.
@@ -62,10 +62,10 @@ class TestLogQueryBotFilter:
         ctx = self._mock_context("UptimeRobot/2.0; http://uptimerobot.com/")
         with (
             patch.object(query_logger.st, "context", ctx),
-            patch.object(query_logger, "Thread") as mock_thread,
+            patch.object(query_logger, "_enqueue") as mock_enqueue,
         ):
             query_logger.log_query("anything")
-            mock_thread.assert_not_called()
+            mock_enqueue.assert_not_called()
 
     def test_log_query_skipped_for_empty_ua(self):
         """Empty UA must be treated as bot (UptimeRobot free tier sends empty UA).
@@ -78,10 +78,10 @@ class TestLogQueryBotFilter:
         ctx = self._mock_context("")
         with (
             patch.object(query_logger.st, "context", ctx),
-            patch.object(query_logger, "Thread") as mock_thread,
+            patch.object(query_logger, "_enqueue") as mock_enqueue,
         ):
             query_logger.log_query("anything")
-            mock_thread.assert_not_called()
+            mock_enqueue.assert_not_called()
 
     def test_log_query_skipped_for_chrome_103(self):
         """The legacy Chrome/103.0.0.0 signature must still suppress logging.
@@ -99,10 +99,10 @@ class TestLogQueryBotFilter:
         )
         with (
             patch.object(query_logger.st, "context", ctx),
-            patch.object(query_logger, "Thread") as mock_thread,
+            patch.object(query_logger, "_enqueue") as mock_enqueue,
         ):
             query_logger.log_query("anything")
-            mock_thread.assert_not_called()
+            mock_enqueue.assert_not_called()
 
     def test_log_query_proceeds_for_real_user_ua(self):
         """A real user UA (Chrome on Mac) MUST trigger a row append.
@@ -119,10 +119,10 @@ class TestLogQueryBotFilter:
         )
         with (
             patch.object(query_logger.st, "context", ctx),
-            patch.object(query_logger, "Thread") as mock_thread,
+            patch.object(query_logger, "_enqueue") as mock_enqueue,
         ):
             query_logger.log_query("How did Matt scale teams?", page="Ask Agy")
-            mock_thread.assert_called_once()
+            mock_enqueue.assert_called_once()
 
 
 class TestLogQueryTopScore:
@@ -140,8 +140,8 @@ class TestLogQueryTopScore:
         ctx.timezone = "America/New_York"
         return ctx
 
-    def _captured_row(self, mock_thread) -> list:
-        return mock_thread.call_args.kwargs["args"][0]
+    def _captured_row(self, mock_enqueue) -> list:
+        return mock_enqueue.call_args.args[0]
 
     def test_top_score_is_last_header(self):
         from services.query_logger import HEADERS
@@ -154,10 +154,10 @@ class TestLogQueryTopScore:
         ctx = self._mock_context(self.REAL_UA)
         with (
             patch.object(query_logger.st, "context", ctx),
-            patch.object(query_logger, "Thread") as mock_thread,
+            patch.object(query_logger, "_enqueue") as mock_enqueue,
         ):
             query_logger.log_query("test", top_score=0.847)
-            row = self._captured_row(mock_thread)
+            row = self._captured_row(mock_enqueue)
         from services.query_logger import HEADERS
 
         assert row[HEADERS.index("Top Score")] == 0.847
@@ -168,10 +168,77 @@ class TestLogQueryTopScore:
         ctx = self._mock_context(self.REAL_UA)
         with (
             patch.object(query_logger.st, "context", ctx),
-            patch.object(query_logger, "Thread") as mock_thread,
+            patch.object(query_logger, "_enqueue") as mock_enqueue,
         ):
             query_logger.log_query("test")
-            row = self._captured_row(mock_thread)
+            row = self._captured_row(mock_enqueue)
         from services.query_logger import HEADERS
 
         assert row[HEADERS.index("Top Score")] == ""
+
+
+class TestSheetSink:
+    """Rows are spooled locally, then replayed to the sheet in batches."""
+
+    REAL_UA = TestLogQueryTopScore.REAL_UA
+
+    def _log(self, query_logger, *queries):
+        ctx = MagicMock()
+        ctx.headers.get.return_value = self.REAL_UA
+        with patch.object(query_logger.st, "context", ctx):
+            for q in queries:
+                query_logger.log_query(q)
+
+    def test_spooled_rows_replayed_in_one_append(self, isolated_telemetry_spool):
+        from services import query_logger
+
+        sheet = MagicMock()
+        with (
+            patch.object(query_logger, "get_sheet", return_value=sheet) as get_sheet,
+            patch.object(query_logger, "_ensure_headers"),
+            patch.object(query_logger._sheet_sink, "_sheet", None),
+        ):
+            self._log(query_logger, "first", "second")
+            assert isolated_telemetry_spool.pending_count() == 2
+            assert query_logger.flush()
+
+        sheet.append_rows.assert_called_once()
+        rows = sheet.append_rows.call_args.args[0]
+        query_col = query_logger.SHEET_HEADERS.index("Query")
+        assert [r[query_col] for r in rows] == ["first", "second"]
+        assert all(len(r) == len(query_logger.SHEET_HEADERS) for r in rows)
+        get_sheet.assert_called_once()
+
+    def test_failed_write_kept_and_retried_with_fresh_sheet(
+        self, isolated_telemetry_spool
+    ):
+        from services import query_logger
+
+        broken, working = MagicMock(), MagicMock()
+        broken.append_rows.side_effect = RuntimeError("token expired")
+        with (
+            patch.object(query_logger, "get_sheet", side_effect=[broken, working]),
+            patch.object(query_logger, "_ensure_headers"),
+            patch.object(query_logger._sheet_sink, "_sheet", None),
+        ):
+            self._log(query_logger, "q")
+            assert not query_logger.flush()
+            assert isolated_telemetry_spool.pending_count() == 1
+            assert query_logger.flush()
+
+        working.append_rows.assert_called_once()
+        assert isolated_telemetry_spool.pending_count() == 0
+
+    def test_rows_stay_spooled_without_sheet(self, isolated_telemetry_spool):
+        from services import query_logger
+
+        with (
+            patch.object(query_logger, "get_sheet", return_value=None),
+            patch.object(query_logger._sheet_sink, "_sheet", None),
+        ):
+            self._log(query_logger, "offline")
+            assert not query_logger.flush()
+
+        (record,) = isolated_telemetry_spool.query("query_log")
+        assert record["Query"] == "offline"
+        assert record["_forwarded"] is False
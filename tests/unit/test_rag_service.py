@@ -448,3 +448,125 @@ class TestSemanticSearchNoRegression:
             in mock_st.session_state["__pc_snippets__"]["story-1|jpmc"]
         )
         assert "story-1|jpmc" in mock_st.session_state["__last_ranked_sources__"]
+
+
+class TestLocalHybridFallback:
+    """Pinecone returns nothing -> BM25 + local vectors fused with RRF."""
+
+    @patch("services.rag_service.local_vector_scores", return_value=None)
+    @patch("services.rag_service.pinecone_semantic_search")
+    @patch("services.rag_service.st")
+    def test_keyword_ranked_results_when_no_vectors(
+        self, mock_st, mock_pinecone, _vec, sample_stories_with_industry
+    ):
+        mock_st.session_state = {}
+        mock_pinecone.return_value = None
+
+        result = semantic_search(
+            query="agile transformation",
+            filters={},
+            stories=sample_stories_with_industry,
+        )
+
+        assert result["confidence"] == "low"
+        assert result["top_score"] == 0.0
+        assert [s["id"] for s in result["results"]] == ["story-2|capital-one"]
+        assert result["results"][0]["kw"] > 0.0
+        assert mock_st.session_state["__last_ranked_sources__"] == [
+            "story-2|capital-one"
+        ]
+
+    @patch("services.rag_service.local_vector_scores")
+    @patch("services.rag_service.pinecone_semantic_search")
+    @patch("services.rag_service.st")
+    def test_fuses_keyword_and_vector_rankings(
+        self, mock_st, mock_pinecone, mock_vec, sample_stories_with_industry
+    ):
+        import numpy as np
+
+        mock_st.session_state = {}
+        mock_pinecone.return_value = []
+        # Vectors favour Takeda; keywords only match JPMC
+        mock_vec.return_value = np.array([0.30, 0.10, 0.60])
+
+        result = semantic_search(
+            query="payments", filters={}, stories=sample_stories_with_industry
+        )
+        ids = [s["id"] for s in result["results"]]
+
+        assert set(ids) == {"story-1|jpmc", "story-3|takeda"}  # 0.10 < CONFIDENCE_LOW
+        assert ids[0] == "story-1|jpmc"  # in both rankings
+        assert result["results"][0]["pc"] == 0.30
+        assert result["results"][1]["kw"] == 0.0
+
+    @patch("services.rag_service.local_vector_scores", return_value=None)
+    @patch("services.rag_service.pinecone_semantic_search")
+    @patch("services.rag_service.st")
+    def test_respects_filters_and_top_k(
+        self, mock_st, mock_pinecone, _vec, sample_stories_with_industry
+    ):
+        mock_st.session_state = {}
+        mock_pinecone.return_value = []
+
+        result = semantic_search(
+            query="platform agile genai",
+            filters={"industry": "Banking"},
+            stories=sample_stories_with_industry,
+            top_k=1,
+        )
+
+        assert len(result["results"]) == 1
+        assert result["results"][0]["Industry"] == "Banking"
+
+    @patch("services.rag_service.local_vector_scores", return_value=None)
+    @patch("services.rag_service.pinecone_semantic_search")
+    @patch("services.rag_service.st")
+    def test_no_signal_falls_back_to_facet_order(
+        self, mock_st, mock_pinecone, _vec, sample_stories_with_industry
+    ):
+        mock_st.session_state = {}
+        mock_pinecone.return_value = []
+
+        result = semantic_search(
+            query="zebra xylophone", filters={}, stories=sample_stories_with_industry
+        )
+
+        assert [s["id"] for s in result["results"]] == [
+            s["id"] for s in sample_stories_with_industry
+        ]
+        assert result["confidence"] == "low"
+
+    @patch("services.rag_service.local_vector_scores", return_value=None)
+    @patch("services.rag_service.pinecone_semantic_search")
+    @patch("services.rag_service.st")
+    def test_no_facet_match_returns_none(
+        self, mock_st, mock_pinecone, _vec, sample_stories_with_industry
+    ):
+        mock_st.session_state = {}
+        mock_pinecone.return_value = []
+
+        result = semantic_search(
+            query="payments",
+            filters={"industry": "Aerospace"},
+            stories=sample_stories_with_industry,
+        )
+
+        assert result["results"] == []
+        assert result["confidence"] == "none"
+
+    @patch("services.rag_service.pinecone_semantic_search", return_value=[])
+    @patch("services.rag_service.st")
+    def test_returns_results_without_pinecone(
+        self, mock_st, _pc, sample_stories_with_industry
+    ):
+        """No Pinecone and no story vectors: the fallback still answers."""
+        mock_st.session_state = {}
+
+        result = semantic_search(
+            query="Tell me about payments",
+            filters={},
+            stories=sample_stories_with_industry,
+        )
+
+        assert result["results"]
+        assert result["confidence"] == "low"
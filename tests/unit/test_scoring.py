@@ -228,3 +228,110 @@ class TestScoringConstants:
 
         assert c_kw == s_kw == p_kw
         assert c_pc == s_pc == p_pc
+
+
+class TestKeywordIndex:
+    """Tests for KeywordIndex / keyword_scores() (inverted index scorers)."""
+
+    STORIES = [
+        {
+            "Title": "Platform Modernization",
+            "Client": "JPMC",
+            "Sub-category": "Platform Engineering",
+        },
+        {
+            "Title": "Agile Transformation",
+            "Client": "RBC",
+            "Process": ["Coached platform teams", "Scaled agile ceremonies"],
+        },
+        {"Title": "Payments Data Migration", "Client": "Citi"},
+    ]
+
+    def test_overlap_matches_per_story_scorer(self):
+        """Overlap scores are identical to _keyword_score_for_story."""
+        import json
+
+        from utils.scoring import _keyword_score_for_story, keyword_scores
+
+        with open("echo_star_stories_nlp.jsonl") as f:
+            stories = [json.loads(line) for line in f if line.strip()][:60]
+
+        for query in ("platform modernization jpmc", "agile coaching", "zzz"):
+            expected = [_keyword_score_for_story(s, query) for s in stories]
+            got = keyword_scores(stories, query, method="overlap")
+            assert got.tolist() == expected
+
+    def test_bm25_aligned_and_normalized(self):
+        """BM25 scores align to story order and stay within 0-1."""
+        from utils.scoring import keyword_scores
+
+        scores = keyword_scores(self.STORIES, "platform migration", method="bm25")
+
+        assert len(scores) == 3
+        assert all(0.0 <= s <= 1.0 for s in scores)
+        assert scores[0] > scores[1] > 0.0  # title/domain hit beats Process hit
+        assert scores[2] > 0.0
+
+    def test_bm25_rare_terms_weigh_more(self):
+        """A token in one story outweighs a token found in most stories."""
+        from utils.scoring import KeywordIndex
+
+        index = KeywordIndex(self.STORIES)
+        assert index.idf("payments") > index.idf("platform")
+
+    def test_empty_query_scores_zero(self):
+        from utils.scoring import keyword_scores
+
+        assert not keyword_scores(self.STORIES, "").any()
+
+    def test_default_is_the_overlap_scorer_w_kw_was_tuned_for(self):
+        from utils.scoring import keyword_scores
+
+        query = "platform migration payments"
+        assert (
+            keyword_scores(self.STORIES, query).tolist()
+            == keyword_scores(self.STORIES, query, method="overlap").tolist()
+        )
+
+    def test_unknown_method_raises(self):
+        import pytest
+
+        from utils.scoring import KeywordIndex
+
+        with pytest.raises(ValueError):
+            KeywordIndex(self.STORIES).scores("platform", method="tfidf")
+
+    def test_index_cached_per_list(self):
+        from utils.scoring import get_keyword_index
+
+        stories = list(self.STORIES)
+        first = get_keyword_index(stories)
+        assert get_keyword_index(stories) is first
+        stories.append({"Title": "New"})
+        assert get_keyword_index(stories) is not first
+
+    def test_scores_for_subset_falls_back_for_unindexed(self):
+        from utils.scoring import _keyword_score_for_story, get_keyword_index
+
+        index = get_keyword_index(self.STORIES)
+        copy = dict(self.STORIES[0])
+        got = index.scores_for([self.STORIES[0], copy], "platform", "overlap")
+
+        assert got[0] == got[1] == _keyword_score_for_story(copy, "platform")
+
+
+class TestReciprocalRankFusion:
+    """Tests for reciprocal_rank_fusion()."""
+
+    def test_item_in_both_rankings_wins(self):
+        from utils.scoring import reciprocal_rank_fusion
+
+        fused = reciprocal_rank_fusion([["a", "b"], ["b", "c"]], k=60)
+
+        assert [item for item, _ in fused] == ["b", "a", "c"]
+        assert fused[0][1] == 1 / 62 + 1 / 61
+
+    def test_empty_rankings(self):
+        from utils.scoring import reciprocal_rank_fusion
+
+        assert reciprocal_rank_fusion([[], []]) == []
@@ -335,6 +335,116 @@ class TestSemanticRouter:
         assert family in known_families
 
 
+class TestVectorizedIntentScoring:
+    """Matrix scoring with stubbed embeddings (no OpenAI calls)."""
+
+    INTENTS = {
+        "Who is Matt?": [1.0, 0.0, 0.0],
+        "How does Matt lead teams?": [0.0, 2.0, 0.0],  # un-normalized on purpose
+        "What's Matt's leadership style?": [0.0, 0.9, 0.1],
+        "How old is Matt": [0.0, 0.0, 1.0],
+    }
+
+    @pytest.fixture(autouse=True)
+    def stub_embeddings(self, monkeypatch):
+        from services import semantic_router
+
+        monkeypatch.setattr(semantic_router, "_intent_matrix_cache", None)
+        monkeypatch.setattr(
+            semantic_router, "_get_intent_embeddings", lambda: self.INTENTS
+        )
+        monkeypatch.setattr(semantic_router, "_log_borderline", lambda *a: None)
+        self.router = semantic_router
+
+    def test_best_intent_matches_loop_cosine(self):
+        scores = self.router._score_embedding([0.1, 1.0, 0.0])
+        expected = max(
+            self.INTENTS,
+            key=lambda i: self.router._cosine_similarity(
+                [0.1, 1.0, 0.0], self.INTENTS[i]
+            ),
+        )
+        assert scores["intent"] == expected
+        assert scores["family"] == "leadership"
+
+    def test_top_k_sorted_descending(self):
+        scores = self.router._score_embedding([0.0, 1.0, 0.05], top_k=2)
+        top = scores["top_intents"]
+        assert len(top) == 2
+        assert top[0]["score"] >= top[1]["score"]
+        assert {t["family"] for t in top} == {"leadership"}
+
+    def test_family_scores_are_per_family_max(self):
+        scores = self.router._score_embedding([1.0, 0.0, 0.0])
+        assert scores["family_scores"]["background"] == pytest.approx(1.0, abs=1e-6)
+        assert scores["family_scores"]["personal"] == pytest.approx(0.0, abs=1e-6)
+
+    def test_zero_vector_yields_no_match(self):
+        scores = self.router._score_embedding([0.0, 0.0, 0.0])
+        assert scores["intent"] == ""
+        assert scores["family"] == "unknown"
+
+    def test_router_tuple_uses_matrix_scores(self, monkeypatch):
+        monkeypatch.setattr(self.router, "_get_embedding", lambda q: [0.0, 0.0, 3.0])
+        is_valid, score, intent, family = self.router.is_portfolio_query_semantic(
+            "how old is he"
+        )
+        assert (is_valid, intent, family) == (True, "How old is Matt", "personal")
+        assert score == pytest.approx(1.0, abs=1e-6)
+
+
+class TestIntentEmbeddingCache:
+    """Binary intent cache: reuse by content key, batch-embed only new intents."""
+
+    @pytest.fixture(autouse=True)
+    def isolate_cache(self, monkeypatch, tmp_path):
+        from services import semantic_router
+
+        self.router = semantic_router
+        self.prefix = str(tmp_path / "intents")
+        self.calls = []
+
+        def fake_batch(texts):
+            self.calls.append(list(texts))
+            return [[float(len(t)), 1.0] for t in texts]
+
+        monkeypatch.setattr(semantic_router, "INTENT_CACHE_PREFIX", self.prefix)
+        monkeypatch.setattr(
+            semantic_router, "LEGACY_INTENT_CACHE_PATH", str(tmp_path / "none.json")
+        )
+        monkeypatch.setattr(semantic_router, "_get_embeddings_batch", fake_batch)
+        monkeypatch.setattr(semantic_router, "_intent_embeddings_cache", None)
+        monkeypatch.setattr(semantic_router, "ALL_VALID_INTENTS", ["a", "bb"])
+
+    def _reload(self):
+        self.router._intent_embeddings_cache = None
+        return self.router._get_intent_embeddings()
+
+    def test_cold_start_embeds_all_in_one_batch(self):
+        emb = self._reload()
+        assert self.calls == [["a", "bb"]]
+        assert list(emb) == ["a", "bb"]
+
+    def test_warm_start_embeds_nothing(self):
+        self._reload()
+        self._reload()
+        assert len(self.calls) == 1
+
+    def test_only_new_intent_is_embedded_and_removed_is_pruned(self, monkeypatch):
+        self._reload()
+        monkeypatch.setattr(self.router, "ALL_VALID_INTENTS", ["bb", "ccc"])
+        emb = self._reload()
+        assert self.calls[-1] == ["ccc"]
+        assert list(emb) == ["bb", "ccc"]
+        assert list(self.router._load_intent_cache(self.prefix)) == [
+            self.router._intent_key("bb"),
+            self.router._intent_key("ccc"),
+        ]
+
+    def test_key_depends_on_model(self):
+        assert self.router._intent_key("a", "m1") != self.router._intent_key("a", "m2")
+
+
 # =============================================================================
 # STANDALONE RUNNER
 # =============================================================================
@@ -0,0 +1,110 @@
+"""
+Unit tests for utils/story_record.py - read-only StoryRecord and the
+StoryHit score overlay.
+"""
+
+import copy
+import json
+import pickle
+
+import pytest
+
+from utils.story_record import StoryHit, StoryRecord, freeze_story
+
+
+def _story(**extra):
+    return freeze_story(
+        {
+            "id": "s1",
+            "Title": "Cloud Migration",
+            "Client": "JP Morgan Chase",
+            "Industry": "Financial Services",
+            "public_tags": ["Cloud", "Agile"],
+            **extra,
+        }
+    )
+
+
+class TestStoryRecord:
+    def test_reads_like_a_dict(self):
+        s = _story()
+        assert isinstance(s, dict)
+        assert s.get("Title") == "Cloud Migration"
+        assert s["id"] == "s1"
+        assert s.get("missing", "x") == "x"
+        assert json.loads(json.dumps(s))["Client"] == "JP Morgan Chase"
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda s: s.__setitem__("Title", "x"),
+            lambda s: s.__delitem__("Title"),
+            lambda s: s.update(Title="x"),
+            lambda s: s.setdefault("new", 1),
+            lambda s: s.pop("Title"),
+            lambda s: s.clear(),
+        ],
+    )
+    def test_is_read_only(self, mutate):
+        s = _story()
+        with pytest.raises(TypeError, match="read-only"):
+            mutate(s)
+        assert s["Title"] == "Cloud Migration"
+
+    def test_categorical_values_and_keys_are_interned(self):
+        a = _story()
+        b = freeze_story({"id": "s2", "Industry": "".join(["Financial ", "Services"])})
+        assert a["Industry"] is b["Industry"]
+        assert next(k for k in a if k == "Industry") is next(
+            k for k in b if k == "Industry"
+        )
+
+    def test_copy_returns_overlay_not_a_copy(self):
+        s = _story()
+        view = s.copy()
+        view["pc"] = 0.5
+
+        assert isinstance(view, StoryHit)
+        assert view.story is s
+        assert "pc" not in s
+
+    def test_pickle_and_deepcopy_round_trip(self):
+        s = _story()
+        assert pickle.loads(pickle.dumps(s)) == s
+        assert isinstance(copy.deepcopy(s), StoryRecord)
+
+
+class TestStoryHit:
+    def test_overlay_reads_through_to_story(self):
+        s = _story()
+        hit = StoryHit(s, pc=0.42, kw=0.1)
+
+        assert hit["Title"] == "Cloud Migration"
+        assert hit.get("pc") == 0.42
+        assert "kw" in hit and "Title" in hit
+        assert len(hit) == len(s) + 2
+        assert hit == {**s, "pc": 0.42, "kw": 0.1}
+        assert hit.annotations == {"pc": 0.42, "kw": 0.1}
+
+    def test_writes_never_touch_the_story(self):
+        s = _story()
+        hit = StoryHit(s)
+        hit["_matched_theme"] = "Cloud"
+        hit["Title"] = "Shadowed"
+
+        assert hit["Title"] == "Shadowed"
+        assert s["Title"] == "Cloud Migration"
+
+    def test_wrapping_a_hit_keeps_story_and_overlay(self):
+        s = _story()
+        hit = StoryHit(StoryHit(s, pc=0.3), _search_score=0.3)
+
+        assert hit.story is s
+        assert hit.annotations == {"pc": 0.3, "_search_score": 0.3}
+
+    def test_serializes_as_merged_mapping(self):
+        hit = StoryHit(_story(), pc=0.5)
+
+        assert json.loads(json.dumps(hit))["pc"] == 0.5
+        assert dict(hit)["Title"] == "Cloud Migration"
+        assert pickle.loads(pickle.dumps(hit)) == hit
@@ -0,0 +1,159 @@
+"""
+Unit tests for services/telemetry_spool.py - the local SQLite spool every
+logging path writes to first, its replayer, and the analytics queries.
+"""
+
+import threading
+import time
+
+import pytest
+
+from services import telemetry_spool
+from services.telemetry_spool import TelemetrySpool
+
+
+@pytest.fixture
+def sink(monkeypatch):
+    """A recording sink registered for the "test" stream."""
+    batches = []
+
+    def record(batch):
+        batches.append(batch)
+
+    monkeypatch.setitem(telemetry_spool._SINKS, "test", record)
+    return batches
+
+
+class TestAppendAndReplay:
+    def test_replays_in_order_in_batches(self, sink):
+        spool = TelemetrySpool(db_path=None, batch_size=2)
+        for i in range(3):
+            assert spool.append("test", {"n": i}, target="t")
+
+        assert spool.flush()
+        assert [[(t, r["n"]) for t, r in b] for b in sink] == [
+            [("t", 0), ("t", 1)],
+            [("t", 2)],
+        ]
+        assert spool.pending_count() == 0
+
+        # Already forwarded rows are not sent again
+        spool.flush()
+        assert len(sink) == 2
+
+    def test_records_survive_reopen(self, tmp_path, sink):
+        path = str(tmp_path / "spool.sqlite3")
+        TelemetrySpool(db_path=path).append("test", {"q": "kept"})
+
+        reopened = TelemetrySpool(db_path=path)
+        assert reopened.durable
+        assert reopened.flush()
+        assert sink[0][0][1] == {"q": "kept"}
+
+    def test_failing_sink_backs_off_and_keeps_rows(self, monkeypatch):
+        calls = []
+
+        def flaky(batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise RuntimeError("sheet down")
+
+        monkeypatch.setitem(telemetry_spool._SINKS, "test", flaky)
+        spool = TelemetrySpool(db_path=None, retry_base_seconds=60)
+        spool.append("test", {"n": 1})
+
+        assert spool.replay() == 0
+        assert spool.pending_count() == 1
+        assert spool.replay() == 0  # still backing off
+        assert calls == [1]
+
+        assert spool.replay(force=True) == 1
+        assert spool.pending_count() == 0
+        assert spool.sink_errors == 1
+
+    def test_stream_without_sink_is_kept_locally(self, sink):
+        spool = TelemetrySpool(db_path=None)
+        spool.append("analytics_only", {"x": 1})
+
+        assert spool.flush()
+        assert sink == []
+        assert spool.pending_count(streams=["analytics_only"]) == 1
+
+    def test_processes_sharing_a_file_forward_each_record_once(
+        self, tmp_path, monkeypatch
+    ):
+        forwarded = []
+
+        def slow(batch):
+            time.sleep(0.05)
+            forwarded.extend(r["n"] for _, r in batch)
+
+        monkeypatch.setitem(telemetry_spool._SINKS, "test", slow)
+        path = str(tmp_path / "spool.sqlite3")
+        first, second = TelemetrySpool(db_path=path), TelemetrySpool(db_path=path)
+        for n in range(3):
+            first.append("test", {"n": n})
+
+        threads = [threading.Thread(target=s.flush) for s in (first, second)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(forwarded) == [0, 1, 2]
+
+    def test_unusable_path_falls_back_to_memory(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        spool = TelemetrySpool(db_path=str(blocker / "spool.sqlite3"))
+
+        assert not spool.durable
+        assert spool.append("test", {"n": 1})
+
+
+class TestAnalytics:
+    def test_query_filters(self):
+        spool = TelemetrySpool(db_path=None)
+        spool.append("offdomain", {"query": "a", "reason": "rule:profanity"})
+        spool.append("offdomain", {"query": "b", "reason": "low_confidence"})
+        spool.append("borderline", {"query": "c"})
+
+        assert [r["query"] for r in spool.query("offdomain")] == ["a", "b"]
+        assert [r["query"] for r in spool.query(where={"query": "c"})] == ["c"]
+        assert spool.query("offdomain", since=time.time() + 60) == []
+        (first,) = spool.query(limit=1)
+        assert first["_stream"] == "offdomain"
+        assert first["_forwarded"] is False
+
+    def test_count_by(self):
+        spool = TelemetrySpool(db_path=None)
+        for reason in ["low_confidence", "rule:profanity", "low_confidence"]:
+            spool.append("offdomain", {"reason": reason})
+
+        assert spool.count_by("offdomain", "reason") == {
+            "low_confidence": 2,
+            "rule:profanity": 1,
+        }
+
+    def test_prune_drops_old_forwarded_and_excess_rows(self, sink):
+        spool = TelemetrySpool(db_path=None, retention_seconds=-1, max_rows=2)
+        spool.append("test", {"n": 0})
+        spool.flush()
+        for n in range(1, 4):
+            spool.append("analytics_only", {"n": n})
+
+        spool.prune()
+        assert [r["n"] for r in spool.query()] == [2, 3]
+
+    def test_row_cap_keeps_records_pending_for_a_sink(self, monkeypatch):
+        def down(batch):
+            raise RuntimeError("sheet quota")
+
+        monkeypatch.setitem(telemetry_spool._SINKS, "test", down)
+        spool = TelemetrySpool(db_path=None, max_rows=2)
+        for n in range(4):
+            spool.append("test", {"n": n})
+        spool.flush()
+
+        spool.prune()
+        assert spool.pending_count() == 4
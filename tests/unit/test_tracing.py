@@ -0,0 +1,108 @@
+"""
+Unit tests for utils/tracing.py - per-turn stage timing - and the stage
+columns it adds to the query log.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from utils.tracing import current_trace, span, start_trace, traced
+
+
+class TestSpans:
+    def test_span_without_trace_is_noop(self):
+        assert current_trace() is None
+        with span("search"):
+            pass
+        assert current_trace() is None
+
+    def test_records_nested_spans(self):
+        with start_trace("ask_agy") as trace:
+            assert current_trace() is trace
+            with span("search"):
+                with span("embedding"):
+                    time.sleep(0.002)
+        assert current_trace() is None
+
+        names = [(s.name, s.depth) for s in trace.waterfall()]
+        assert names == [("search", 0), ("embedding", 1)]
+        durations = trace.durations()
+        assert durations["search"] >= durations["embedding"] >= 2.0
+        assert trace.total_ms >= durations["search"]
+
+    def test_repeated_stage_durations_add_up(self):
+        with start_trace() as trace:
+            for _ in range(2):
+                with span("llm"):
+                    pass
+        assert list(trace.durations()) == ["llm"]
+        assert len(trace.spans) == 2
+
+    def test_span_recorded_when_block_raises(self):
+        with start_trace() as trace:
+            with pytest.raises(ValueError):
+                with span("router"):
+                    raise ValueError("boom")
+        assert [s.name for s in trace.spans] == ["router"]
+
+    def test_traced_decorator(self):
+        @traced("ranking")
+        def rank(items):
+            """Rank items."""
+            return sorted(items)
+
+        with start_trace() as trace:
+            assert rank([2, 1]) == [1, 2]
+        assert "ranking" in trace.durations()
+        assert rank.__doc__ == "Rank items."
+
+    def test_format_waterfall(self):
+        with start_trace("ask_agy") as trace:
+            with span("semantic_search"):
+                pass
+        text = trace.format_waterfall()
+        assert text.splitlines()[0].startswith("ask_agy:")
+        assert "semantic_search" in text
+
+
+class TestQueryLogStageColumns:
+    def _logged_row(self, **kwargs):
+        from services import query_logger
+
+        with (
+            patch.object(query_logger, "is_bot", return_value=False),
+            patch.object(
+                query_logger, "_capture_context", return_value=("", "", "", "")
+            ),
+            patch.object(query_logger, "_enqueue") as enqueue,
+        ):
+            query_logger.log_query("q", **kwargs)
+        return enqueue.call_args.args[0]
+
+    def test_stage_columns_follow_headers(self):
+        from services.query_logger import HEADERS, SHEET_HEADERS, STAGE_HEADERS
+
+        assert SHEET_HEADERS[: len(HEADERS)] == HEADERS
+        assert SHEET_HEADERS[len(HEADERS) :] == list(STAGE_HEADERS.values())
+
+    def test_row_filled_from_current_trace(self):
+        from services.query_logger import SHEET_HEADERS
+
+        with start_trace() as trace:
+            with span("semantic_search"):
+                time.sleep(0.002)
+            row = self._logged_row(top_score=0.5)
+
+        assert len(row) == len(SHEET_HEADERS)
+        by_header = dict(zip(SHEET_HEADERS, row, strict=True))
+        assert by_header["Search ms"] == round(trace.durations()["semantic_search"])
+        assert by_header["Total ms"] >= by_header["Search ms"]
+        assert by_header["LLM ms"] == ""
+
+    def test_no_trace_leaves_stage_columns_blank(self):
+        from services.query_logger import HEADERS
+
+        row = self._logged_row()
+        assert all(value == "" for value in row[len(HEADERS) :])
@@ -244,6 +244,174 @@ class TestIsNonsense:
         assert result == "other"
 
 
+class TestNonsenseRuleEngine:
+    """Tests for NonsenseRuleEngine (compiled, prefix-filtered rule matching)."""
+
+    def test_matches_real_rules_like_per_rule_loop(self):
+        """Should return the same category as searching each rule in order."""
+        import re
+
+        from utils.validation import NonsenseRuleEngine, _load_nonsense_rules
+
+        rules = _load_nonsense_rules()
+        engine = NonsenseRuleEngine(rules)
+        queries = [
+            "What's the weather in Atlanta?",
+            "Tell me about platform modernization",
+            "How much is a hat at the gift shop",
+            "Tell me a joke about Taylor Swift",
+            "My Fortune 500 clients",
+            "fortune cookie",
+            "<div>hello</div>",
+            "DEBUG • trace",
+            '{"key": "value"}',
+            "What is Matt's favorite color?",
+        ]
+
+        for q in queries:
+            expected = next(
+                (r["category"] for r in rules if re.search(r["pattern"], q, re.I)),
+                None,
+            )
+            assert engine.match(q) == expected, q
+
+    def test_first_rule_in_file_order_wins(self):
+        """Should prefer the earlier rule even when a later one matches earlier in the text."""
+        from utils.validation import NonsenseRuleEngine
+
+        engine = NonsenseRuleEngine(
+            [
+                {"pattern": r"\bweather\b", "category": "weather"},
+                {"pattern": r"\bstocks?\b", "category": "stocks"},
+            ]
+        )
+        assert engine.match("stocks and weather") == "weather"
+
+    def test_prefilter_skips_rules_without_their_prefix(self):
+        """Should only consider rules whose literal prefix occurs in the query."""
+        from utils.validation import NonsenseRuleEngine
+
+        engine = NonsenseRuleEngine(
+            [
+                {"pattern": r"\b(weather|forecast)\b", "category": "weather"},
+                {"pattern": r"^\s*[{\[]", "category": "code"},
+                {"pattern": r"favorite (color|food)", "category": "trivia"},
+            ]
+        )
+        assert engine.candidates("platform modernization") == [1]
+        assert engine.candidates("Weather and favorite food") == [0, 1, 2]
+
+    def test_non_ascii_query_checks_every_rule(self):
+        """Should not prefilter when IGNORECASE folding differs from str.lower()."""
+        from utils.validation import NonsenseRuleEngine
+
+        engine = NonsenseRuleEngine([{"pattern": r"\bsnow\b", "category": "weather"}])
+        assert engine.match("\u017fnow") == "weather"
+
+    def test_skips_rules_without_usable_pattern(self):
+        """Should ignore rules with missing or uncompilable patterns."""
+        from utils.validation import NonsenseRuleEngine
+
+        engine = NonsenseRuleEngine(
+            [
+                {"category": "empty"},
+                {"pattern": "(", "category": "bad"},
+                {"pattern": "x"},
+            ]
+        )
+        assert len(engine) == 1
+        assert engine.match("x") == "other"
+
+    def test_engine_recompiled_when_rules_replaced(self):
+        """Should rebuild the engine when _NONSENSE_RULES is swapped out."""
+        from utils import validation
+
+        original = validation._NONSENSE_RULES
+        try:
+            validation._NONSENSE_RULES = [{"pattern": "alpha", "category": "a"}]
+            first = validation._get_nonsense_engine()
+            assert validation._get_nonsense_engine() is first
+
+            validation._NONSENSE_RULES = [{"pattern": "beta", "category": "b"}]
+            assert validation.is_nonsense("beta") == "b"
+            assert validation._get_nonsense_engine() is not first
+        finally:
+            validation._NONSENSE_RULES = original
+
+
+class TestBuildKnownVocab:
+    """Tests for build_known_vocab() function."""
+
+    def test_extracts_words_from_stories(self, sample_stories):
+        """Should extract vocabulary from story fields."""
+        # Import here to avoid import errors if module structure changes
+        try:
+            from utils.validation import build_known_vocab
+        except ImportError:
+            pytest.skip("build_known_vocab not available")
+
+        vocab = build_known_vocab(sample_stories)
+
+        # Should contain words from titles (lowercased)
+        assert "payments" in vocab
+        assert "agile" in vocab
+
+        # Should be a set
+        assert isinstance(vocab, set)
+
+    def test_empty_stories_returns_empty_vocab(self):
+        """Should return empty set for empty story list."""
+        try:
+            from utils.validation import build_known_vocab
+        except ImportError:
+            pytest.skip("build_known_vocab not available")
+
+        vocab = build_known_vocab([])
+        assert vocab == set()
+
+    def test_filters_short_tokens(self, sample_stories):
+        """Should exclude tokens shorter than 3 characters."""
+        try:
+            from utils.validation import build_known_vocab
+        except ImportError:
+            pytest.skip("build_known_vocab not available")
+
+        # Add story with short tokens
+        stories = [
+            {
+                "Title": "AI ML Platform",  # "AI" and "ML" should be excluded
+                "Client": "XY Corp",  # "XY" should be excluded
+                "Role": "Director",
+                "Industry": "Tech",
+                "Sub-category": "Platform",
+            }
+        ]
+
+        vocab = build_known_vocab(stories)
+
+        # Short tokens should be filtered
+        assert "ai" not in vocab
+        assert "ml" not in vocab
+        assert "xy" not in vocab
+
+        # Valid tokens should be included
+        assert "platform" in vocab
+        assert "director" in vocab
+
+    def test_handles_missing_fields(self):
+        """Should handle stories with missing fields gracefully."""
+        try:
+            from utils.validation import build_known_vocab
+        except ImportError:
+            pytest.skip("build_known_vocab not available")
+
+        stories = [{"Title": "Test Story"}]  # Missing other fields
+        vocab = build_known_vocab(stories)
+
+        assert "test" in vocab
+        assert "story" in vocab
+
+
 class TestTokenOverlapRatio:
     """Tests for token_overlap_ratio() function."""
 
@@ -0,0 +1,144 @@
+"""
+Unit tests for services/vector_index.py - local NumPy vector index.
+
+Covers:
+- Cosine top-k ordering matches a brute-force reference
+- Pinecone filter subset ($eq, $in, $or, list-valued fields)
+- Save/load round trip and model-mismatch rejection
+"""
+
+import numpy as np
+import pytest
+
+from services.vector_index import (
+    LocalVectorIndex,
+    load_local_index,
+    matches_metadata_filter,
+    save_local_index,
+)
+
+
+@pytest.fixture
+def small_index():
+    """Four 3-d vectors with entity metadata in Pinecone casing."""
+    ids = ["s1", "s2", "s3", "s4"]
+    vectors = [
+        [1.0, 0.0, 0.0],
+        [0.9, 0.1, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, 5.0],  # un-normalized on purpose
+    ]
+    metadata = [
+        {"id": "s1", "client": "JPMC", "employer": "accenture", "tags": ["ai"]},
+        {"id": "s2", "client": "RBC", "employer": "accenture", "tags": ["cloud"]},
+        {"id": "s3", "client": "JPMC", "employer": "jpmc", "tags": []},
+        {"id": "s4", "client": "Takeda", "domain": "Healthcare", "tags": ["ai"]},
+    ]
+    return LocalVectorIndex(ids, vectors, metadata, model="test-model")
+
+
+class TestLocalVectorIndexQuery:
+    """Top-k search semantics."""
+
+    def test_returns_cosine_ranked_matches(self, small_index):
+        res = small_index.query(vector=[1.0, 0.0, 0.0], top_k=2)
+        ids = [m["id"] for m in res.matches]
+        assert ids == ["s1", "s2"]
+        assert res.matches[0]["score"] == pytest.approx(1.0, abs=1e-6)
+
+    def test_rows_are_normalized(self, small_index):
+        res = small_index.query(vector=[0.0, 0.0, 1.0], top_k=1)
+        assert res.matches[0]["id"] == "s4"
+        assert res.matches[0]["score"] == pytest.approx(1.0, abs=1e-6)
+
+    def test_matches_brute_force_reference(self):
+        rng = np.random.default_rng(7)
+        vecs = rng.normal(size=(50, 16)).astype(np.float32)
+        idx = LocalVectorIndex([f"s{i}" for i in range(50)], vecs)
+        q = rng.normal(size=16)
+        ref = vecs @ q / (np.linalg.norm(vecs, axis=1) * np.linalg.norm(q))
+        expected = [f"s{i}" for i in np.argsort(-ref)[:5]]
+        assert [m["id"] for m in idx.query(vector=q, top_k=5).matches] == expected
+
+    def test_top_k_larger_than_corpus(self, small_index):
+        res = small_index.query(vector=[1.0, 1.0, 1.0], top_k=50)
+        assert len(res.matches) == 4
+
+    def test_zero_vector_returns_zero_scores(self, small_index):
+        res = small_index.query(vector=[0.0, 0.0, 0.0], top_k=2)
+        assert all(m["score"] == 0.0 for m in res.matches)
+
+    def test_metadata_included_by_default(self, small_index):
+        res = small_index.query(vector=[1.0, 0.0, 0.0], top_k=1)
+        assert res.matches[0]["metadata"]["client"] == "JPMC"
+
+    def test_shape_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            LocalVectorIndex(["a", "b"], [[1.0, 0.0]])
+
+
+class TestLocalVectorIndexFilters:
+    """Pinecone filter subset used by pinecone_semantic_search()."""
+
+    def test_in_filter(self, small_index):
+        res = small_index.query(
+            vector=[1.0, 0.0, 0.0], top_k=10, filter={"client": {"$in": ["JPMC"]}}
+        )
+        assert [m["id"] for m in res.matches] == ["s1", "s3"]
+
+    def test_entity_or_filter(self, small_index):
+        flt = {
+            "$or": [
+                {"client": {"$eq": "Accenture"}},
+                {"employer": {"$eq": "accenture"}},
+                {"division": {"$eq": "accenture"}},
+            ]
+        }
+        res = small_index.query(vector=[0.0, 1.0, 0.0], top_k=10, filter=flt)
+        assert {m["id"] for m in res.matches} == {"s1", "s2"}
+
+    def test_list_valued_field_matches_any_element(self, small_index):
+        res = small_index.query(
+            vector=[1.0, 0.0, 0.0], top_k=10, filter={"tags": {"$in": ["ai"]}}
+        )
+        assert {m["id"] for m in res.matches} == {"s1", "s4"}
+
+    def test_filter_with_no_candidates(self, small_index):
+        res = small_index.query(
+            vector=[1.0, 0.0, 0.0], top_k=10, filter={"client": {"$eq": "Nobody"}}
+        )
+        assert res.matches == []
+
+    def test_implicit_and_across_keys(self):
+        meta = {"client": "JPMC", "domain": "Payments"}
+        assert matches_metadata_filter(
+            meta, {"client": {"$eq": "JPMC"}, "domain": {"$in": ["Payments"]}}
+        )
+        assert not matches_metadata_filter(
+            meta, {"client": {"$eq": "JPMC"}, "domain": {"$in": ["Cloud"]}}
+        )
+
+    def test_missing_field_does_not_match(self):
+        assert not matches_metadata_filter({}, {"division": {"$eq": "x"}})
+
+
+class TestLocalIndexPersistence:
+    """save_local_index / load_local_index round trip."""
+
+    def test_round_trip(self, tmp_path):
+        prefix = str(tmp_path / "vecs")
+        save_local_index(
+            ["a", "b"], [[1.0, 0.0], [0.0, 1.0]], [{"x": 1}, {"x": 2}], prefix, "m1"
+        )
+        idx = load_local_index(prefix, model="m1")
+        assert idx is not None
+        assert len(idx) == 2
+        assert idx.query(vector=[0.0, 1.0], top_k=1).matches[0]["id"] == "b"
+
+    def test_model_mismatch_returns_none(self, tmp_path):
+        prefix = str(tmp_path / "vecs")
+        save_local_index(["a"], [[1.0, 0.0]], [{}], prefix, "m1")
+        assert load_local_index(prefix, model="m2") is None
+
+    def test_missing_files_return_none(self, tmp_path):
+        assert load_local_index(str(tmp_path / "nope")) is None
@@ -11,142 +11,12 @@ Era-based timeline with progressive disclosure.
 - Click story to show detail panel
 """
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 
 import streamlit as st
 import streamlit.components.v1 as components
 
-# =============================================================================
-# ERA CONFIGURATION
-# =============================================================================
-
-# Eras in chronological order (most recent first for display)
-ERA_ORDER = [
-    "Independent Product Development",
-    "Enterprise Innovation & Transformation",
-    "Cloud-Native Prototyping & Product Shaping",
-    "Financial Services Platform Modernization",
-    "Integration & Platform Foundations",
-]
-
-# Era subtitles (short, muted descriptions)
-ERA_SUBTITLES = {
-    "Independent Product Development": "Portfolio development, RAG architecture, product design",
-    "Enterprise Innovation & Transformation": "Cloud Innovation Center, enterprise delivery, GenAI, DevSecOps",
-    "Cloud-Native Prototyping & Product Shaping": "Liquid Studio, lean product shaping, rapid experimentation",
-    "Financial Services Platform Modernization": "Payments, platform architecture, global deployments",
-    "Integration & Platform Foundations": "Enterprise integration, SOA, technical foundations",
-}
-
-# Era to exclude from Timeline (still appears in Table/Cards)
-EXCLUDED_ERA = "Leadership & Professional Narrative"
-
-MAX_STORIES_PER_ERA = 6
-
-
-# =============================================================================
-# HELPER FUNCTIONS
-# =============================================================================
-
-
-def parse_year(date_str: str | None) -> int | None:
-    """Extract year from date string (YYYY-MM or YYYY format)."""
-    if not date_str:
-        return None
-    try:
-        if "-" in str(date_str):
-            return int(str(date_str).split("-")[0])
-        return int(date_str)
-    except (ValueError, TypeError):
-        return None
-
-
-def get_era_sort_key(era: str) -> int:
-    """Get sort key for era ordering (lower = more recent)."""
-    try:
-        return ERA_ORDER.index(era)
-    except ValueError:
-        return len(ERA_ORDER)
-
-
-def get_era_date_range(stories: list[dict]) -> str:
-    """Calculate date range string from stories (e.g., '2019 – 2023')."""
-    years = []
-    for story in stories:
-        start_year = parse_year(story.get("Start_Date"))
-        end_year = parse_year(story.get("End_Date"))
-        if start_year:
-            years.append(start_year)
-        if end_year:
-            years.append(end_year)
-
-    if not years:
-        return ""
-
-    min_year = min(years)
-    max_year = max(years)
-
-    if min_year == max_year:
-        return str(min_year)
-    return f"{min_year} – {max_year}"
-
-
-def group_stories_by_era(stories: list[dict]) -> dict[str, dict]:
-    """
-    Group stories by Era and calculate date ranges.
-    Excludes Leadership & Professional Narrative stories.
-
-    Returns dict like:
-    {
-        "Enterprise Innovation & Transformation": {
-            "stories": [...],  # sorted by Start_Date desc, limited to MAX_STORIES_PER_ERA
-            "all_stories": [...],  # all stories for this era
-            "date_range": "2019 – 2023",
-            "total_count": 63,
-            "subtitle": "Cloud Innovation Center, enterprise delivery..."
-        },
-        ...
-    }
-    """
-    grouped: dict[str, list[dict]] = {}
-
-    for story in stories:
-        era = story.get("Era", "").strip()
-
-        # Skip excluded era
-        if era == EXCLUDED_ERA or not era:
-            continue
-
-        if era not in grouped:
-            grouped[era] = []
-        grouped[era].append(story)
-
-    result = {}
-
-    # Sort eras by defined order
-    sorted_eras = sorted(grouped.keys(), key=get_era_sort_key)
-
-    for era in sorted_eras:
-        era_stories = grouped[era]
-
-        # Sort stories by Start_Date descending (most recent first)
-        sorted_stories = sorted(
-            era_stories, key=lambda s: s.get("Start_Date", "") or "", reverse=True
-        )
-
-        date_range = get_era_date_range(era_stories)
-        subtitle = ERA_SUBTITLES.get(era, "")
-
-        result[era] = {
-            "stories": sorted_stories[:MAX_STORIES_PER_ERA],
-            "all_stories": sorted_stories,
-            "date_range": date_range,
-            "total_count": len(sorted_stories),
-            "subtitle": subtitle,
-        }
-
-    return result
-
+from utils.eras import group_stories_by_era
 
 # =============================================================================
 # RENDER FUNCTIONS
@@ -214,6 +84,7 @@ def render_timeline_view(
     stories: list[dict],
     on_story_click: Callable[[dict], None] | None = None,
     on_explore_era: Callable[[str], None] | None = None,
+    grouped: Mapping[str, dict] | None = None,
 ) -> None:
     """
     Render the collapsible timeline view grouped by Era.
@@ -222,8 +93,11 @@ def render_timeline_view(
         stories: List of filtered story dictionaries
         on_story_click: Callback when a story card is clicked
         on_explore_era: Callback when "Explore all" is clicked (receives era name)
+        grouped: Precomputed group_stories_by_era(stories), e.g. the
+            CorpusSnapshot's era groups when no filter is active
     """
-    grouped = group_stories_by_era(stories)
+    if grouped is None:
+        grouped = group_stories_by_era(stories)
 
     if not grouped:
         st.info("No stories found matching your filters.")
@@ -5,11 +5,10 @@ Handles RAG (Retrieval-Augmented Generation) and OpenAI integration.
 Includes nonsense detection, semantic search orchestration, and Agy response generation.
 """
 
-import csv
 import logging
-import os
 import re
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import UTC, datetime
 from typing import Any
 
@@ -17,29 +16,41 @@ import streamlit as st
 
 from config.constants import (
     ENTITY_ALIASES,
-    ENTITY_DETECTION_FIELDS,
-    EXCLUDED_DIVISION_VALUES,
+    EXCLUSION_PREFIXES,
     META_COMMENTARY_REGEX_PATTERNS,
     PINECONE_LOWERCASE_FIELDS,
     SEARCH_TOP_K,
+    SYNTHESIS_SINGLE_QUERY,
+    SYNTHESIS_WIDE_TOP_K,
 )
 from config.debug import DEBUG
+from services import telemetry_spool
+from services.csv_log_writer import CsvLogWriter
+from services.openai_client import get_openai_client
 from services.pinecone_service import (
     PINECONE_NAMESPACE,
-    _embed,
-    _init_pinecone,
+    EmbeddingContext,
+    _get_vector_index,
 )
 from services.query_logger import log_query
 from services.rag_service import semantic_search
-from services.semantic_router import is_portfolio_query_semantic
-from utils.client_utils import is_generic_client
+from services.semantic_router import (
+    is_portfolio_query_semantic,
+    score_query_intents,
+)
+from utils.client_utils import derive_known_clients, is_generic_client
+from utils.corpus_index import CorpusIndex, get_corpus_index
+from utils.corpus_snapshot import get_corpus_snapshot
+from utils.entity_matcher import get_entity_matcher
 from utils.formatting import (
     _format_deep_dive,
     _format_key_points,
     _format_narrative,
     build_5p_summary,
 )
-from utils.scoring import _build_retrieval_query, _keyword_score_for_story
+from utils.scoring import _build_retrieval_query, get_keyword_index
+from utils.story_record import StoryHit
+from utils.tracing import current_trace, span, start_trace, traced
 from utils.ui_helpers import dbg
 from utils.validation import _tokenize, is_nonsense, token_overlap_ratio
 
@@ -57,59 +68,40 @@ logger = logging.getLogger(__name__)
 
 # SEARCH_TOP_K imported from config.constants
 
-# Clients to exclude from dynamic client list (not real named clients)
-# Known clients - derived dynamically from story data at startup
+# Known clients - set from the CorpusSnapshot by sync_portfolio_metadata()
 _KNOWN_CLIENTS: set[str] | None = None
 
 
+# Agy answer generation (blocking and streaming paths share these)
+AGY_RESPONSE_MODEL = "gpt-4o"
+AGY_RESPONSE_MAX_TOKENS = 700
+RATE_LIMIT_MESSAGE = "🐾 I need a quick breather — try again in about 15 seconds!"
+
+
 class RateLimitError(Exception):
     """Raised when OpenAI rate limit is hit. Caller should suppress sources."""
 
     pass
 
 
+def _is_rate_limit_error(e: Exception) -> bool:
+    """True for OpenAI 429 / rate-limit failures."""
+    err_lower = str(e).lower()
+    return "429" in str(e) or "rate_limit" in err_lower or "rate limit" in err_lower
+
+
 def get_known_clients(stories: list[dict]) -> set[str]:
     """Derive known client names from story data for post-processing bolding.
 
     Uses pattern-based is_generic_client() to filter out generic values like
-    'Fortune 500 Clients', 'Independent Project', etc.
+    'Fortune 500 Clients', 'Independent Project', etc. Returns the corpus
+    clients synced at startup; before that, derives them from stories.
     """
-    global _KNOWN_CLIENTS
     if _KNOWN_CLIENTS is None:
-        _KNOWN_CLIENTS = {
-            s.get("Client")
-            for s in stories
-            if s.get("Client") and not is_generic_client(s.get("Client"))
-        }
+        return derive_known_clients(stories)
     return _KNOWN_CLIENTS
 
 
-# Cache for narrative titles
-_NARRATIVE_TITLES: list[str] | None = None
-
-
-def get_narrative_titles(stories: list[dict]) -> list[str]:
-    """Derive Professional Narrative story titles for intent classification.
-
-    Returns titles of stories where Theme='Professional Narrative'.
-    These are used to detect biographical/narrative intent queries.
-
-    Args:
-        stories: Story corpus
-
-    Returns:
-        List of narrative story titles (lowercase for matching)
-    """
-    global _NARRATIVE_TITLES
-    if _NARRATIVE_TITLES is None:
-        _NARRATIVE_TITLES = [
-            s.get("Title", "").lower()
-            for s in stories
-            if s.get("Theme") == "Professional Narrative" and s.get("Title")
-        ]
-    return _NARRATIVE_TITLES
-
-
 # Theme names for synthesis mode coverage
 # NOTE: Dynamically derived from stories at startup via sync_portfolio_metadata()
 SYNTHESIS_THEMES: list[str] = []
@@ -127,16 +119,6 @@ _PN_EXCLUDED_FAMILIES: frozenset[str] = frozenset(
     }
 )
 
-# Themes to exclude from synthesis (too generic or internal-only)
-EXCLUDED_THEMES = {
-    "Internal",
-    "Confidential",
-    "Other",
-    "N/A",
-    "",
-    None,
-}
-
 # Matt DNA - Ground truth injected into all prompts
 # NOTE: Dynamically generated at startup via sync_portfolio_metadata()
 MATT_DNA: str = ""
@@ -159,6 +141,9 @@ def sync_portfolio_metadata(stories: list[dict]) -> None:
     Ensures MATT_DNA and SYNTHESIS_THEMES never drift from story data.
     Call this once during app initialization after loading stories.
 
+    Values come from the shared CorpusSnapshot, so they always describe
+    the same corpus version as the facets and vocabularies.
+
     Args:
         stories: The loaded story corpus from JSONL.
     """
@@ -170,34 +155,23 @@ def sync_portfolio_metadata(stories: list[dict]) -> None:
         _CAREER_END_YEAR, \
         _CAREER_SPAN_YEARS
 
+    snapshot = get_corpus_snapshot(stories)
+
     # 1. Derive Themes (Fix for Theme Fragility)
-    # Automatically picks up new themes or renames in the JSONL
-    # Excludes generic labels like 'Internal', 'Confidential', 'Other'
-    SYNTHESIS_THEMES = sorted(
-        list(
-            set(
-                s.get("Theme")
-                for s in stories
-                if s.get("Theme") and s.get("Theme") not in EXCLUDED_THEMES
-            )
-        )
-    )
+    SYNTHESIS_THEMES = list(snapshot.synthesis_themes)
 
     # 2. Derive Known Clients (Fix for Entity Logic)
-    # Uses existing helper to ensure intent classification stays in sync
-    _KNOWN_CLIENTS = get_known_clients(stories)
+    _KNOWN_CLIENTS = set(snapshot.known_clients)
 
-    # 3. Derive career-span constants from corpus dates (MATTGPT-161).
-    # min(Start_Date) and max(End_Date) as YYYY-MM strings are safe under
-    # string sort because the format is zero-padded. Not rendered into
-    # MATT_DNA prose; consumed by callers that need the math.
-    _CAREER_START_YEAR = int(min(s["Start_Date"] for s in stories)[:4])
-    _CAREER_END_YEAR = int(max(s["End_Date"] for s in stories)[:4])
-    _CAREER_SPAN_YEARS = _CAREER_END_YEAR - _CAREER_START_YEAR
+    # 3. Career-span constants (MATTGPT-161). Not rendered into MATT_DNA
+    # prose; consumed by callers that need the math.
+    _CAREER_START_YEAR = snapshot.career_start_year
+    _CAREER_END_YEAR = snapshot.career_end_year
+    _CAREER_SPAN_YEARS = snapshot.career_span_years
 
     # 4. Dynamic DNA Generation
     # Injects real-time stats into the system prompt to prevent hallucination
-    MATT_DNA = generate_dynamic_dna(stories, _KNOWN_CLIENTS)
+    MATT_DNA = generate_dynamic_dna(stories, _KNOWN_CLIENTS, SYNTHESIS_THEMES)
 
     # --- THE 1-SECOND TERMINAL AUDIT (once per session) ---
     if DEBUG and not st.session_state.get("__sanity_check_printed__"):
@@ -211,7 +185,9 @@ def sync_portfolio_metadata(stories: list[dict]) -> None:
         print("   - DNA Status:       [DYNAMICALLY SYNCED]\n")
 
 
-def generate_dynamic_dna(stories: list[dict], clients: set[str]) -> str:
+def generate_dynamic_dna(
+    stories: list[dict], clients: set[str], themes: list[str] | None = None
+) -> str:
     """Generate MATT_DNA ground truth prompt from live story data.
 
     Extracts key metrics (practitioner count, career span, client list) from
@@ -220,6 +196,7 @@ def generate_dynamic_dna(stories: list[dict], clients: set[str]) -> str:
     Args:
         stories: The story corpus.
         clients: Set of known client names.
+        themes: Synthesis themes to list (default: SYNTHESIS_THEMES).
 
     Returns:
         The MATT_DNA prompt string with dynamic values injected.
@@ -241,9 +218,9 @@ def generate_dynamic_dna(stories: list[dict], clients: set[str]) -> str:
     client_list = ", ".join(sorted(clients)) if clients else "Various clients"
 
     # Derive themes list for the prompt
-    themes_text = "\n".join(
-        f"{i+1}. {theme}" for i, theme in enumerate(SYNTHESIS_THEMES)
-    )
+    if themes is None:
+        themes = SYNTHESIS_THEMES
+    themes_text = "\n".join(f"{i+1}. {theme}" for i, theme in enumerate(themes))
 
     # Derive clients by industry from story data (Single Source of Truth)
     clients_by_industry: dict[str, set[str]] = {}
@@ -295,7 +272,7 @@ Software Engineer → Solution Architect → Director → Cloud Innovation Cente
 - 2019-2023: CIC Director (scaled 0→{p_count}, Fortune 500 transformation)
 - 2023-2026: Sabbatical (MattGPT, job search)
 
-**The {len(SYNTHESIS_THEMES)} Themes of Matt's Work (use these for synthesis):**
+**The {len(themes)} Themes of Matt's Work (use these for synthesis):**
 {themes_text}
 
 **Theme Strengths:**
@@ -388,8 +365,6 @@ def detect_entity(query: str, stories: list[dict]) -> tuple[str, str] | None:
     # Example: "career transition after Accenture" should NOT filter
     # to Accenture stories - it's asking about leaving Accenture.
     # =================================================================
-    EXCLUSION_PREFIXES = ["after ", "leaving ", "before ", "transition from ", "left "]
-
     def _is_excluded_context(entity_lower: str) -> bool:
         """Check if entity is preceded by exclusion phrase."""
         pos = q_lower.find(entity_lower)
@@ -406,70 +381,90 @@ def detect_entity(query: str, stories: list[dict]) -> tuple[str, str] | None:
                 return True
         return False
 
-    # Check acronym/abbreviation aliases first (e.g., "CIC" → Division:Cloud Innovation Center)
-    for alias, (field, canonical) in ENTITY_ALIASES.items():
-        if re.search(rf"\b{re.escape(alias)}\b", q_lower):
-            if _is_excluded_context(alias):
-                return None
-            if DEBUG:
-                print(f"DEBUG: Entity alias matched: '{alias}' → {field}:{canonical}")
-            return (field, canonical)
-
-    # Build entity sets from ALL relevant fields (exact match only)
-    for field in ENTITY_DETECTION_FIELDS:
-        known_entities = {
-            s.get(field)
-            for s in stories
-            if s.get(field) and not is_generic_client(s.get(field))
-        }
-        # Sort by length descending to match longer names first
-        # (e.g., "JP Morgan Chase" before "JP Morgan")
-        for entity in sorted(known_entities, key=len, reverse=True):
-            # Skip excluded Division values (common words that cause false positives)
-            if field == "Division" and entity in EXCLUDED_DIVISION_VALUES:
-                continue
-            if entity.lower() in q_lower:
-                # Check for exclusion context
-                if _is_excluded_context(entity.lower()):
-                    return None
-                return (field, entity)
-
-    # =================================================================
-    # STORY TITLE DETECTION (Jan 2026)
-    # Check if query contains an exact story title.
-    # This handles "Ask Agy About This" pattern: "Tell me more about: [title]"
-    # NOTE: We only match EXACT titles, not keywords, because common words
+    # One pass over the query with the matcher compiled from this corpus.
+    # Priority: aliases (e.g., "CIC" → Division:Cloud Innovation Center),
+    # then Client/Employer/Division values longest first (e.g.,
+    # "JP Morgan Chase" before "JP Morgan"), then exact story titles.
+    # NOTE: Titles match EXACTLY, not by keyword, because common words
     # like "leadership", "culture" appear in both titles and general queries.
-    # =================================================================
-    all_titles = {s.get("Title", "") for s in stories if s.get("Title")}
-    for title in sorted(all_titles, key=len, reverse=True):
-        if title.lower() in q_lower:
-            if DEBUG:
-                print(f"DEBUG: Title match found: {title}")
-            return ("Title", title)
+    match = get_entity_matcher(stories).match(q_lower)
+    if match is None:
+        return None
+    field, value, matched_text, is_alias = match
+
+    if field == "Title":
+        # "Ask Agy About This" pattern: "Tell me more about: [title]"
+        if DEBUG:
+            print(f"DEBUG: Title match found: {value}")
+        return ("Title", value)
+
+    if _is_excluded_context(matched_text):
+        return None
+    if DEBUG and is_alias:
+        print(f"DEBUG: Entity alias matched: '{matched_text}' → {field}:{value}")
+    return (field, value)
 
-    return None
 
+def _synthesis_match_story(
+    match: Any, corpus: CorpusIndex, theme: str | None = None
+) -> dict | None:
+    """Annotated StoryHit for the story behind a vector match (None if unknown).
 
+    theme defaults to the match's Theme metadata (falling back to the story's
+    own Theme field).
+    """
+    if isinstance(match, dict):
+        meta = match.get("metadata") or {}
+        match_id = meta.get("id") or match.get("id")
+        score = float(match.get("score") or 0.0)
+    else:
+        meta = getattr(match, "metadata", None) or {}
+        match_id = meta.get("id") or getattr(match, "id", None)
+        score = float(getattr(match, "score", 0.0) or 0.0)
+
+    story = corpus.get(match_id)
+    if not story:
+        return None
+    return StoryHit(
+        story,
+        _search_score=score,
+        _matched_theme=theme or meta.get("Theme") or story.get("Theme"),
+    )
+
+
+@traced("synthesis_retrieval")
 def get_synthesis_stories(
-    stories: list[dict], top_per_theme: int = 2, query: str | None = None
+    stories: list[dict],
+    top_per_theme: int = 2,
+    query: str | None = None,
+    embedding_ctx: EmbeddingContext | None = None,
 ) -> list[dict]:
     """
-    Parallel metadata-filtered search across themes.
+    Theme-bucketed search for synthesis queries.
     Returns best stories per theme for synthesis queries.
 
+    With a query, one wide vector query covers every theme
+    (filter Theme $in SYNTHESIS_THEMES, plus the entity filter when the query
+    names a Client/Employer/etc.) and results are bucketed by Theme
+    in-process, keeping the best top_per_theme per bucket: one round-trip
+    instead of one per theme. Entity-scoped themes with no matching stories
+    simply come back empty. Without a query (or if its embedding failed),
+    each theme is searched with its own name's embedding, as before.
+
     Args:
         stories: Full story corpus for ID lookup
         top_per_theme: Number of stories to retrieve per theme
         query: Optional query string to detect client-scoped synthesis
+        embedding_ctx: Per-turn EmbeddingContext; reuses the query vector
+            already computed by the router/retrieval
 
     Returns:
         List of stories with _search_score and _matched_theme annotations
     """
-    idx = _init_pinecone()
+    idx = _get_vector_index()
     if not idx:
         if DEBUG:
-            print("DEBUG: get_synthesis_stories - Pinecone not available")
+            print("DEBUG: get_synthesis_stories - vector index not available")
         return []
 
     # Detect if query mentions a specific entity (Client, Employer, Division, etc.)
@@ -479,78 +474,128 @@ def get_synthesis_stories(
             f"DEBUG synthesis: detected entity scope = {entity_match[0]}:{entity_match[1]}"
         )
 
+    entity_filter: dict[str, Any] = {}
+    if entity_match:
+        entity_field, entity_value = entity_match
+        pc_field = entity_field.lower()
+        if pc_field in PINECONE_LOWERCASE_FIELDS:
+            entity_value = entity_value.lower()
+        entity_filter = {pc_field: {"$eq": entity_value}}
+
+    # Built once per corpus; maps match ids back to stories in O(1)
+    corpus = get_corpus_index(stories)
+
     # Use USER'S query for semantic search, not fixed theme keywords
-    user_query_vector = _embed(query) if query else None
+    if embedding_ctx is None:
+        embedding_ctx = EmbeddingContext()
+    user_query_vector = embedding_ctx.embed(query) if query else None
+    if user_query_vector is not None and not any(user_query_vector):
+        # A failed embedding comes back as a zero vector; search by theme names
+        user_query_vector = None
+
+    if SYNTHESIS_SINGLE_QUERY and user_query_vector:
+        pool = _synthesis_single_query(
+            idx, user_query_vector, entity_filter, corpus, top_per_theme
+        )
+    else:
+        pool = _synthesis_per_theme(
+            idx, user_query_vector, entity_filter, corpus, top_per_theme, embedding_ctx
+        )
 
-    def search_theme(theme: str) -> list[dict]:
-        # Use user's query embedding for relevance, filter by theme for coverage
-        query_vector = user_query_vector if user_query_vector else _embed(theme)
+    if DEBUG:
+        print(
+            f"DEBUG synthesis pool: {len(pool)} unique stories across {len(SYNTHESIS_THEMES)} themes"
+        )
 
-        try:
-            # If entity detected, try entity+theme filter first
-            if entity_match:
-                entity_field, entity_value = entity_match
-                pc_field = entity_field.lower()
-                pc_value = (
-                    entity_value.lower()
-                    if pc_field in PINECONE_LOWERCASE_FIELDS
-                    else entity_value
-                )
-                results = idx.query(
-                    vector=query_vector,
-                    filter={
-                        "Theme": {"$eq": theme},
-                        pc_field: {"$eq": pc_value},
-                    },
-                    top_k=top_per_theme,
-                    include_metadata=True,
-                    namespace=PINECONE_NAMESPACE,
-                )
-                matches = getattr(results, "matches", []) or []
-                # Skip this theme if no entity-scoped results (don't fall back to other entities)
-                if not matches:
-                    if DEBUG:
-                        print(
-                            f"DEBUG synthesis: no {entity_field}={entity_value} stories for {theme}, skipping"
-                        )
-                    return []  # Return empty for this theme - don't pollute with other entities
-            else:
-                # No client detected - use theme-only filter
-                results = idx.query(
-                    vector=query_vector,
-                    filter={"Theme": {"$eq": theme}},
-                    top_k=top_per_theme,
-                    include_metadata=True,
-                    namespace=PINECONE_NAMESPACE,
-                )
+    return pool
 
-            theme_stories = []
-            matches = getattr(results, "matches", []) or []
-            for match in matches:
-                # Extract ID from match
-                if isinstance(match, dict):
-                    meta = match.get("metadata") or {}
-                    match_id = meta.get("id") or match.get("id")
-                    score = float(match.get("score") or 0.0)
-                else:
-                    meta = getattr(match, "metadata", None) or {}
-                    match_id = meta.get("id") or getattr(match, "id", None)
-                    score = float(getattr(match, "score", 0.0) or 0.0)
 
-                # Find story in corpus
-                story = next(
-                    (s for s in stories if str(s.get("id")) == str(match_id)), None
-                )
-                if story:
-                    # Add annotations
-                    story_copy = story.copy()
-                    story_copy["_search_score"] = score
-                    story_copy["_matched_theme"] = theme
-                    theme_stories.append(story_copy)
+def _match_score(match: Any) -> float:
+    if isinstance(match, dict):
+        return float(match.get("score") or 0.0)
+    return float(getattr(match, "score", 0.0) or 0.0)
+
 
+def _synthesis_single_query(
+    idx: Any,
+    query_vector: list[float],
+    entity_filter: dict[str, Any],
+    corpus: CorpusIndex,
+    top_per_theme: int,
+) -> list[dict]:
+    """One wide query across all themes, bucketed by Theme in-process."""
+    # Every story matching the filter is ranked, so each bucket's top N equals
+    # what a per-theme filtered query would have returned.
+    top_k = min(SYNTHESIS_WIDE_TOP_K, max(len(corpus), 1))
+    try:
+        results = idx.query(
+            vector=query_vector,
+            filter={"Theme": {"$in": list(SYNTHESIS_THEMES)}, **entity_filter},
+            top_k=top_k,
+            include_metadata=True,
+            namespace=PINECONE_NAMESPACE,
+        )
+    except Exception as e:
+        if DEBUG:
+            print(f"DEBUG synthesis search error: {e}")
+        return []
+
+    buckets: dict[str, list[dict]] = {theme: [] for theme in SYNTHESIS_THEMES}
+    matches = getattr(results, "matches", []) or []
+    # Matches arrive best-first; fill each bucket up to top_per_theme
+    for match in sorted(matches, key=_match_score, reverse=True):
+        story = _synthesis_match_story(match, corpus)
+        if not story:
+            continue
+        bucket = buckets.get(story["_matched_theme"])
+        if bucket is not None and len(bucket) < top_per_theme:
+            bucket.append(story)
+
+    if DEBUG:
+        for theme, theme_stories in buckets.items():
+            print(f"DEBUG synthesis search: {theme} → {len(theme_stories)} stories")
+        if entity_filter:
+            empty = [t for t, b in buckets.items() if not b]
+            if empty:
+                print(f"DEBUG synthesis: no {entity_filter} stories for {empty}")
+
+    return _dedupe_theme_results(buckets.values())
+
+
+def _synthesis_per_theme(
+    idx: Any,
+    user_query_vector: list[float] | None,
+    entity_filter: dict[str, Any],
+    corpus: CorpusIndex,
+    top_per_theme: int,
+    embedding_ctx: EmbeddingContext,
+) -> list[dict]:
+    """One filtered query per theme (query-less synthesis, or fallback)."""
+    if not user_query_vector:
+        # All theme names in one embeddings call
+        embedding_ctx.embed_many(SYNTHESIS_THEMES)
+
+    def search_theme(theme: str) -> list[dict]:
+        # Use user's query embedding for relevance, filter by theme for coverage
+        query_vector = (
+            user_query_vector if user_query_vector else embedding_ctx.embed(theme)
+        )
+        try:
+            results = idx.query(
+                vector=query_vector,
+                filter={"Theme": {"$eq": theme}, **entity_filter},
+                top_k=top_per_theme,
+                include_metadata=True,
+                namespace=PINECONE_NAMESPACE,
+            )
+            matches = getattr(results, "matches", []) or []
+            theme_stories = [
+                story
+                for story in (_synthesis_match_story(m, corpus, theme) for m in matches)
+                if story
+            ]
             if DEBUG:
                 print(f"DEBUG synthesis search: {theme} → {len(theme_stories)} stories")
-
             return theme_stories
         except Exception as e:
             if DEBUG:
@@ -560,8 +605,11 @@ def get_synthesis_stories(
     # Search all themes in parallel
     with ThreadPoolExecutor(max_workers=4) as executor:
         theme_results = list(executor.map(search_theme, SYNTHESIS_THEMES))
+    return _dedupe_theme_results(theme_results)
 
-    # Flatten and deduplicate
+
+def _dedupe_theme_results(theme_results) -> list[dict]:
+    """Flatten per-theme story lists, keeping the first copy of each story."""
     seen_ids = set()
     pool = []
     for theme_stories in theme_results:
@@ -570,13 +618,11 @@ def get_synthesis_stories(
             if story_id not in seen_ids:
                 seen_ids.add(story_id)
                 pool.append(story)
+    return pool
 
-    if DEBUG:
-        print(
-            f"DEBUG synthesis pool: {len(pool)} unique stories across {len(SYNTHESIS_THEMES)} themes"
-        )
 
-    return pool
+OFFDOMAIN_CSV_HEADER = ["ts_utc", "query", "reason"]
+telemetry_spool.register_sink("offdomain", CsvLogWriter(OFFDOMAIN_CSV_HEADER))
 
 
 def log_offdomain(
@@ -584,60 +630,25 @@ def log_offdomain(
 ) -> None:
     """Log off-domain queries for telemetry and analysis.
 
-    Appends rejected queries to a CSV file with timestamp, query text, and
-    rejection reason. Creates the file with headers if it doesn't exist.
+    Spools the rejected query with a timestamp and rejection reason
+    (services/telemetry_spool.py); the spool's replayer appends it to the
+    CSV file, creating it with headers if it doesn't exist. Never blocks
+    on file I/O in the request path.
 
     Args:
         query: User query that was detected as off-domain.
         reason: Reason for rejection (e.g., "rule:profanity", "low_overlap", "llm_guard").
         path: Path to CSV log file. Defaults to "data/offdomain_queries.csv".
-
-    Raises:
-        OSError: If directory creation or file writing fails.
-    """
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    row = [datetime.now(UTC).isoformat(timespec="seconds"), query, reason]
-    header = ["ts_utc", "query", "reason"]
-    write_header = not os.path.exists(path)
-    with open(path, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        if write_header:
-            w.writerow(header)
-        w.writerow(row)
-
-
-def build_known_vocab(stories: list[dict[str, Any]]) -> set[str]:
-    """Build vocabulary set from story corpus for overlap detection.
-
-    Extracts tokens from key story fields (Title, Client, Role, Industry,
-    Sub-category) and tags to create a domain vocabulary. Used for
-    token_overlap_ratio calculations to detect off-topic queries.
-
-    Args:
-        stories: List of story dictionaries from the portfolio.
-
-    Returns:
-        Set of lowercase tokens with length >= 3 characters.
-
-    Example:
-        >>> stories = [{"Title": "Platform Modernization", "Client": "JPMC"}]
-        >>> vocab = build_known_vocab(stories)
-        >>> "platform" in vocab
-        True
     """
-    vocab = set()
-    for s in stories:
-        for field in ["Title", "Client", "Role", "Industry", "Sub-category"]:
-            txt = (s.get(field) or "").lower()
-            vocab.update(re.split(r"[^\w]+", txt))
-        # Add tags if available
-        tags = s.get("public_tags", [])
-        if isinstance(tags, str):
-            tags = tags.split(",")
-        for t in tags:
-            vocab.update(re.split(r"[^\w]+", str(t).strip().lower()))
-    # Prune tiny tokens
-    return {w for w in vocab if len(w) >= 3}
+    telemetry_spool.spool(
+        "offdomain",
+        {
+            "ts_utc": datetime.now(UTC).isoformat(timespec="seconds"),
+            "query": query,
+            "reason": reason,
+        },
+        target=path,
+    )
 
 
 def get_diverse_stories(
@@ -708,16 +719,7 @@ def is_query_on_topic_llm(query: str) -> bool:
         False
     """
     try:
-        from dotenv import load_dotenv
-        from openai import OpenAI
-
-        load_dotenv()
-
-        client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            project=os.getenv("OPENAI_PROJECT_ID"),
-            organization=os.getenv("OPENAI_ORG_ID"),
-        )
+        client = get_openai_client()
 
         response = client.chat.completions.create(
             model="gpt-4o-mini",
@@ -793,6 +795,246 @@ def _score_story_for_prompt(story: dict[str, Any], prompt: str) -> float:
     return score
 
 
+def _build_agy_messages(
+    question: str,
+    ranked_stories: list[dict[str, Any]],
+    is_synthesis: bool = False,
+) -> tuple[list[dict[str, str]], float]:
+    """Build the chat messages and temperature for an Agy response.
+
+    Shared by the blocking (_generate_agy_response) and streaming
+    (_stream_agy_response) paths so both send the identical prompt.
+
+    Returns:
+        (messages, temperature) ready for chat.completions.create.
+    """
+    import random
+
+    # Build theme-aware context using story_intelligence
+    story_contexts = []
+    themes_in_response = set()
+
+    # For synthesis mode, use more stories (up to 7)
+    # For standard mode, use top 5 to ensure Professional Narrative stories are included
+    story_limit = 7 if is_synthesis else 5
+
+    if DEBUG:
+        print(
+            f"DEBUG LLM stories ({story_limit} max, {len(ranked_stories[:story_limit])} actual):"
+        )
+        for i, s in enumerate(ranked_stories[:story_limit]):
+            print(f"DEBUG   [{i + 1}] {s.get('Client')}: {s.get('Title', '')[:40]}")
+
+    for i, story in enumerate(ranked_stories[:story_limit]):
+        context = build_story_context_for_rag(story)
+        if i == 0:
+            story_contexts.append(f"<primary_story>\n{context}\n</primary_story>")
+        else:
+            story_contexts.append(
+                f"<supporting_story index=\"{i + 1}\">\n{context}\n</supporting_story>"
+            )
+        themes_in_response.add(infer_story_theme(story))
+
+    story_context = "\n\n".join(story_contexts)
+
+    # =====================================================================
+    # PYTHON-DRIVEN RANDOMIZATION FOR VARIETY
+    # =====================================================================
+
+    if is_synthesis:
+        # Synthesis mode openings - for big-picture questions
+        openings = [
+            "🐾 Great question — let me pull together the big picture.",
+            "🐾 Looking across Matt's portfolio, I see clear patterns.",
+            "🐾 Here's what connects the dots across Matt's work.",
+            "🐾 Stepping back to see the themes...",
+            "🐾 Let me show you what ties Matt's work together.",
+        ]
+        chosen_opening = random.choice(openings)
+
+        # Synthesis mode closings
+        closings = [
+            "Want me to dive deeper into any of these themes?",
+            "I can show specific examples from any of these areas.",
+            "Which pattern would you like to explore further?",
+            "Happy to unpack any of these with concrete stories.",
+        ]
+        chosen_closing = random.choice(closings)
+
+        # No focus angle for synthesis — we want breadth
+        chosen_focus = "Cover patterns across multiple stories rather than depth on any single one."
+    else:
+        # Standard mode openings - for specific questions
+        openings = [
+            "🐾 Found it!",
+            "🐾 Tracking this down...",
+            "🐾 On it!",
+            "🐾 Perfect — here's what I found.",
+            "Got it! 🐾",
+            "🐾 This is a strong one.",
+            "🐾 Here's a great example.",
+            "🐾 I know just the story.",
+        ]
+        chosen_opening = random.choice(openings)
+
+        # Standard mode closings
+        closings = [
+            "Want me to dig deeper into the technical approach?",
+            "Happy to explore similar work in other industries.",
+            "What else can I track down for you?",
+            "I can show you related patterns if that's helpful.",
+            "Let me know if you'd like the deep dive on this one.",
+            "Want to see how Matt applied this elsewhere?",
+            "Shall I find more examples like this?",
+            "There's more to this story if you're curious.",
+        ]
+        chosen_closing = random.choice(closings)
+
+        # Random focus angle - adds variety to which aspect gets included
+        focus_angles = [
+            "Include specific details about HUMAN IMPACT — who was struggling and how their work life improved.",
+            "Include specific details about METHODOLOGY — what made Matt's approach different from the obvious solution.",
+            "Include specific details about SCALE — the scope, complexity, and reach of the transformation.",
+            "Include specific details about LEADERSHIP — how Matt brought people together and drove alignment.",
+            "Include specific details about OUTCOMES — hard numbers and measurable business results.",
+            "Include specific details about INNOVATION — what was new, creative, or unconventional about this.",
+        ]
+        chosen_focus = random.choice(focus_angles)
+
+    # =================================================================
+    # VERBATIM PHRASE INJECTION (uses prompts module)
+    # =================================================================
+    verbatim_requirement = ""
+    if ranked_stories:
+        primary_story = ranked_stories[0]
+        if primary_story.get("Theme") == "Professional Narrative":
+            summary = primary_story.get("5PSummary", "") or primary_story.get(
+                "5p_summary", ""
+            )
+            verbatim_requirement = get_verbatim_requirement(summary)
+
+    # =================================================================
+    # DYNAMIC CLIENT LIST
+    # =================================================================
+    retrieved_clients = set(
+        s.get("Client")
+        for s in ranked_stories
+        if s.get("Client") and not is_generic_client(s.get("Client"))
+    )
+    client_list = (
+        ", ".join(sorted(retrieved_clients))
+        if retrieved_clients
+        else "the clients shown above"
+    )
+
+    # =================================================================
+    # BUILD PROMPTS USING CLEAN ARCHITECTURE (prompts.py)
+    # =================================================================
+    system_prompt = build_system_prompt(
+        is_synthesis=is_synthesis,
+        matt_dna=MATT_DNA,
+        client_list=client_list,
+    )
+
+    user_message = build_user_message(
+        question=question,
+        story_context=story_context,
+        opening=chosen_opening,
+        closing=chosen_closing,
+        is_synthesis=is_synthesis,
+        verbatim_requirement=verbatim_requirement,
+        focus_angle=chosen_focus if not is_synthesis else "",
+    )
+
+    # Call OpenAI API
+    # Use lower temperature for synthesis to reduce hallucination
+    _temp = 0.2 if is_synthesis else 0.4
+    if DEBUG:
+        print(
+            f"DEBUG LLM call: model=gpt-4o, temperature={_temp}, is_synthesis={is_synthesis}"
+        )
+        print(f"DEBUG system_prompt[:200]: {system_prompt[:200]}")
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message},
+    ]
+    return messages, _temp
+
+
+def _postprocess_agy_response(
+    response_text: str, ranked_stories: list[dict[str, Any]]
+) -> str:
+    """Bold clients/metrics, strip meta-commentary, tidy spacing, escape $.
+
+    Runs on the complete LLM output. The streaming path applies it once the
+    last token arrives; partial snapshots only get the $ escape.
+    """
+    # =====================================================================
+    # POST-PROCESSING: Auto-bold numbers and client names
+    # GPT frequently ignores bolding instructions, so we fix it here
+    # =====================================================================
+    import re
+
+    # Bold ALL known client names (derived from story data)
+    known_clients = get_known_clients(ranked_stories)
+    for client in known_clients:
+        if client and len(client) > 2:  # Skip very short strings
+            # Match client name not already wrapped in **
+            pattern = rf'(?<!\*\*)({re.escape(client)})(?!\*\*)'
+            response_text = re.sub(pattern, r'**\1**', response_text)
+
+    # Bold numbers/metrics that aren't already bolded
+    # Matches: 30%, $50M, 4x, 150+, 12 countries, 5 months, etc.
+    number_patterns = [
+        r'(?<!\*\*)(\$[\d,.]+[MBK]?)(?!\*\*)',  # $50M, $300K, $1.2B
+        r'(?<!\*\*)(\d+%\+?)(?!\*\*)',  # 30%, 40%+
+        r'(?<!\*\*)(\d+[xX])(?=\s)(?!\*\*)',  # 4x, 10X (lookahead for space, don't capture it)
+        r'(?<!\*\*)(\d+\+?\s*(?:engineers?|teams?|members?|practitioners?|countries|regions?|clients?|projects?|months?|weeks?|days?|hours?))(?!\*\*)',  # 150+ engineers, 12 countries
+        r'(?<!\*\*)(\d+[.,]?\d*\s*(?:reduction|increase|improvement|faster|slower))(?!\*\*)',  # 30% reduction
+    ]
+
+    for pattern in number_patterns:
+        response_text = re.sub(
+            pattern, r'**\1**', response_text, flags=re.IGNORECASE
+        )
+
+    # Clean up any double-bolding that might have occurred
+    response_text = re.sub(r'\*\*\*\*+', '**', response_text)
+
+    # Fix LLM's malformed number bolding: **1**0%** → **10%**
+    # This handles cases where LLM splits numbers incorrectly
+    response_text = re.sub(
+        r'\*\*(\d)\*\*(\d+%?\+?)\*\*', r'**\1\2**', response_text
+    )
+
+    # =====================================================================
+    # POST-PROCESSING: Strip meta-commentary patterns
+    # LLM sometimes ignores "don't evaluate Matt" instruction
+    # These patterns talk ABOUT the story instead of answering
+    # Patterns imported from config/constants.py
+    # =====================================================================
+    for pattern in META_COMMENTARY_REGEX_PATTERNS:
+        # Find and remove sentences containing meta-commentary
+        # Match sentence containing the pattern (from capital letter or newline to period/newline)
+        sentence_pattern = rf'[^.]*{pattern}[^.]*\.'
+        response_text = re.sub(
+            sentence_pattern, '', response_text, flags=re.IGNORECASE
+        )
+
+    # Clean up formatting
+    response_text = re.sub(r'  +', ' ', response_text)  # Double spaces
+    response_text = re.sub(r'\n\n\n+', '\n\n', response_text)  # Triple newlines
+    response_text = response_text.strip()
+
+    # Escape dollar signs to prevent Streamlit's markdown renderer
+    # from interpreting $...$ as LaTeX math notation.
+    # Must run AFTER all other post-processing (bolding, meta-strip, etc.)
+    response_text = response_text.replace("$", "\\$")
+
+    return response_text
+
+
+@traced("llm")
 def _generate_agy_response(
     question: str,
     ranked_stories: list[dict[str, Any]],
@@ -832,251 +1074,157 @@ def _generate_agy_response(
         >>> "🐾" in response
         True
     """
-    import random
-
     try:
-        from dotenv import load_dotenv
-        from openai import OpenAI
-
-        load_dotenv()
-
-        client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            project=os.getenv("OPENAI_PROJECT_ID"),
-            organization=os.getenv("OPENAI_ORG_ID"),
+        client = get_openai_client()
+        messages, temperature = _build_agy_messages(
+            question, ranked_stories, is_synthesis=is_synthesis
+        )
+        response = client.chat.completions.create(
+            model=AGY_RESPONSE_MODEL,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=AGY_RESPONSE_MAX_TOKENS,
+        )
+        return _postprocess_agy_response(
+            response.choices[0].message.content, ranked_stories
         )
 
-        # Build theme-aware context using story_intelligence
-        story_contexts = []
-        themes_in_response = set()
-
-        # For synthesis mode, use more stories (up to 7)
-        # For standard mode, use top 5 to ensure Professional Narrative stories are included
-        story_limit = 7 if is_synthesis else 5
-
+    except Exception as e:
         if DEBUG:
-            print(
-                f"DEBUG LLM stories ({story_limit} max, {len(ranked_stories[:story_limit])} actual):"
-            )
-            for i, s in enumerate(ranked_stories[:story_limit]):
-                print(f"DEBUG   [{i + 1}] {s.get('Client')}: {s.get('Title', '')[:40]}")
+            print(f"DEBUG: OpenAI call failed: {e}")
 
-        for i, story in enumerate(ranked_stories[:story_limit]):
-            context = build_story_context_for_rag(story)
-            if i == 0:
-                story_contexts.append(f"<primary_story>\n{context}\n</primary_story>")
-            else:
-                story_contexts.append(
-                    f"<supporting_story index=\"{i + 1}\">\n{context}\n</supporting_story>"
-                )
-            themes_in_response.add(infer_story_theme(story))
+        # Rate limit - raise so caller can suppress sources
+        if _is_rate_limit_error(e):
+            raise RateLimitError("OpenAI rate limit exceeded") from e
 
-        story_context = "\n\n".join(story_contexts)
+        # Other errors - simple fallback
+        return f"🐾 Let me show you what I found...\n\n{answer_context}"
 
-        # =====================================================================
-        # PYTHON-DRIVEN RANDOMIZATION FOR VARIETY
-        # =====================================================================
 
-        if is_synthesis:
-            # Synthesis mode openings - for big-picture questions
-            openings = [
-                "🐾 Great question — let me pull together the big picture.",
-                "🐾 Looking across Matt's portfolio, I see clear patterns.",
-                "🐾 Here's what connects the dots across Matt's work.",
-                "🐾 Stepping back to see the themes...",
-                "🐾 Let me show you what ties Matt's work together.",
-            ]
-            chosen_opening = random.choice(openings)
-
-            # Synthesis mode closings
-            closings = [
-                "Want me to dive deeper into any of these themes?",
-                "I can show specific examples from any of these areas.",
-                "Which pattern would you like to explore further?",
-                "Happy to unpack any of these with concrete stories.",
-            ]
-            chosen_closing = random.choice(closings)
+class AgyAnswerStream:
+    """Progressive Agy answer returned by rag_answer(..., stream=True).
 
-            # No focus angle for synthesis — we want breadth
-            chosen_focus = "Cover patterns across multiple stories rather than depth on any single one."
-        else:
-            # Standard mode openings - for specific questions
-            openings = [
-                "🐾 Found it!",
-                "🐾 Tracking this down...",
-                "🐾 On it!",
-                "🐾 Perfect — here's what I found.",
-                "Got it! 🐾",
-                "🐾 This is a strong one.",
-                "🐾 Here's a great example.",
-                "🐾 I know just the story.",
-            ]
-            chosen_opening = random.choice(openings)
-
-            # Standard mode closings
-            closings = [
-                "Want me to dig deeper into the technical approach?",
-                "Happy to explore similar work in other industries.",
-                "What else can I track down for you?",
-                "I can show you related patterns if that's helpful.",
-                "Let me know if you'd like the deep dive on this one.",
-                "Want to see how Matt applied this elsewhere?",
-                "Shall I find more examples like this?",
-                "There's more to this story if you're curious.",
-            ]
-            chosen_closing = random.choice(closings)
-
-            # Random focus angle - adds variety to which aspect gets included
-            focus_angles = [
-                "Include specific details about HUMAN IMPACT — who was struggling and how their work life improved.",
-                "Include specific details about METHODOLOGY — what made Matt's approach different from the obvious solution.",
-                "Include specific details about SCALE — the scope, complexity, and reach of the transformation.",
-                "Include specific details about LEADERSHIP — how Matt brought people together and drove alignment.",
-                "Include specific details about OUTCOMES — hard numbers and measurable business results.",
-                "Include specific details about INNOVATION — what was new, creative, or unconventional about this.",
-            ]
-            chosen_focus = random.choice(focus_angles)
+    Iterating yields display snapshots: the accumulated text so far with
+    $ escaped (so Streamlit doesn't render LaTeX mid-stream). Once the last
+    token arrives, the full _postprocess_agy_response() pass (client/metric
+    bolding, meta-commentary stripping) runs on the complete text and the
+    result is available as .text.
 
-        # =================================================================
-        # VERBATIM PHRASE INJECTION (uses prompts module)
-        # =================================================================
-        verbatim_requirement = ""
-        if ranked_stories:
-            primary_story = ranked_stories[0]
-            if primary_story.get("Theme") == "Professional Narrative":
-                summary = primary_story.get("5PSummary", "") or primary_story.get(
-                    "5p_summary", ""
-                )
-                verbatim_requirement = get_verbatim_requirement(summary)
+    Failure handling mirrors _generate_agy_response(): a rate limit sets
+    .rate_limited (finalize() then suppresses sources), any other error falls
+    back to the pre-formatted answer_context.
 
-        # =================================================================
-        # DYNAMIC CLIENT LIST
-        # =================================================================
-        retrieved_clients = set(
-            s.get("Client")
-            for s in ranked_stories
-            if s.get("Client") and not is_generic_client(s.get("Client"))
-        )
-        client_list = (
-            ", ".join(sorted(retrieved_clients))
-            if retrieved_clients
-            else "the clients shown above"
-        )
+    The turn is logged (log_kwargs) once the answer is complete, or when the
+    stream is closed early (rerun, stop, render error) with the LLM stage
+    left blank; the partial answer then becomes .text.
 
-        # =================================================================
-        # BUILD PROMPTS USING CLEAN ARCHITECTURE (prompts.py)
-        # =================================================================
-        system_prompt = build_system_prompt(
-            is_synthesis=is_synthesis,
-            matt_dna=MATT_DNA,
-            client_list=client_list,
-        )
+    Example:
+        >>> resp = rag_answer(question, {}, stories, stream=True)
+        >>> stream = resp.get("answer_stream")
+        >>> for snapshot in stream:
+        ...     placeholder.markdown(snapshot)
+        >>> resp = stream.finalize(resp)
+    """
 
-        user_message = build_user_message(
-            question=question,
-            story_context=story_context,
-            opening=chosen_opening,
-            closing=chosen_closing,
-            is_synthesis=is_synthesis,
-            verbatim_requirement=verbatim_requirement,
-            focus_angle=chosen_focus if not is_synthesis else "",
+    def __init__(
+        self,
+        question: str,
+        ranked_stories: list[dict[str, Any]],
+        answer_context: str,
+        is_synthesis: bool = False,
+    ):
+        self.question = question
+        self.ranked_stories = ranked_stories
+        self.answer_context = answer_context
+        self.is_synthesis = is_synthesis
+        self.rate_limited = False
+        self._raw: list[str] = []
+        self._text: str | None = None
+        # The turn's trace: generation runs after rag_answer() returns
+        self.trace = current_trace()
+        # log_query() kwargs, sent once by _log_turn()
+        self.log_kwargs: dict[str, Any] | None = None
+
+    def _deltas(self):
+        client = get_openai_client()
+        messages, temperature = _build_agy_messages(
+            self.question, self.ranked_stories, is_synthesis=self.is_synthesis
         )
-
-        # Call OpenAI API
-        # Use lower temperature for synthesis to reduce hallucination
-        _temp = 0.2 if is_synthesis else 0.4
-        if DEBUG:
-            print(
-                f"DEBUG LLM call: model=gpt-4o, temperature={_temp}, is_synthesis={is_synthesis}"
-            )
-            print(f"DEBUG system_prompt[:200]: {system_prompt[:200]}")
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ],
-            temperature=_temp,
-            max_tokens=700,
-        )
-
-        response_text = response.choices[0].message.content
-
-        # =====================================================================
-        # POST-PROCESSING: Auto-bold numbers and client names
-        # GPT frequently ignores bolding instructions, so we fix it here
-        # =====================================================================
-        import re
-
-        # Bold ALL known client names (derived from story data)
-        known_clients = get_known_clients(ranked_stories)
-        for client in known_clients:
-            if client and len(client) > 2:  # Skip very short strings
-                # Match client name not already wrapped in **
-                pattern = rf'(?<!\*\*)({re.escape(client)})(?!\*\*)'
-                response_text = re.sub(pattern, r'**\1**', response_text)
-
-        # Bold numbers/metrics that aren't already bolded
-        # Matches: 30%, $50M, 4x, 150+, 12 countries, 5 months, etc.
-        number_patterns = [
-            r'(?<!\*\*)(\$[\d,.]+[MBK]?)(?!\*\*)',  # $50M, $300K, $1.2B
-            r'(?<!\*\*)(\d+%\+?)(?!\*\*)',  # 30%, 40%+
-            r'(?<!\*\*)(\d+[xX])(?=\s)(?!\*\*)',  # 4x, 10X (lookahead for space, don't capture it)
-            r'(?<!\*\*)(\d+\+?\s*(?:engineers?|teams?|members?|practitioners?|countries|regions?|clients?|projects?|months?|weeks?|days?|hours?))(?!\*\*)',  # 150+ engineers, 12 countries
-            r'(?<!\*\*)(\d+[.,]?\d*\s*(?:reduction|increase|improvement|faster|slower))(?!\*\*)',  # 30% reduction
-        ]
-
-        for pattern in number_patterns:
-            response_text = re.sub(
-                pattern, r'**\1**', response_text, flags=re.IGNORECASE
-            )
-
-        # Clean up any double-bolding that might have occurred
-        response_text = re.sub(r'\*\*\*\*+', '**', response_text)
-
-        # Fix LLM's malformed number bolding: **1**0%** → **10%**
-        # This handles cases where LLM splits numbers incorrectly
-        response_text = re.sub(
-            r'\*\*(\d)\*\*(\d+%?\+?)\*\*', r'**\1\2**', response_text
+        chunks = client.chat.completions.create(
+            model=AGY_RESPONSE_MODEL,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=AGY_RESPONSE_MAX_TOKENS,
+            stream=True,
         )
-
-        # =====================================================================
-        # POST-PROCESSING: Strip meta-commentary patterns
-        # LLM sometimes ignores "don't evaluate Matt" instruction
-        # These patterns talk ABOUT the story instead of answering
-        # Patterns imported from config/constants.py
-        # =====================================================================
-        for pattern in META_COMMENTARY_REGEX_PATTERNS:
-            # Find and remove sentences containing meta-commentary
-            # Match sentence containing the pattern (from capital letter or newline to period/newline)
-            sentence_pattern = rf'[^.]*{pattern}[^.]*\.'
-            response_text = re.sub(
-                sentence_pattern, '', response_text, flags=re.IGNORECASE
+        for chunk in chunks:
+            choices = getattr(chunk, "choices", None) or []
+            delta = getattr(choices[0].delta, "content", None) if choices else None
+            if delta:
+                yield delta
+
+    def _log_turn(self) -> None:
+        if self.log_kwargs is not None:
+            log_kwargs, self.log_kwargs = self.log_kwargs, None
+            log_query(**log_kwargs, trace=self.trace)
+
+    def __iter__(self):
+        if self._text is not None:
+            yield self._text
+            return
+        try:
+            with self.trace.span("llm") if self.trace else nullcontext():
+                for delta in self._deltas():
+                    self._raw.append(delta)
+                    try:
+                        yield "".join(self._raw).replace("$", "\\$")
+                    except GeneratorExit:
+                        # Closed mid-answer: keep the partial answer (a later
+                        # .text must not start a second stream) and log before
+                        # the llm span is recorded
+                        self._text = _postprocess_agy_response(
+                            "".join(self._raw), self.ranked_stories
+                        )
+                        self._log_turn()
+                        raise
+            self._text = _postprocess_agy_response(
+                "".join(self._raw), self.ranked_stories
             )
-
-        # Clean up formatting
-        response_text = re.sub(r'  +', ' ', response_text)  # Double spaces
-        response_text = re.sub(r'\n\n\n+', '\n\n', response_text)  # Triple newlines
-        response_text = response_text.strip()
-
-        # Escape dollar signs to prevent Streamlit's markdown renderer
-        # from interpreting $...$ as LaTeX math notation.
-        # Must run AFTER all other post-processing (bolding, meta-strip, etc.)
-        response_text = response_text.replace("$", "\\$")
-
-        return response_text
-
-    except Exception as e:
-        if DEBUG:
-            print(f"DEBUG: OpenAI call failed: {e}")
-
-        # Rate limit - raise so caller can suppress sources
-        err_lower = str(e).lower()
-        if "429" in str(e) or "rate_limit" in err_lower or "rate limit" in err_lower:
-            raise RateLimitError("OpenAI rate limit exceeded") from e
-
-        # Other errors - simple fallback
-        return f"🐾 Let me show you what I found...\n\n{answer_context}"
+        except Exception as e:
+            if DEBUG:
+                print(f"DEBUG: OpenAI stream failed: {e}")
+            if _is_rate_limit_error(e):
+                self.rate_limited = True
+                self._text = RATE_LIMIT_MESSAGE
+            else:
+                self._text = (
+                    f"🐾 Let me show you what I found...\n\n{self.answer_context}"
+                )
+        self._log_turn()
+        yield self._text
+
+    @property
+    def text(self) -> str:
+        """Final post-processed answer (drains the stream if needed)."""
+        if self._text is None:
+            for _ in self:
+                pass
+        return self._text
+
+    def finalize(self, resp: dict[str, Any]) -> dict[str, Any]:
+        """Return resp with the final answer filled in (answer_md + narrative mode)."""
+        text = self.text
+        if self.rate_limited:
+            return {
+                "answer_md": text,
+                "sources": [],
+                "modes": {},
+                "default_mode": "narrative",
+            }
+        out = {k: v for k, v in resp.items() if k != "answer_stream"}
+        out["answer_md"] = text
+        out["modes"] = {**(resp.get("modes") or {}), "narrative": text}
+        return out
 
 
 # def _generate_agy_response(
@@ -1281,6 +1429,7 @@ def _generate_agy_response(
 #         return f"🐾 Let me show you what I found...\n\n{answer_context}"
 
 
+@traced("diversification")
 def diversify_results(
     stories: list[dict[str, Any]], max_per_client: int = 1
 ) -> list[dict[str, Any]]:
@@ -1362,6 +1511,7 @@ def send_to_backend(
     filters: dict[str, Any],
     ctx: dict[str, Any] | None,
     stories: list[dict[str, Any]],
+    stream: bool = False,
 ) -> dict[str, Any]:
     """Legacy wrapper for rag_answer.
 
@@ -1372,15 +1522,22 @@ def send_to_backend(
         filters: Search filters dictionary (passed to semantic_search).
         ctx: Context dictionary (unused, kept for API compatibility).
         stories: Full list of portfolio stories.
+        stream: Forwarded to rag_answer (progressive answer rendering).
 
     Returns:
-        RAG answer dictionary with keys: answer_md, sources, modes, default_mode.
+        RAG answer dictionary with keys: answer_md, sources, modes, default_mode
+        (plus answer_stream when streaming).
     """
+    if stream:
+        return rag_answer(prompt, filters, stories, stream=True)
     return rag_answer(prompt, filters, stories)
 
 
 def rag_answer(
-    question: str, filters: dict[str, Any], stories: list[dict[str, Any]]
+    question: str,
+    filters: dict[str, Any],
+    stories: list[dict[str, Any]],
+    stream: bool = False,
 ) -> dict[str, Any]:
     """Main RAG (Retrieval-Augmented Generation) orchestration function.
 
@@ -1397,6 +1554,10 @@ def rag_answer(
         filters: Search filters dictionary passed to semantic_search.
             Typically includes "q" (query string) and optional facet filters.
         stories: Full list of portfolio story dictionaries.
+        stream: If True, skip the blocking LLM call. The result carries an
+            "answer_stream" (AgyAnswerStream) and empty answer_md/narrative;
+            the caller renders the stream and calls stream.finalize(resp).
+            Sources, key_points and deep_dive are available immediately.
 
     Returns:
         Dictionary with keys:
@@ -1405,12 +1566,14 @@ def rag_answer(
             - modes (dict[str, str]): All 3 presentation modes (narrative,
               key_points, deep_dive)
             - default_mode (str): Which mode is shown in answer_md
+            - answer_stream (AgyAnswerStream): Only when stream=True and an
+              LLM answer is being generated
 
         Returns empty result if query is rejected:
             {"answer_md": "", "sources": [], "modes": {}, "default_mode": "narrative"}
 
     Side Effects:
-        - Updates st.session_state["_known_vocab"] (cached vocabulary)
+        - Updates st.session_state["__ask_trace__"] (per-stage timings)
         - Updates st.session_state["__last_ranked_sources__"] (story IDs)
         - Updates st.session_state["__ask_dbg_*"] fields for debug panel
         - Logs rejected queries to data/offdomain_queries.csv
@@ -1427,6 +1590,18 @@ def rag_answer(
         >>> len(result['sources'])
         3
     """
+    with start_trace("ask_agy") as trace:
+        st.session_state["__ask_trace__"] = trace
+        return _rag_answer(question, filters, stories, stream=stream)
+
+
+def _rag_answer(
+    question: str,
+    filters: dict[str, Any],
+    stories: list[dict[str, Any]],
+    stream: bool = False,
+) -> dict[str, Any]:
+    """rag_answer() body, run inside the turn's trace."""
     # Check if from suggestion (skip aggressive off-domain gating)
     force_answer = bool(st.session_state.pop("__ask_force_answer__", False))
     from_suggestion = (
@@ -1458,10 +1633,7 @@ def rag_answer(
 
     if simple_mode in _MODE_ALIASES and st.session_state.get("__last_ranked_sources__"):
         ids = st.session_state["__last_ranked_sources__"]
-        ranked = [
-            next((s for s in stories if str(s.get("id")) == str(i)), None) for i in ids
-        ]
-        ranked = [s for s in ranked if s][:3]
+        ranked = get_corpus_index(stories).get_many(ids)[:3]
         if not ranked:
             search_result = semantic_search(
                 question or "", filters, stories=stories, top_k=SEARCH_TOP_K
@@ -1487,15 +1659,17 @@ def rag_answer(
             "default_mode": sel,
         }
 
+    # One embedding per distinct query string for this turn: the router,
+    # retrieval and synthesis all read from (and fill) the same context.
+    embedding_ctx = EmbeddingContext()
+
     try:
         # Nonsense detection
-        _KNOWN_VOCAB = st.session_state.get("_known_vocab", set())
-        if not _KNOWN_VOCAB:
-            _KNOWN_VOCAB = build_known_vocab(stories)
-            st.session_state["_known_vocab"] = _KNOWN_VOCAB
+        _KNOWN_VOCAB = get_corpus_snapshot(stories).known_vocab
 
         # Step 1: Rules-based (fast, free)
-        cat = is_nonsense(question or "")
+        with span("nonsense_rules"):
+            cat = is_nonsense(question or "")
         if DEBUG:
             print(f"DEBUG: is_nonsense returned cat={cat}")
 
@@ -1520,13 +1694,33 @@ def rag_answer(
         intent_family = ""
 
         if not from_suggestion:
-            semantic_valid, semantic_score, matched_intent, intent_family = (
-                is_portfolio_query_semantic(question or "")
-            )
+            with span("semantic_router"):
+                semantic_valid, semantic_score, matched_intent, intent_family = (
+                    is_portfolio_query_semantic(
+                        question or "", embedding_ctx=embedding_ctx
+                    )
+                )
             if DEBUG:
                 print(
                     f"DEBUG: Semantic router: valid={semantic_valid}, score={semantic_score:.3f}, family={intent_family}"
                 )
+                try:
+                    # Vector is already in embedding_ctx: no extra API call
+                    _intent_dbg = score_query_intents(
+                        question or "", top_k=3, embedding_ctx=embedding_ctx
+                    )
+                    st.session_state["__ask_dbg_intents"] = _intent_dbg
+                    _fam_top = sorted(
+                        _intent_dbg["family_scores"].items(),
+                        key=lambda kv: kv[1],
+                        reverse=True,
+                    )[:3]
+                    print(
+                        "DEBUG: Router families: "
+                        + ", ".join(f"{f}={v:.3f}" for f, v in _fam_top)
+                    )
+                except Exception as e:
+                    print(f"DEBUG: Router score breakdown unavailable: {e}")
 
         # Step 2b: Entity Detection - detect entities to scope search
         # Detected entities are used for:
@@ -1534,12 +1728,14 @@ def rag_answer(
         # 2. Pinning entity-matched stories to #1 in ranking (always)
         # NOTE: Entity gate (bouncer) REMOVED Jan 2026 - let Pinecone confidence
         # be the sole decider. Nonsense filters catch off-topic queries.
-        entity_match = detect_entity(question or "", stories)
+        with span("entity_detection"):
+            entity_match = detect_entity(question or "", stories)
         if DEBUG and entity_match:
             print(f"DEBUG: Entity detected - {entity_match[0]}:{entity_match[1]}")
 
         # Token overlap check
-        overlap = token_overlap_ratio(question or "", _KNOWN_VOCAB)
+        with span("token_overlap"):
+            overlap = token_overlap_ratio(question or "", _KNOWN_VOCAB)
         if DEBUG:
             dbg(f"ask: overlap={overlap:.2f}")
 
@@ -1635,6 +1831,7 @@ Ask me about his **transformation work**, **platform engineering**, or **how he
             search_filters,
             stories=stories,
             top_k=SEARCH_TOP_K,
+            embedding_ctx=embedding_ctx,
         )
         pool = search_result["results"]
         confidence = search_result["confidence"]
@@ -1685,9 +1882,12 @@ Ask me about his **transformation work**, **platform engineering**, or **how he
                     content_kw_uniform = True
                 else:
                     stripped_q = " ".join(sorted(content_toks))
+                    # Uniformity is defined on the set-overlap score
                     content_kw_vals = [
-                        round(_keyword_score_for_story(s, stripped_q), 3)
-                        for s in entity_stories
+                        round(kw, 3)
+                        for kw in get_keyword_index(stories).scores_for(
+                            entity_stories, stripped_q, method="overlap"
+                        )
                     ]
                     content_kw_uniform = len(set(content_kw_vals)) <= 1
                 if content_kw_uniform:
@@ -1879,7 +2079,7 @@ Ask me about his **transformation work**, **platform engineering**, or **how he
             # If query mentions a client, scope to that client's stories
             # NOTE: top_per_theme=3 (was 2) to widen the net for client diversity (Q17 fix)
             synthesis_pool = get_synthesis_stories(
-                stories, top_per_theme=3, query=question
+                stories, top_per_theme=3, query=question, embedding_ctx=embedding_ctx
             )
 
             # Q17 Fix: Prioritize named clients over generic ones in synthesis ranking
@@ -2065,13 +2265,21 @@ Ask me about his **transformation work**, **platform engineering**, or **how he
     st.session_state["__last_ranked_sources__"] = [s["id"] for s in ranked]
 
     primary = ranked[0]
+    answer_stream = None
 
     try:
         # Generate Agy-voiced response
         narrative = _format_narrative(primary)
-        agy_response = _generate_agy_response(
-            question, ranked, narrative, is_synthesis=is_synthesis
-        )
+        if stream:
+            # Generation happens as the caller iterates; see AgyAnswerStream
+            answer_stream = AgyAnswerStream(
+                question, ranked, narrative, is_synthesis=is_synthesis
+            )
+            agy_response = ""
+        else:
+            agy_response = _generate_agy_response(
+                question, ranked, narrative, is_synthesis=is_synthesis
+            )
 
         # Build modes
         key_points = "\n\n".join([_format_key_points(s) for s in ranked])
@@ -2094,7 +2302,7 @@ Ask me about his **transformation work**, **platform engineering**, or **how he
         if DEBUG:
             print("DEBUG rag_answer: rate limit hit, suppressing sources")
         return {
-            "answer_md": "🐾 I need a quick breather — try again in about 15 seconds!",
+            "answer_md": RATE_LIMIT_MESSAGE,
             "sources": [],
             "modes": {},
             "default_mode": "narrative",
@@ -2113,19 +2321,27 @@ Ask me about his **transformation work**, **platform engineering**, or **how he
         for s in ranked
     ]
 
-    log_query(
-        question or "",
-        "Ask Agy",
-        intent_family=intent_family,
-        confidence=confidence,
-        result_count=len(ranked),
-        top_score=search_result.get("top_score", 0.0),
-    )
+    log_kwargs = {
+        "query": question or "",
+        "page": "Ask Agy",
+        "intent_family": intent_family,
+        "confidence": confidence,
+        "result_count": len(ranked),
+        "top_score": search_result.get("top_score", 0.0),
+    }
+    if answer_stream is not None:
+        # Logged by the stream so the row includes the LLM stage
+        answer_stream.log_kwargs = log_kwargs
+    else:
+        log_query(**log_kwargs)
 
-    return {
+    result = {
         "answer_md": answer_md,
         "sources": sources,
         "modes": modes,
         "default_mode": "narrative",
         "degraded": False,
     }
+    if answer_stream is not None:
+        result["answer_stream"] = answer_stream
+    return result
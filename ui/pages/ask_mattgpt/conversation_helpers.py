@@ -16,6 +16,7 @@ from ui.image_assets import AGY_ASK_MATTGPT_B64, MATT_CARTOON_B64
 # Import from existing modules
 from ui.pages.ask_mattgpt.story_intelligence import THEME_TO_PATTERN
 from ui.pages.ask_mattgpt.utils import get_context_story, story_modes
+from utils.corpus_index import get_corpus_index
 from utils.formatting import build_5p_summary
 from utils.ui_helpers import (
     render_no_match_banner,
@@ -290,9 +291,7 @@ def _render_ask_transcript(stories: list[dict]):
                     title = m.get("Title", "")
                     one_liner = m.get("one_liner", "")
                     sid = m.get("story_id")
-                    story = next(
-                        (s for s in stories if str(s.get("id")) == str(sid)), None
-                    )
+                    story = get_corpus_index(stories).get(sid)
                     # If the user clicked a Source after this snapshot was created,
                     use_ctx = bool(st.session_state.get("__ctx_locked__"))
                     _ctx = get_context_story(stories) if use_ctx else None
@@ -710,14 +709,7 @@ def _render_ask_transcript(stories: list[dict]):
                     # Match using msg_hash instead of index i
                     if expanded_key and expanded_id and expanded_msg == msg_hash:
                         # Find the story object
-                        story_obj = next(
-                            (
-                                s
-                                for s in stories
-                                if str(s.get("id")) == str(expanded_id)
-                            ),
-                            None,
-                        )
+                        story_obj = get_corpus_index(stories).get(expanded_id)
 
                         if story_obj:
                             # Ensure story detail breaks out of narrow container on mobile
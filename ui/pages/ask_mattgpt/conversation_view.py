@@ -44,6 +44,7 @@ from ui.pages.ask_mattgpt.utils import (
     push_user_turn as _push_user_turn,
     story_modes,
 )
+from utils.corpus_index import get_corpus_index
 
 # Environment variables for debugging
 try:
@@ -58,6 +59,22 @@ except ImportError:
     PINECONE_NAMESPACE = "unknown"
 
 
+def _render_answer_stream(resp: dict, placeholder) -> dict:
+    """Render a streamed Agy answer into placeholder as tokens arrive.
+
+    No-op for responses without an "answer_stream" (nonsense, off-domain,
+    no-match, cached). Returns the finalized response with answer_md and the
+    narrative mode filled in, ready for set_answer / the transcript.
+    """
+    stream = resp.get("answer_stream") if isinstance(resp, dict) else None
+    if stream is None:
+        return resp
+
+    for snapshot in stream:
+        placeholder.markdown(snapshot + " ▌")
+    return stream.finalize(resp)
+
+
 def render_conversation_view(stories: list[dict]):
     """
     Render active conversation view.
@@ -200,7 +217,8 @@ def render_conversation_view(stories: list[dict]):
             render_thinking_indicator()
 
         try:
-            resp = send_to_backend(pending_query, {}, ctx, stories)
+            resp = send_to_backend(pending_query, {}, ctx, stories, stream=True)
+            resp = _render_answer_stream(resp, indicator_placeholder)
             indicator_placeholder.empty()  # Clear indicator
         except Exception as e:
             indicator_placeholder.empty()
@@ -330,9 +348,7 @@ def render_conversation_view(stories: list[dict]):
                 srcs = st.session_state.get("last_sources") or []
                 if srcs:
                     sid = srcs[0].get("id")
-                    target = next(
-                        (x for x in stories if str(x.get("id")) == str(sid)), None
-                    )
+                    target = get_corpus_index(stories).get(sid)
 
             if target:
                 modes_local = story_modes(target)
@@ -363,7 +379,10 @@ def render_conversation_view(stories: list[dict]):
 
         try:
             st.session_state.pop("__ask_from_suggestion__", None)
-            resp = send_to_backend(user_input_local, {}, ctx_for_this_turn, stories)
+            resp = send_to_backend(
+                user_input_local, {}, ctx_for_this_turn, stories, stream=True
+            )
+            resp = _render_answer_stream(resp, loading_container)
             loading_container.empty()
         except Exception as e:
             loading_container.empty()
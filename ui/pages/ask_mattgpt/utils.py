@@ -10,6 +10,7 @@ import re
 import streamlit as st
 
 from config.debug import DEBUG
+from utils.corpus_index import get_corpus_index
 from utils.formatting import (
     _format_deep_dive,
     _format_key_points,
@@ -246,7 +247,7 @@ def push_card_snapshot_from_state(stories: list[dict]):
         return
 
     sid = str(sources[0].get("id", ""))
-    primary = next((s for s in stories if str(s.get("id")) == sid), None)
+    primary = get_corpus_index(stories).get(sid)
 
     if not primary:
         return
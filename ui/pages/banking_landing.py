@@ -629,7 +629,7 @@ div[data-testid="stElementContainer"]:has([class*="st-key-why_agy_banking_trigge
                         )
 
                     # Subtitle from CAPABILITY_SUBTITLES, empty-string fallback.
-                    # Mirrors ERA_SUBTITLES.get(era, "") in timeline_view.py.
+                    # Mirrors ERA_SUBTITLES.get(era, "") in utils/eras.py.
                     subtitle_html = (
                         f'<div class="card-subtitle">{card["subtitle"]}</div>'
                         if card["subtitle"]
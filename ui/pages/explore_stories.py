@@ -37,7 +37,8 @@ from ui.components.thinking_indicator import render_thinking_indicator
 from ui.components.timeline_view import render_timeline_view
 from ui.components.why_agy_dialog import render_why_agy_dialog
 from ui.image_assets import AGY_EXPLORE_STORIES_B64
-from utils.filters import matches_filters
+from utils.corpus_snapshot import get_corpus_snapshot
+from utils.facet_index import get_facet_index
 from utils.ui_helpers import render_no_match_banner, safe_container
 from utils.validation import is_nonsense
 
@@ -892,16 +893,15 @@ def render_explore_stories(
     search_triggered = st.session_state.pop("__search_triggered__", False)
     current_query = F["q"].strip()
     # MATTGPT-098: default view excludes Professional Narrative stories
-    # (matching Timeline's EXCLUDED_ERA convention at timeline_view.py:42)
+    # (matching Timeline's EXCLUDED_ERA convention in utils/eras.py)
     # and sorts by Start_Date descending (most-recent-first). User can still
     # sort by clicking AgGrid column headers; this only changes the default
     # state. Narrative stories remain in the corpus + reachable via search
     # / Sub-category filter / direct deep-link, just not in the default view.
-    view = sorted(
-        [s for s in stories if s.get("Category") != "Professional Narrative"],
-        key=lambda s: s.get("Start_Date", ""),
-        reverse=True,
-    )
+    # Built once per corpus version by CorpusSnapshot.
+    snapshot = get_corpus_snapshot(stories)
+    default_view = list(snapshot.default_view)
+    view = default_view
 
     # Cache keys for readability
     LAST_RESULTS = "__last_search_results__"
@@ -1044,7 +1044,7 @@ def render_explore_stories(
         # Re-applying keyword filter would remove valid semantic matches that don't
         # contain the exact query tokens (e.g., "Truist" search returning RBC stories).
         filters_without_q = {k: v for k, v in F.items() if k != "q"}
-        view = [s for s in cached_view if matches_filters(s, filters_without_q)]
+        view = get_facet_index(stories).filter(filters_without_q, subset=cached_view)
 
     else:
         # --- PATH 3: No Active Query (F["q"] is empty) or Query changed but not submitted ---
@@ -1071,17 +1071,13 @@ def render_explore_stories(
         )
 
         if has_filters:
-            view = [s for s in stories if matches_filters(s, F)]
+            view = get_facet_index(stories).filter(F)
         else:
             # MATTGPT-098: default view (no filters active) applies the
             # Professional Narrative exclusion + Start_Date desc sort.
             # Mirrors the initial default at line 1935 above; both branches
             # must apply the default state to avoid resetting it here.
-            view = sorted(
-                [s for s in stories if s.get("Category") != "Professional Narrative"],
-                key=lambda s: s.get("Start_Date", ""),
-                reverse=True,
-            )
+            view = default_view
 
         # Filter-only feedback banner (no search query active)
         if has_filters and not F.get("q"):
@@ -1500,7 +1496,9 @@ def render_explore_stories(
         else:
             # Render the timeline component
 
-            render_timeline_view(view)
+            render_timeline_view(
+                view, grouped=snapshot.era_groups if view is default_view else None
+            )
 
             # Story detail panel (if a story is selected)
             detail = get_context_story(stories)
@@ -25,6 +25,7 @@ from ui.components.story_detail import render_story_detail
 from ui.components.thinking_indicator import render_thinking_indicator
 from ui.components.why_agy_dialog import render_why_agy_dialog
 from ui.image_assets import AGY_AVATAR_64_B64
+from utils.corpus_index import get_corpus_index
 
 _HEADER_HTML = f"""
 <div class="conversation-header">
@@ -65,30 +66,13 @@ def _find_story_by_title_client(
     return is the graceful-degradation path: the chip stays non-clickable
     rather than offering a click that does nothing.
     """
-    if not title:
-        return None
-
-    # Normalize: lowercase + collapse internal whitespace runs to a single
-    # space. The corpus has historical titles with double spaces (e.g.
-    # "Launchpad:  Empowering Clients..."), and the LLM normalizes them
-    # to single spaces in its output. Without internal whitespace
-    # collapse, the strict equality below misses those titles and the
-    # chip falls through to the non-clickable unresolved-chip path.
-    def _norm(s: str) -> str:
-        return " ".join(s.split()).lower()
-
-    title_norm = _norm(title)
-    client_norm = _norm(client or "")
-    for s in stories:
-        s_title = _norm(s.get("Title") or "")
-        if s_title != title_norm:
-            continue
-        if not client_norm:
-            return s
-        s_client = _norm(s.get("Client") or "")
-        if s_client == client_norm:
-            return s
-    return None
+    # Normalization (lowercase + internal whitespace collapse) lives in
+    # CorpusIndex: the corpus has historical titles with double spaces
+    # (e.g. "Launchpad:  Empowering Clients...") and the LLM normalizes
+    # them to single spaces in its output. Without the collapse, strict
+    # equality misses those titles and the chip falls through to the
+    # non-clickable unresolved-chip path.
+    return get_corpus_index(stories).find_by_title_client(title, client)
 
 
 def _resolve_evidence_stories(
@@ -19,3 +19,12 @@ def is_generic_client(client: str) -> bool:
         return True
     lower = client.lower().strip()
     return lower.endswith("clients") or lower.endswith("project")
+
+
+def derive_known_clients(stories: list[dict]) -> set[str]:
+    """Non-generic client names in stories (uncached; see CorpusSnapshot)."""
+    return {
+        s.get("Client")
+        for s in stories
+        if s.get("Client") and not is_generic_client(s.get("Client"))
+    }
@@ -0,0 +1,282 @@
+"""Binary corpus snapshot: one file for a fast cold start.
+
+Every cold start used to parse the JSONL line by line with json.loads and
+run normalize_story() over each record, then rebuild the facet lists and
+search vocabulary. build_snapshot() does that work once, at build time,
+and writes the result next to the corpus (<source>.snapshot):
+
+    magic b"MGPTCORP" | u32 version | u32 header length | JSON header
+    | marshal payload (64-byte aligned)
+    | float32 story vectors (64-byte aligned, memory-mapped on load)
+
+The payload holds the normalized stories (interned like freeze_story(), which
+marshal preserves, so loading skips that pass), the load diagnostics and
+every view in corpus_loader.SNAPSHOT_VIEWS. The vectors are the local vector
+index rows reordered to corpus order (NaN rows for stories the index does
+not cover), so scoring every story is one matrix-vector product.
+
+read_snapshot() is the freshness gate. It returns None -- and the caller
+parses the JSONL -- unless the snapshot version and Python version match
+(marshal is version-specific) and the recorded source sha256 equals the
+current JSONL bytes. Vectors are dropped, but the stories kept, when the
+local index files changed after the snapshot was built.
+
+Build it after editing the corpus or rebuilding the index:
+    python -m utils.corpus_binary [echo_star_stories_nlp.jsonl]
+build_custom_embeddings.py runs it after writing the local index.
+"""
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from config.constants import (
+    CORPUS_SNAPSHOT_SUFFIX,
+    DEFAULT_EMBEDDING_MODEL,
+    LOCAL_VECTOR_INDEX_PREFIX,
+)
+from config.debug import DEBUG
+from utils.story_record import freeze_story
+
+SNAPSHOT_VERSION = 1
+
+_MAGIC = b"MGPTCORP"
+_PREAMBLE = struct.Struct("<II")  # version, header length
+_ALIGN = 64
+_PYTHON = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def snapshot_path(source: str) -> Path:
+    """Snapshot file for a corpus file."""
+    return Path(f"{source}{CORPUS_SNAPSHOT_SUFFIX}")
+
+
+def _index_stamp(prefix: str) -> list[list[int]] | None:
+    """(mtime_ns, size) of the local index files, or None if absent."""
+    stamp = []
+    for suffix in (".npy", ".manifest.json"):
+        try:
+            st = os.stat(f"{prefix}{suffix}")
+        except OSError:
+            return None
+        stamp.append([st.st_mtime_ns, st.st_size])
+    return stamp
+
+
+class BinarySnapshot:
+    """Contents of a fresh snapshot file.
+
+    Attributes:
+        stories: Normalized story dicts (new objects on every read) with
+            keys and categorical values already interned.
+        skipped_no_id: Rows dropped for a missing id.
+        parse_errors: (line number, message) for lines that were not JSON.
+        views: Precomputed corpus_loader.SNAPSHOT_VIEWS by name.
+        vectors: Read-only memory-mapped (n_stories, dim) float32 matrix
+            aligned with stories, or None.
+        vector_model: Embedding model of vectors.
+    """
+
+    def __init__(
+        self,
+        stories: list[dict],
+        skipped_no_id: int,
+        parse_errors: list[tuple[int, str]],
+        views: dict[str, Any],
+        vectors: np.ndarray | None = None,
+        vector_model: str | None = None,
+    ):
+        self.stories = stories
+        self.skipped_no_id = skipped_no_id
+        self.parse_errors = parse_errors
+        self.views = views
+        self.vectors = vectors
+        self.vector_model = vector_model
+
+
+def _aligned_vectors(stories: list[dict], prefix: str, model: str) -> np.ndarray | None:
+    """Local index rows in corpus order, NaN where a story has no vector."""
+    from services.vector_index import load_local_index
+
+    idx = load_local_index(prefix, model=model)
+    if idx is None:
+        return None
+    row_by_id = {sid: row for row, sid in enumerate(idx.ids)}
+    out = np.full((len(stories), idx.dimension), np.nan, dtype=np.float32)
+    for i, s in enumerate(stories):
+        row = row_by_id.get(str(s.get("id")))
+        if row is not None:
+            out[i] = idx.matrix[row]
+    return out
+
+
+def build_snapshot(
+    source: str,
+    out: str | Path | None = None,
+    index_prefix: str = LOCAL_VECTOR_INDEX_PREFIX,
+    model: str = DEFAULT_EMBEDDING_MODEL,
+) -> Path:
+    """Parse source and write its snapshot atomically; return the path.
+
+    Vectors are included when the local index at index_prefix exists and
+    was built with model.
+    """
+    from utils.corpus_loader import SNAPSHOT_VIEWS, parse_corpus_lines
+
+    data = Path(source).read_bytes()
+    stories, skipped_no_id, parse_errors = parse_corpus_lines(data)
+    payload = marshal.dumps(
+        {
+            # Interned as freeze_story() does; marshal keeps the interning.
+            "stories": [dict(freeze_story(s)) for s in stories],
+            "skipped_no_id": skipped_no_id,
+            "parse_errors": parse_errors,
+            "views": {name: build(stories) for name, build in SNAPSHOT_VIEWS.items()},
+        }
+    )
+    vectors = _aligned_vectors(stories, index_prefix, model)
+
+    header: dict[str, Any] = {
+        "version": SNAPSHOT_VERSION,
+        "python": _PYTHON,
+        "source": {
+            "name": Path(source).name,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        },
+        "n_stories": len(stories),
+        "payload": [0, len(payload)],
+        "vectors": None,
+    }
+    if vectors is not None:
+        header["vectors"] = {
+            "offset": _align(len(payload)),
+            "shape": list(vectors.shape),
+            "model": model,
+            "index": _index_stamp(index_prefix),
+        }
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    base = _align(len(_MAGIC) + _PREAMBLE.size + len(header_bytes))
+
+    path = Path(out) if out is not None else snapshot_path(source)
+    tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(_MAGIC)
+        f.write(_PREAMBLE.pack(SNAPSHOT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.seek(base)
+        f.write(payload)
+        if vectors is not None:
+            f.seek(base + header["vectors"]["offset"])
+            f.write(np.ascontiguousarray(vectors, dtype="<f4").tobytes())
+    os.replace(tmp, path)
+    return path
+
+
+def read_snapshot(
+    source: str,
+    source_sha256: str,
+    path: str | Path | None = None,
+    index_prefix: str = LOCAL_VECTOR_INDEX_PREFIX,
+) -> BinarySnapshot | None:
+    """Load the snapshot for source if it is fresh, else None.
+
+    Args:
+        source: Corpus JSONL path (locates the snapshot when path is None).
+        source_sha256: Hex digest of the current JSONL bytes.
+        path: Explicit snapshot path.
+        index_prefix: Local vector index the snapshot's vectors came from.
+    """
+    path = Path(path) if path is not None else snapshot_path(source)
+    try:
+        with open(path, "rb") as f:
+            preamble = f.read(len(_MAGIC) + _PREAMBLE.size)
+            if len(preamble) < len(_MAGIC) + _PREAMBLE.size or not preamble.startswith(
+                _MAGIC
+            ):
+                return None
+            version, header_len = _PREAMBLE.unpack(preamble[len(_MAGIC) :])
+            if version != SNAPSHOT_VERSION:
+                return None
+            header = json.loads(f.read(header_len))
+            if header["python"] != _PYTHON:
+                return None
+            if header["source"]["sha256"] != source_sha256:
+                return None
+            base = _align(len(preamble) + header_len)
+            offset, length = header["payload"]
+            f.seek(base + offset)
+            payload = marshal.loads(f.read(length))
+
+        vectors = None
+        vector_model = None
+        meta = header.get("vectors")
+        if meta and meta["index"] == _index_stamp(index_prefix):
+            vectors = np.memmap(
+                path,
+                dtype="<f4",
+                mode="r",
+                offset=base + meta["offset"],
+                shape=tuple(meta["shape"]),
+            )
+            vector_model = meta["model"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, EOFError, TypeError, KeyError) as e:
+        if DEBUG:
+            print(f"DEBUG corpus snapshot: ignoring {path}: {e}")
+        return None
+
+    return BinarySnapshot(
+        payload["stories"],
+        payload["skipped_no_id"],
+        [tuple(err) for err in payload["parse_errors"]],
+        payload["views"],
+        vectors=vectors,
+        vector_model=vector_model,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "source",
+        nargs="?",
+        default=os.getenv("STORIES_JSONL", "echo_star_stories_nlp.jsonl"),
+        help="Corpus JSONL file",
+    )
+    parser.add_argument("--out", help="Snapshot path (default: <source>.snapshot)")
+    parser.add_argument("--index-prefix", default=LOCAL_VECTOR_INDEX_PREFIX)
+    parser.add_argument("--model", default=DEFAULT_EMBEDDING_MODEL)
+    args = parser.parse_args(argv)
+
+    path = build_snapshot(
+        args.source, out=args.out, index_prefix=args.index_prefix, model=args.model
+    )
+    snap = read_snapshot(
+        args.source,
+        hashlib.sha256(Path(args.source).read_bytes()).hexdigest(),
+        path=path,
+        index_prefix=args.index_prefix,
+    )
+    n_vectors = 0 if snap is None or snap.vectors is None else len(snap.vectors)
+    print(
+        f"Wrote {path} ({len(snap.stories) if snap else 0} stories, "
+        f"{n_vectors} vectors)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
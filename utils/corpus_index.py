@@ -0,0 +1,138 @@
+"""Corpus lookup index: O(1) story hydration by id and by title/client.
+
+Vector search returns ids; every caller used to map them back to stories
+with `next(s for s in stories if str(s.get("id")) == str(sid))`, an O(N)
+scan per match. CorpusIndex is built once per loaded corpus and answers
+those lookups from dicts, so hydrating k matches costs O(k).
+
+Lookup semantics mirror the scans they replace: the FIRST story with a
+given id (or title/client) wins, ids compare as strings, and title/client
+matching is case-insensitive with internal whitespace collapsed (the corpus
+has historical titles with double spaces that LLM output normalizes).
+
+Use get_corpus_index(stories) rather than constructing directly; it reuses
+the index for the same list object.
+"""
+
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+
+def _norm_text(s: str | None) -> str:
+    """Lowercase and collapse internal whitespace runs to a single space."""
+    return " ".join((s or "").split()).lower()
+
+
+class CorpusIndex:
+    """Id and title/client lookup tables over a story list.
+
+    Args:
+        stories: Loaded corpus (list of story dicts). Stories are stored by
+            reference, never copied.
+    """
+
+    def __init__(self, stories: list[dict]):
+        self.by_id: dict[str, dict] = {}
+        self.by_title: dict[str, dict] = {}
+        self.by_title_client: dict[tuple[str, str], dict] = {}
+
+        for s in stories:
+            sid = s.get("id")
+            if sid not in (None, ""):
+                self.by_id.setdefault(str(sid), s)
+
+            title = _norm_text(s.get("Title"))
+            if not title:
+                continue
+            self.by_title.setdefault(title, s)
+            client = _norm_text(s.get("Client"))
+            self.by_title_client.setdefault((title, client), s)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, sid) -> bool:
+        return sid is not None and str(sid) in self.by_id
+
+    def get(self, sid) -> dict | None:
+        """Return the story with this id, or None."""
+        if sid is None:
+            return None
+        return self.by_id.get(str(sid))
+
+    def get_many(self, ids: Iterable) -> list[dict]:
+        """Hydrate ids in order, silently dropping ids not in the corpus."""
+        out = []
+        for sid in ids:
+            story = self.get(sid)
+            if story is not None:
+                out.append(story)
+        return out
+
+    def find_by_title_client(
+        self, title: str | None, client: str | None = None
+    ) -> dict | None:
+        """Case/whitespace-insensitive title match, optionally scoped by client.
+
+        With no client, returns the first story with that title. With a
+        client, both title and client must match.
+        """
+        title_norm = _norm_text(title)
+        if not title_norm:
+            return None
+        client_norm = _norm_text(client)
+        if not client_norm:
+            return self.by_title.get(title_norm)
+        return self.by_title_client.get((title_norm, client_norm))
+
+
+class IdentityCache:
+    """Small cache of per-story-list views, keyed by list identity.
+
+    The app passes the same STORIES list on every rerun, tests and probes
+    pass their own. Holding the list reference keeps id() from being reused
+    by a different object while the entry is alive. An entry is rebuilt if
+    the list's length changes (stories appended or removed in place); the
+    oldest entry is evicted past max_entries. Safe to share across threads:
+    lookups and builds happen under one reentrant lock, so concurrent
+    callers get the same view and it is built once.
+
+    Args:
+        build: Called with the story list on a miss.
+        max_entries: Story lists kept at once.
+    """
+
+    __slots__ = ("_build", "_max_entries", "_entries", "_lock")
+
+    def __init__(self, build: Callable[[list], Any], max_entries: int = 4):
+        self._build = build
+        self._max_entries = max_entries
+        self._entries: dict[int, tuple[list, int, Any]] = {}
+        self._lock = threading.RLock()
+
+    def get(self, stories: list) -> Any:
+        """Return the view for this story list, building it on first use."""
+        key = id(stories)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is stories and entry[1] == len(stories):
+                return entry[2]
+
+            view = self._build(stories)
+            if key not in self._entries and len(self._entries) >= self._max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (stories, len(stories), view)
+            return view
+
+
+_INDEX_CACHE = IdentityCache(CorpusIndex)
+
+
+def get_corpus_index(stories: list[dict]) -> CorpusIndex:
+    """Return the CorpusIndex for this story list, building it on first use.
+
+    The cached index is rebuilt if the list's length changes (stories
+    appended or removed in place).
+    """
+    return _INDEX_CACHE.get(stories)
@@ -3,10 +3,31 @@
 load_stories() replicates the normalization and id-filtering logic that
 load_star_stories() applies in app.py, without the Streamlit dependency.
 Use this in eval harnesses and probe scripts instead of raw json.loads loops.
+
+get_corpus() is the app's process-wide provider. Streamlit re-executes
+app.py on every rerun of every session; get_corpus() parses the JSONL once
+and hands every session the same story list until the file's mtime/size
+changes AND its content hash differs. Work derived from the corpus
+(vocabulary, metadata sync, filter facets) is memoized per loaded corpus
+via LoadedCorpus.derived().
+
+Both loaders first try the binary snapshot written by utils.corpus_binary
+(normalized stories, SNAPSHOT_VIEWS and story vectors in one file). It is
+used only when its recorded source hash matches the JSONL bytes; otherwise
+they parse the JSONL as before.
 """
 
+import hashlib
 import json
+import os
+import threading
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from utils.story_record import StoryRecord, freeze_story
 
 _LIST_FIELDS = (
     "Situation",
@@ -61,18 +82,241 @@ def load_stories(path: str) -> list[dict]:
     - Skips records where id is None, empty string, or 0
     - Strips whitespace from id
     - Applies normalize_story to each kept record
+
+    A fresh binary snapshot of a file with no malformed lines returns the
+    same stories without parsing the JSONL.
     """
+    from utils import corpus_binary
+
+    data = Path(path).read_bytes()
+    snap = corpus_binary.read_snapshot(path, hashlib.sha256(data).hexdigest())
+    if snap is not None and not snap.parse_errors:
+        return snap.stories
+
     stories = []
-    with Path(path).open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            story = json.loads(line)
-            story_id = story.get("id")
-            if story_id in (None, "", 0):
-                continue
-            story["id"] = str(story_id).strip()
-            normalize_story(story)
-            stories.append(story)
+    for line in data.decode("utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        story = json.loads(line)
+        story_id = story.get("id")
+        if story_id in (None, "", 0):
+            continue
+        story["id"] = str(story_id).strip()
+        normalize_story(story)
+        stories.append(story)
     return stories
+
+
+def parse_corpus_lines(data: bytes) -> tuple[list[dict], int, list[tuple[int, str]]]:
+    """Lenient parse of JSONL bytes into normalized story dicts.
+
+    Returns (stories, rows skipped for a missing id, (line number, message)
+    for lines that were not JSON).
+    """
+    stories: list[dict] = []
+    skipped_no_id = 0
+    parse_errors: list[tuple[int, str]] = []
+    for line_no, line in enumerate(data.decode("utf-8").splitlines(), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            story = json.loads(line)
+        except Exception as e:
+            parse_errors.append((line_no, str(e)))
+            continue
+        story_id = story.get("id")
+        if story_id in (None, "", 0):
+            skipped_no_id += 1
+            continue
+        story["id"] = str(story_id).strip()
+        normalize_story(story)
+        stories.append(story)
+    return stories, skipped_no_id, parse_errors
+
+
+def build_facets(stories):
+    """Build filter option lists from story data using raw JSONL field names."""
+    # Primary filters (NEW for Phase 4 redesign)
+    industries = sorted({s.get("Industry", "") for s in stories if s.get("Industry")})
+    capabilities = sorted(
+        {
+            s.get("Solution / Offering", "")
+            for s in stories
+            if s.get("Solution / Offering")
+        }
+    )
+
+    # Advanced filters
+    clients = sorted({s.get("Client", "") for s in stories if s.get("Client")})
+    # domains now comes from Sub-category field (used to be synthetic Category / Sub-category)
+    domains = sorted(
+        {s.get("Sub-category", "") for s in stories if s.get("Sub-category")}
+    )
+    roles = sorted({s.get("Role", "") for s in stories if s.get("Role")})
+    # tags comes from public_tags (already parsed to list in loader)
+    tags = sorted({t for s in stories for t in (s.get("public_tags") or [])})
+    # personas field doesn't exist in current data
+    personas = []
+    return industries, capabilities, clients, domains, roles, tags, personas
+
+
+def build_vocab(stories: list[dict]) -> set[str]:
+    """Search vocabulary (tokens of key fields and tags) for rag_service."""
+    from utils.validation import _tokenize  # imports streamlit; keep lazy
+
+    vocab: set[str] = set()
+    for s in stories:
+        # Add tokens from key fields
+        for field in ["title", "client", "domain", "5PSummary"]:
+            if s.get(field):
+                vocab.update(_tokenize(str(s[field])))
+
+        # Add tags
+        if s.get("tags"):
+            for tag in s["tags"]:
+                vocab.update(_tokenize(str(tag)))
+    return vocab
+
+
+# Derived views stored in the binary snapshot, preloaded into
+# LoadedCorpus.derived() under the same names. Values must be marshal-able.
+SNAPSHOT_VIEWS: dict[str, Callable[[list[dict]], Any]] = {
+    "facets": build_facets,
+    "vocab": build_vocab,
+}
+
+
+class LoadedCorpus:
+    """One parsed version of a corpus file, shared across sessions.
+
+    stories is the same list object for every caller, so per-list caches
+    (get_corpus_index, get_facet_index, ...) are shared too. Treat it and
+    its story dicts as read-only.
+
+    Attributes:
+        path: Source file path.
+        stories: Normalized, read-only StoryRecords with a stable string id.
+        sha256: Hex digest of the file bytes (the corpus version).
+        skipped_no_id: Rows dropped for a missing id.
+        parse_errors: (line number, message) for lines that were not JSON.
+        vectors: Row-normalized float32 story vectors aligned with stories
+            (zero rows for stories missing from the index), or None when
+            the corpus was not loaded from a snapshot carrying vectors.
+        vector_model: Embedding model the vectors were built with.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        stories: list[StoryRecord],
+        sha256: str,
+        skipped_no_id: int = 0,
+        parse_errors: list[tuple[int, str]] | None = None,
+        views: dict[str, Any] | None = None,
+        vectors: np.ndarray | None = None,
+        vector_model: str | None = None,
+    ):
+        self.path = path
+        self.stories = stories
+        self.sha256 = sha256
+        self.skipped_no_id = skipped_no_id
+        self.parse_errors = parse_errors or []
+        self.vectors = vectors
+        self.vector_model = vector_model
+        self._derived: dict[str, Any] = dict(views or {})
+        # Reentrant: a build may itself ask for another derived view
+        self._derived_lock = threading.RLock()
+
+    def derived(self, name: str, build: Callable[[list[dict]], Any]) -> Any:
+        """Return build(stories), computed once per loaded corpus.
+
+        If build raises, nothing is cached and the next call retries. build
+        may call derived() for other views (the lock is reentrant).
+        """
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self.stories)
+            return self._derived[name]
+
+
+def _parse_corpus(path: str, data: bytes) -> LoadedCorpus:
+    """Lenient load for the app: bad JSON lines are recorded, not raised.
+
+    Uses the binary snapshot when it matches data, else parses the JSONL.
+    """
+    from utils import corpus_binary
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    snap = corpus_binary.read_snapshot(path, sha256)
+    if snap is not None:
+        return LoadedCorpus(
+            path,
+            [StoryRecord(s) for s in snap.stories],
+            sha256,
+            skipped_no_id=snap.skipped_no_id,
+            parse_errors=snap.parse_errors,
+            views=snap.views,
+            vectors=snap.vectors,
+            vector_model=snap.vector_model,
+        )
+
+    stories, skipped_no_id, parse_errors = parse_corpus_lines(data)
+    return LoadedCorpus(
+        path,
+        [freeze_story(s) for s in stories],
+        sha256,
+        skipped_no_id=skipped_no_id,
+        parse_errors=parse_errors,
+    )
+
+
+# path -> ((mtime_ns, size), LoadedCorpus)
+_CORPUS_CACHE: dict[str, tuple[tuple[int, int], LoadedCorpus]] = {}
+_CORPUS_LOCK = threading.Lock()
+
+
+def get_corpus(path: str) -> LoadedCorpus | None:
+    """Process-wide corpus for path, reloaded only when the file changes.
+
+    Each call is one os.stat(). When mtime or size differ from the cached
+    load, the file is read and hashed; a new LoadedCorpus is parsed only if
+    the hash changed too (a touch keeps the current one). Returns None if
+    the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    entry = _CORPUS_CACHE.get(path)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    with _CORPUS_LOCK:
+        entry = _CORPUS_CACHE.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        try:
+            data = Path(path).read_bytes()
+        except OSError:
+            return None
+        corpus = entry[1] if entry is not None else None
+        if corpus is None or corpus.sha256 != hashlib.sha256(data).hexdigest():
+            corpus = _parse_corpus(path, data)
+        _CORPUS_CACHE[path] = (stamp, corpus)
+        return corpus
+
+
+def corpus_for(stories: list[dict]) -> LoadedCorpus | None:
+    """The cached LoadedCorpus whose story list is this exact object, if any."""
+    for _, corpus in list(_CORPUS_CACHE.values()):
+        if corpus.stories is stories:
+            return corpus
+    return None
@@ -0,0 +1,195 @@
+"""CorpusSnapshot: every corpus-derived view, computed together once.
+
+Filter facets, both search vocabularies, known clients, narrative titles,
+synthesis themes, career span, the default My Work view and its era
+groups used to be rebuilt from the full corpus in different places -- some
+on every rerun, some once per session, some once per process with no link
+to the corpus version -- so they could drift apart after a corpus reload.
+A CorpusSnapshot holds all of them for one corpus version, keyed by its
+content hash, and is shared by every session and page.
+
+Use get_corpus_snapshot(stories). For the app corpus (a list returned by
+utils.corpus_loader.get_corpus) the snapshot is memoized on the
+LoadedCorpus and reuses the facet/vocab views preloaded from the binary
+snapshot; other lists (tests, scripts) are cached by list identity like
+get_facet_index().
+
+The views come from the utils functions that own them (build_facets,
+build_known_vocab, group_stories_by_era, ...). Views that need page code,
+like MATT_DNA, are built by their page from these.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any
+
+from utils.client_utils import derive_known_clients
+from utils.corpus_index import IdentityCache
+from utils.corpus_loader import build_facets, build_vocab, corpus_for
+from utils.eras import group_stories_by_era
+from utils.validation import build_known_vocab
+
+
+def _content_hash(stories: list[dict]) -> str:
+    """sha256 of a story list that did not come from a corpus file."""
+    blob = json.dumps(stories, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# Themes to exclude from synthesis (too generic or internal-only)
+EXCLUDED_THEMES = {
+    "Internal",
+    "Confidential",
+    "Other",
+    "N/A",
+    "",
+    None,
+}
+
+
+def derive_synthesis_themes(stories: list[dict]) -> list[str]:
+    """Sorted distinct story themes, minus EXCLUDED_THEMES.
+
+    Automatically picks up new themes or renames in the JSONL (Fix for
+    Theme Fragility).
+    """
+    return sorted(
+        {
+            s.get("Theme")
+            for s in stories
+            if s.get("Theme") and s.get("Theme") not in EXCLUDED_THEMES
+        }
+    )
+
+
+def derive_career_years(stories: list[dict]) -> tuple[int, int]:
+    """(start year, end year) from corpus dates (MATTGPT-161).
+
+    min(Start_Date) and max(End_Date) as YYYY-MM strings are safe under
+    string sort because the format is zero-padded. Stories without dates
+    are ignored; (0, 0) if none have them.
+    """
+    starts = [s["Start_Date"] for s in stories if s.get("Start_Date")]
+    ends = [s["End_Date"] for s in stories if s.get("End_Date")]
+    if not starts or not ends:
+        return 0, 0
+    return int(min(starts)[:4]), int(max(ends)[:4])
+
+
+def derive_narrative_titles(stories: list[dict]) -> list[str]:
+    """Lowercased Professional Narrative titles (uncached; see CorpusSnapshot)."""
+    return [
+        s.get("Title", "").lower()
+        for s in stories
+        if s.get("Theme") == "Professional Narrative" and s.get("Title")
+    ]
+
+
+class CorpusSnapshot:
+    """Immutable bundle of corpus-derived views for one corpus version.
+
+    Collections are frozensets, tuples and read-only mappings; the story
+    dicts inside era_groups are the corpus stories themselves.
+
+    Args:
+        stories: The story list the views are derived from.
+        sha256: Corpus content hash (the snapshot's version key).
+        views: Precomputed "facets" / "vocab" views to reuse.
+
+    Attributes:
+        facets: (industries, capabilities, clients, domains, roles, tags,
+            personas) option lists for the My Work filters.
+        search_vocab: rag_service vocabulary (initialize_vocab).
+        known_vocab: Nonsense-detection vocabulary (build_known_vocab).
+        known_clients: Non-generic client names.
+        narrative_titles: Lowercased Professional Narrative titles.
+        synthesis_themes: Sorted synthesis themes.
+        career_start_year / career_end_year / career_span_years: From
+            the corpus Start_Date / End_Date range.
+        default_view: The unfiltered My Work story order (MATTGPT-098).
+        era_groups: group_stories_by_era(default_view), the unfiltered
+            timeline.
+    """
+
+    __slots__ = (
+        "sha256",
+        "n_stories",
+        "facets",
+        "search_vocab",
+        "known_vocab",
+        "known_clients",
+        "narrative_titles",
+        "synthesis_themes",
+        "career_start_year",
+        "career_end_year",
+        "career_span_years",
+        "default_view",
+        "era_groups",
+    )
+
+    def __init__(
+        self,
+        stories: list[dict],
+        sha256: str,
+        views: Mapping[str, Any] | None = None,
+    ):
+        views = views or {}
+        facets = views.get("facets") or build_facets(stories)
+        search_vocab = views.get("vocab")
+        if search_vocab is None:
+            search_vocab = build_vocab(stories)
+
+        start, end = derive_career_years(stories)
+
+        init = object.__setattr__
+        init(self, "sha256", sha256)
+        init(self, "n_stories", len(stories))
+        init(self, "facets", tuple(tuple(f) for f in facets))
+        init(self, "search_vocab", frozenset(search_vocab))
+        init(self, "known_vocab", frozenset(build_known_vocab(stories)))
+        init(self, "known_clients", frozenset(derive_known_clients(stories)))
+        init(self, "narrative_titles", tuple(derive_narrative_titles(stories)))
+        init(self, "synthesis_themes", tuple(derive_synthesis_themes(stories)))
+        init(self, "career_start_year", start)
+        init(self, "career_end_year", end)
+        init(self, "career_span_years", end - start)
+        # MATTGPT-098 default My Work view: no Professional Narrative
+        # stories, most recent first.
+        default_view = tuple(
+            sorted(
+                [s for s in stories if s.get("Category") != "Professional Narrative"],
+                key=lambda s: s.get("Start_Date", ""),
+                reverse=True,
+            )
+        )
+        init(self, "default_view", default_view)
+        init(self, "era_groups", MappingProxyType(group_stories_by_era(default_view)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CorpusSnapshot is immutable")
+
+    __delattr__ = __setattr__
+
+    def __repr__(self) -> str:
+        return f"CorpusSnapshot({self.sha256[:12]}, {self.n_stories} stories)"
+
+
+_SNAPSHOT_CACHE = IdentityCache(lambda s: CorpusSnapshot(s, _content_hash(s)))
+
+
+def get_corpus_snapshot(stories: list[dict]) -> CorpusSnapshot:
+    """Return the CorpusSnapshot for this story list, building it on first use."""
+    corpus = corpus_for(stories)
+    if corpus is not None:
+        # Resolved first: derived() holds the corpus lock while building
+        views = {
+            "facets": corpus.derived("facets", build_facets),
+            "vocab": corpus.derived("vocab", build_vocab),
+        }
+        return corpus.derived(
+            "snapshot", lambda s: CorpusSnapshot(s, corpus.sha256, views=views)
+        )
+
+    return _SNAPSHOT_CACHE.get(stories)
@@ -0,0 +1,188 @@
+"""Compiled entity matcher for detect_entity().
+
+detect_entity() used to rebuild the known-entity sets from every story,
+sort them, and run one regex or substring search per alias, entity value
+and title on every query. EntityMatcher compiles all of those strings once
+per corpus into a single Aho-Corasick automaton, so a query is scanned in
+one linear pass regardless of corpus size.
+
+Every occurrence (including overlapping ones) is reported, and the winner is
+chosen by the same priority order detect_entity() always used:
+1. ENTITY_ALIASES, in dict order, matched on word boundaries
+2. ENTITY_DETECTION_FIELDS (Client, Employer, Division) in field order,
+   longest value first, substring match
+3. Story titles, longest first, substring match
+
+EXCLUSION_PREFIXES context rules are applied to the winner by the caller.
+"""
+
+import re
+from collections import deque
+from typing import Any
+
+from config.constants import (
+    ENTITY_ALIASES,
+    ENTITY_DETECTION_FIELDS,
+    EXCLUDED_DIVISION_VALUES,
+)
+from utils.client_utils import is_generic_client
+
+# Priority tiers (lower wins)
+_TIER_ALIAS = 0
+_TIER_FIELD = 1
+_TIER_TITLE = 2
+
+
+class AhoCorasick:
+    """Multi-pattern substring automaton.
+
+    Args:
+        patterns: Strings to find. Matching is exact (callers lowercase both
+            patterns and text).
+    """
+
+    def __init__(self, patterns: list[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[str]] = [[]]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._link()
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if pattern not in self._out[node]:
+            self._out[node].append(pattern)
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter(self, text: str):
+        """Yield (start, pattern) for every occurrence in text."""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for pattern in self._out[node]:
+                yield i - len(pattern) + 1, pattern
+
+
+class EntityMatcher:
+    """Entity detection compiled once from aliases and story data.
+
+    Args:
+        stories: Story corpus supplying Client/Employer/Division values and
+            titles.
+        aliases: Shorthand -> (field, canonical) map. Defaults to
+            ENTITY_ALIASES.
+    """
+
+    def __init__(
+        self,
+        stories: list[dict[str, Any]],
+        aliases: dict[str, tuple[str, str]] | None = None,
+    ):
+        aliases = ENTITY_ALIASES if aliases is None else aliases
+        # lowercased pattern -> [(priority key, field, value)]
+        self._candidates: dict[str, list[tuple[tuple, str, str]]] = {}
+        self._alias_rx: dict[str, re.Pattern] = {}
+
+        for order, (alias, (field, canonical)) in enumerate(aliases.items()):
+            key = alias.lower()
+            self._alias_rx.setdefault(key, re.compile(rf"\b{re.escape(key)}\b"))
+            self._register(key, (_TIER_ALIAS, order), field, canonical)
+
+        for field_order, field in enumerate(ENTITY_DETECTION_FIELDS):
+            values = {
+                s.get(field)
+                for s in stories
+                if s.get(field) and not is_generic_client(s.get(field))
+            }
+            for value in values:
+                # Common words that cause false positives
+                if field == "Division" and value in EXCLUDED_DIVISION_VALUES:
+                    continue
+                self._register(
+                    value.lower(),
+                    (_TIER_FIELD, field_order, -len(value), value),
+                    field,
+                    value,
+                )
+
+        for title in {s.get("Title", "") for s in stories if s.get("Title")}:
+            self._register(
+                title.lower(), (_TIER_TITLE, -len(title), title), "Title", title
+            )
+
+        self._automaton = AhoCorasick(list(self._candidates))
+
+    def _register(self, pattern: str, priority: tuple, field: str, value: str):
+        if pattern:
+            self._candidates.setdefault(pattern, []).append((priority, field, value))
+
+    def match(self, q_lower: str) -> tuple[str, str, str, bool] | None:
+        """Highest-priority entity mentioned in an already-lowercased query.
+
+        Returns:
+            (field, value, matched text, is_alias) or None.
+        """
+        best = None
+        for start, pattern in self._automaton.iter(q_lower):
+            for priority, field, value in self._candidates[pattern]:
+                if best is not None and priority >= best[0]:
+                    continue
+                if priority[0] == _TIER_ALIAS and not self._alias_rx[pattern].match(
+                    q_lower, start
+                ):
+                    continue
+                best = (priority, field, value, pattern)
+        if best is None:
+            return None
+        priority, field, value, pattern = best
+        return field, value, pattern, priority[0] == _TIER_ALIAS
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+
+_MATCHER_CACHE: dict[int, tuple[list, int, EntityMatcher]] = {}
+_MATCHER_CACHE_MAX = 4
+
+
+def get_entity_matcher(stories: list[dict[str, Any]]) -> EntityMatcher:
+    """Return the EntityMatcher for this story list, compiling it on first use.
+
+    Cached like utils.corpus_index.get_corpus_index(): by list identity, and
+    rebuilt if the list's length changes.
+    """
+    key = id(stories)
+    entry = _MATCHER_CACHE.get(key)
+    if entry is not None and entry[0] is stories and entry[1] == len(stories):
+        return entry[2]
+
+    matcher = EntityMatcher(stories)
+    if key not in _MATCHER_CACHE and len(_MATCHER_CACHE) >= _MATCHER_CACHE_MAX:
+        _MATCHER_CACHE.pop(next(iter(_MATCHER_CACHE)))
+    _MATCHER_CACHE[key] = (stories, len(stories), matcher)
+    return matcher
@@ -0,0 +1,242 @@
+"""Facet index: My Work filtering and facet counts as bitwise mask algebra.
+
+matches_filters() is evaluated story by story on every Streamlit rerun, and
+with a keyword query it rebuilds and re-tokenizes each story's haystack
+every time. FacetIndex does that work once per loaded corpus:
+
+- One NumPy bool mask per value of every facet field (Industry, Solution /
+  Offering, Era, Client, Sub-category, Role, public_tags, personas)
+- A precomputed has-metric mask
+- An inverted index from keyword-haystack token to story positions
+
+Applying the filters dict is then an OR across the selected values of each
+facet and an AND across facets, and the counts for every option of a facet
+(given all the other active filters) fall out of one more AND per option.
+
+Semantics are exactly those of utils.filters.matches_filters(): single-select
+facets compare with equality, multi-selects match any selected value, tags
+are compared stripped and lowercased, and q requires every query token
+(or, with no tokens, a substring of the haystack).
+
+Use get_facet_index(stories) rather than constructing directly; it reuses
+the index for the same list object.
+"""
+
+from collections.abc import Hashable
+from typing import Any
+
+import numpy as np
+
+from utils.corpus_index import IdentityCache
+from utils.filters import matches_filters, story_haystack
+from utils.formatting import story_has_metric
+from utils.story_record import StoryHit
+from utils.validation import _tokenize
+
+# Filter key -> (story field, multi-select?)
+FACETS: dict[str, tuple[str, bool]] = {
+    "industry": ("Industry", False),
+    "capability": ("Solution / Offering", False),
+    "era": ("Era", False),
+    "clients": ("Client", True),
+    "domains": ("Sub-category", True),
+    "roles": ("Role", True),
+    "tags": ("public_tags", True),
+    "personas": ("personas", True),
+}
+
+# Story fields holding a list of values rather than a single value
+_LIST_FIELDS = {"public_tags", "personas"}
+
+
+def _norm_tag(t: Any) -> str:
+    return str(t).strip().lower()
+
+
+class FacetIndex:
+    """Per-value bool masks and keyword postings over a story list.
+
+    Args:
+        stories: Loaded corpus (list of story dicts). Stories are stored by
+            reference, never copied.
+    """
+
+    def __init__(self, stories: list[dict]):
+        self.stories = stories
+        n = len(stories)
+        # Position lookup for filtering subsets (search results are copies)
+        self._pos_by_obj: dict[int, int] = {}
+        self._pos_by_sid: dict[str, int] = {}
+        # field -> value -> positions, turned into masks below
+        postings: dict[str, dict[Any, list[int]]] = {
+            field: {} for field, _ in FACETS.values()
+        }
+        token_postings: dict[str, list[int]] = {}
+        self._hay_lower: list[str] = []
+        self.has_metric = np.zeros(n, dtype=bool)
+
+        for i, s in enumerate(stories):
+            self._pos_by_obj[id(s)] = i
+            sid = s.get("id")
+            if sid not in (None, ""):
+                self._pos_by_sid.setdefault(str(sid), i)
+
+            for field in postings:
+                if field in _LIST_FIELDS:
+                    values = s.get(field, []) or []
+                    if field == "public_tags":
+                        values = {_norm_tag(t) for t in values}
+                else:
+                    values = [s.get(field)]
+                for v in values:
+                    if v is not None and isinstance(v, Hashable):
+                        postings[field].setdefault(v, []).append(i)
+
+            self.has_metric[i] = story_has_metric(s)
+
+            hay = story_haystack(s)
+            self._hay_lower.append(hay.lower())
+            for tok in set(_tokenize(hay)):
+                token_postings.setdefault(tok, []).append(i)
+
+        self._masks: dict[str, dict[Any, np.ndarray]] = {}
+        for field, by_value in postings.items():
+            self._masks[field] = {}
+            for v, positions in by_value.items():
+                mask = np.zeros(n, dtype=bool)
+                mask[positions] = True
+                self._masks[field][v] = mask
+        self._tokens: dict[str, np.ndarray] = {
+            tok: np.asarray(positions, dtype=np.int64)
+            for tok, positions in token_postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.stories)
+
+    def values(self, key: str) -> list:
+        """Indexed values of a facet (filter key, e.g. "clients")."""
+        return list(self._masks[FACETS[key][0]])
+
+    def _facet_mask(self, key: str, selected: Any) -> np.ndarray | None:
+        """Mask for one facet's selection, or None when it is inactive."""
+        if not selected:
+            return None
+        field, multi = FACETS[key]
+        by_value = self._masks[field]
+        if not multi:
+            selected = [selected]
+        elif key == "tags":
+            selected = {_norm_tag(t) for t in selected}
+        mask = np.zeros(len(self.stories), dtype=bool)
+        for v in selected:
+            hit = by_value.get(v) if isinstance(v, Hashable) else None
+            if hit is not None:
+                mask |= hit
+        return mask
+
+    def keyword_mask(self, q: str) -> np.ndarray | None:
+        """Stories whose haystack contains every token of q (None if q empty)."""
+        q_raw = (q or "").strip()
+        if not q_raw:
+            return None
+        n = len(self.stories)
+        q_toks = _tokenize(q_raw)
+        if not q_toks:
+            # Fallback: substring check
+            needle = q_raw.lower()
+            return np.fromiter((needle in h for h in self._hay_lower), bool, n)
+        mask = np.ones(n, dtype=bool)
+        for tok in set(q_toks):
+            positions = self._tokens.get(tok)
+            if positions is None:
+                return np.zeros(n, dtype=bool)
+            tok_mask = np.zeros(n, dtype=bool)
+            tok_mask[positions] = True
+            mask &= tok_mask
+        return mask
+
+    def mask(self, F: dict[str, Any] | None, exclude: str | None = None) -> np.ndarray:
+        """Bool mask of stories passing every active filter in F.
+
+        Args:
+            F: Filters dict in the st.session_state["filters"] shape.
+            exclude: Optional filter key to ignore (used for facet counts).
+        """
+        F = F or {}
+        mask = np.ones(len(self.stories), dtype=bool)
+        for key in FACETS:
+            if key == exclude:
+                continue
+            facet = self._facet_mask(key, F.get(key))
+            if facet is not None:
+                mask &= facet
+        if F.get("has_metric") and exclude != "has_metric":
+            mask &= self.has_metric
+        if exclude != "q":
+            kw = self.keyword_mask(F.get("q") or "")
+            if kw is not None:
+                mask &= kw
+        return mask
+
+    def _position(self, s: dict) -> int | None:
+        if isinstance(s, StoryHit):
+            s = s.story
+        i = self._pos_by_obj.get(id(s))
+        if i is not None and self.stories[i] is s:
+            return i
+        sid = s.get("id")
+        if sid in (None, ""):
+            return None
+        return self._pos_by_sid.get(str(sid))
+
+    def filter(
+        self, F: dict[str, Any] | None, subset: list[dict] | None = None
+    ) -> list[dict]:
+        """Stories passing F, in corpus order (or subset order).
+
+        Args:
+            F: Filters dict.
+            subset: Optional stories to filter instead of the whole corpus,
+                e.g. cached search results (StoryHits or copies of corpus
+                stories). Each is resolved to its corpus position by
+                identity, then by id; stories not in the corpus fall back
+                to matches_filters().
+        """
+        mask = self.mask(F)
+        if subset is None:
+            return [self.stories[i] for i in np.flatnonzero(mask)]
+        out = []
+        for s in subset:
+            i = self._position(s)
+            if i is None:
+                if matches_filters(s, F or {}):
+                    out.append(s)
+            elif mask[i]:
+                out.append(s)
+        return out
+
+    def counts(self, F: dict[str, Any] | None, key: str) -> dict[Any, int]:
+        """Stories per option of one facet, given all the OTHER active filters.
+
+        Options are the facet's indexed values, most frequent first; options
+        with no remaining stories are omitted.
+        """
+        base = self.mask(F, exclude=key)
+        field = FACETS[key][0]
+        counts = {
+            v: int(np.count_nonzero(base & m)) for v, m in self._masks[field].items()
+        }
+        return {v: c for v, c in sorted(counts.items(), key=lambda kv: -kv[1]) if c > 0}
+
+
+_INDEX_CACHE = IdentityCache(FacetIndex)
+
+
+def get_facet_index(stories: list[dict]) -> FacetIndex:
+    """Return the FacetIndex for this story list, building it on first use.
+
+    Cached like utils.corpus_index.get_corpus_index(): by list identity, and
+    rebuilt if the list's length changes.
+    """
+    return _INDEX_CACHE.get(stories)
@@ -11,6 +11,28 @@ from utils.formatting import story_has_metric
 from utils.validation import _tokenize
 
 
+def story_haystack(s: dict[str, Any]) -> str:
+    """Text searched by the keyword ("q") filter, joined with spaces.
+
+    Shared by matches_filters() and utils.facet_index so both tokenize
+    exactly the same fields.
+    """
+    return " ".join(
+        [
+            s.get("Title", ""),
+            s.get("Client", ""),
+            s.get("Role", ""),
+            s.get("Sub-category", ""),
+            s.get("Person", ""),
+            s.get("Place", ""),
+            s.get("Purpose", ""),
+            " ".join(s.get("Process", []) or []),
+            " ".join(s.get("Performance", []) or []),
+            " ".join(s.get("public_tags", []) or []),
+        ]
+    )
+
+
 def matches_filters(s: dict[str, Any], F: dict[str, Any] | None = None) -> bool:
     """Check if story matches all active filters.
 
@@ -119,20 +141,7 @@ def matches_filters(s: dict[str, Any], F: dict[str, Any] | None = None) -> bool:
     q_raw = (F.get("q") or "").strip()
     if q_raw:
         q_toks = _tokenize(q_raw)
-        hay_joined = " ".join(
-            [
-                s.get("Title", ""),
-                s.get("Client", ""),
-                s.get("Role", ""),
-                s.get("Sub-category", ""),
-                s.get("Person", ""),
-                s.get("Place", ""),
-                s.get("Purpose", ""),
-                " ".join(s.get("Process", []) or []),
-                " ".join(s.get("Performance", []) or []),
-                " ".join(s.get("public_tags", []) or []),
-            ]
-        )
+        hay_joined = story_haystack(s)
 
         if q_toks:
             hay_toks = set(_tokenize(hay_joined))
@@ -25,7 +25,7 @@ from typing import Any
 
 from config.constants import CAPABILITY_SUBTITLES
 
-# Same constant timeline_view.py uses — narrative content stays off
+# Same constant utils/eras.py uses — narrative content stays off
 # project-categorization surfaces. If this rule changes in one place it
 # must change in both; see MATTGPT-060 in BACKLOG.md for the lineage.
 EXCLUDED_ERA = "Leadership & Professional Narrative"
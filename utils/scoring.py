@@ -1,18 +1,48 @@
 """Scoring utilities for search results.
 
 This module provides hybrid scoring functionality that combines semantic
-(Pinecone vector) similarity with keyword-based (BM25-ish) overlap scoring
-for story search results.
+(Pinecone vector) similarity with keyword scoring for story search results.
+
+Keyword scoring runs against a KeywordIndex built once per corpus: every
+story's fields are tokenized up front into an inverted index (token ->
+postings with term frequencies), so a query scores the whole corpus in one
+pass. Two scorers share the index:
+- "overlap": the original set-overlap score, identical to
+  _keyword_score_for_story(); the default (KEYWORD_SCORER), which the
+  hybrid weight W_KW was tuned for
+- "bm25": field-weighted BM25 (title/domain counted twice), normalized to
+  0-1; used by the local no-hits fallback
 """
 
+import math
 import re
 from typing import Any
 
-from config.constants import W_KW, W_PC
+import numpy as np
+
+from config.constants import BM25_B, BM25_K1, KEYWORD_SCORER, RRF_K, W_KW, W_PC
+from utils.corpus_index import IdentityCache
 from utils.formatting import build_5p_summary
 from utils.validation import _tokenize
 
 
+def _keyword_fields(s: dict[str, Any]) -> tuple[str, str]:
+    """Return (haystack text, title/domain text) for keyword scoring."""
+    hay_parts = [
+        s.get("Title", ""),
+        s.get("Client", ""),
+        s.get("Role", ""),
+        s.get("Sub-category", ""),
+        " ".join(s.get("Competencies", []) or []),  # Direct keyword matches
+        " ".join(s.get("public_tags", []) or []),
+        build_5p_summary(s, 400),
+        " ".join(s.get("Process", []) or []),
+        " ".join(s.get("Performance", []) or []),
+    ]
+    title_dom = " ".join([s.get("Title", ""), s.get("Sub-category", "")])
+    return " ".join(hay_parts), title_dom
+
+
 def _keyword_score_for_story(s: dict[str, Any], query: str) -> float:
     """Calculate keyword overlap score for story using BM25-ish approach.
 
@@ -50,29 +80,181 @@ def _keyword_score_for_story(s: dict[str, Any], query: str) -> float:
     if not q_toks:
         return 0.0
 
-    hay_parts = [
-        s.get("Title", ""),
-        s.get("Client", ""),
-        s.get("Role", ""),
-        s.get("Sub-category", ""),
-        " ".join(s.get("Competencies", []) or []),  # ← ADD THIS Direct keyword matches
-        " ".join(s.get("public_tags", []) or []),
-        build_5p_summary(s, 400),
-        " ".join(s.get("Process", []) or []),
-        " ".join(s.get("Performance", []) or []),
-    ]
-    hay = " ".join(hay_parts)
+    hay, title_dom = _keyword_fields(s)
     h_toks = set(_tokenize(hay))
     hits = q_toks & h_toks
 
     # Soft weighting: title/domain twice
-    title_dom = " ".join([s.get("Title", ""), s.get("Sub-category", "")])
     td_hits = q_toks & set(_tokenize(title_dom))
     score = len(hits) + len(td_hits)
 
     return min(1.0, score / max(1, len(q_toks) * 2))
 
 
+class KeywordIndex:
+    """Inverted index over a story list for one-pass keyword scoring.
+
+    Built once per corpus (see get_keyword_index()). For each token the index
+    holds a posting list: story positions plus term frequencies in the full
+    haystack and in the title/domain fields. Scores come back as a float
+    array aligned to the story list order.
+
+    Args:
+        stories: Story dicts, in the order scores should be returned.
+        k1: BM25 term-frequency saturation.
+        b: BM25 length normalization.
+    """
+
+    def __init__(
+        self, stories: list[dict[str, Any]], k1: float = BM25_K1, b: float = BM25_B
+    ):
+        self.k1 = float(k1)
+        self.b = float(b)
+        self.size = len(stories)
+        self._pos_by_id = {id(s): i for i, s in enumerate(stories)}
+
+        postings: dict[str, dict[int, list[int]]] = {}
+        lengths = np.zeros(self.size, dtype=np.float64)
+        for i, s in enumerate(stories):
+            hay, title_dom = _keyword_fields(s)
+            hay_toks = _tokenize(hay)
+            td_toks = _tokenize(title_dom)
+            lengths[i] = len(hay_toks) + len(td_toks)
+            for field, toks in ((0, hay_toks), (1, td_toks)):
+                for tok in toks:
+                    tf = postings.setdefault(tok, {}).setdefault(i, [0, 0])
+                    tf[field] += 1
+
+        # token -> (positions, haystack tf, title/domain tf)
+        self._postings: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        for tok, docs in postings.items():
+            pos = np.fromiter(docs.keys(), dtype=np.int64, count=len(docs))
+            tfs = np.array(list(docs.values()), dtype=np.float64)
+            self._postings[tok] = (pos, tfs[:, 0], tfs[:, 1])
+
+        avgdl = float(lengths.mean()) if self.size else 0.0
+        self._norm = (
+            self.k1 * (1.0 - self.b + self.b * lengths / avgdl)
+            if avgdl
+            else np.full(self.size, self.k1)
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def position(self, story: dict[str, Any]) -> int | None:
+        """Position of this story object in the indexed list, or None."""
+        return self._pos_by_id.get(id(story))
+
+    def idf(self, token: str) -> float:
+        """BM25 idf (always positive). Unseen tokens get the maximum idf."""
+        entry = self._postings.get(token)
+        df = len(entry[0]) if entry else 0
+        return math.log(1.0 + (self.size - df + 0.5) / (df + 0.5))
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        """Field-weighted BM25 for every story, normalized to 0.0-1.0.
+
+        Title/domain occurrences count twice, mirroring the overlap scorer's
+        soft weighting. Scores are divided by the best achievable score for
+        the query (every token saturated), so they blend on the same 0-1
+        scale as the overlap score.
+        """
+        scores = np.zeros(self.size, dtype=np.float64)
+        q_toks = set(_tokenize(query))
+        if not q_toks or not self.size:
+            return scores
+
+        bound = 0.0
+        for tok in q_toks:
+            idf = self.idf(tok)
+            bound += idf * (self.k1 + 1.0)
+            entry = self._postings.get(tok)
+            if entry is None:
+                continue
+            pos, tf_hay, tf_td = entry
+            tf = tf_hay + tf_td
+            scores[pos] += idf * tf * (self.k1 + 1.0) / (tf + self._norm[pos])
+        return scores / bound
+
+    def overlap_scores(self, query: str) -> np.ndarray:
+        """Set-overlap score for every story (same values as
+        _keyword_score_for_story)."""
+        scores = np.zeros(self.size, dtype=np.float64)
+        q_toks = set(_tokenize(query))
+        if not q_toks:
+            return scores
+
+        for tok in q_toks:
+            entry = self._postings.get(tok)
+            if entry is None:
+                continue
+            pos, tf_hay, tf_td = entry
+            scores[pos] += (tf_hay > 0).astype(np.float64) + (tf_td > 0)
+        return np.minimum(1.0, scores / max(1, len(q_toks) * 2))
+
+    def scores(self, query: str, method: str = KEYWORD_SCORER) -> np.ndarray:
+        """Score every story for query with the given method ("bm25" | "overlap")."""
+        if method == "overlap":
+            return self.overlap_scores(query)
+        if method == "bm25":
+            return self.bm25_scores(query)
+        raise ValueError(f"Unknown keyword scorer: {method!r}")
+
+    def scores_for(
+        self,
+        subset: list[dict[str, Any]],
+        query: str,
+        method: str = KEYWORD_SCORER,
+    ) -> list[float]:
+        """Scores for a subset of the indexed stories (e.g. search hits).
+
+        Stories that are not in the index (a copy, a synthetic story) fall
+        back to _keyword_score_for_story().
+        """
+        if not subset:
+            return []
+        all_scores = self.scores(query, method)
+        out = []
+        for s in subset:
+            pos = self.position(s)
+            out.append(
+                float(all_scores[pos])
+                if pos is not None
+                else _keyword_score_for_story(s, query)
+            )
+        return out
+
+
+_KEYWORD_INDEX_CACHE = IdentityCache(KeywordIndex)
+
+
+def get_keyword_index(stories: list[dict[str, Any]]) -> KeywordIndex:
+    """Return the KeywordIndex for this story list, building it on first use.
+
+    Cached like utils.corpus_index.get_corpus_index(): by list identity, and
+    rebuilt if the list's length changes.
+    """
+    return _KEYWORD_INDEX_CACHE.get(stories)
+
+
+def keyword_scores(
+    stories: list[dict[str, Any]], query: str, method: str = KEYWORD_SCORER
+) -> np.ndarray:
+    """Keyword scores for the whole corpus, aligned to story order.
+
+    Args:
+        stories: Full story list (the index is cached per list).
+        query: Search query string.
+        method: "overlap" (the set-overlap score) or "bm25"; defaults to
+            KEYWORD_SCORER.
+
+    Returns:
+        Float array of len(stories), each 0.0-1.0.
+    """
+    return get_keyword_index(stories).scores(query, method)
+
+
 def _hybrid_score(
     pc_score: float, kw_score: float, w_pc: float = W_PC, w_kw: float = W_KW
 ) -> float:
@@ -85,8 +267,8 @@ def _hybrid_score(
     Args:
         pc_score: Pinecone semantic similarity score (typically 0.0-1.0).
             None or invalid values default to 0.0.
-        kw_score: Keyword overlap score from _keyword_score_for_story()
-            (0.0-1.0). None or invalid values default to 0.0.
+        kw_score: Keyword score from KeywordIndex.scores() (BM25 or set
+            overlap, 0.0-1.0). None or invalid values default to 0.0.
         w_pc: Weight for Pinecone score. Defaults to W_PC (1.0).
         w_kw: Weight for keyword score. Defaults to W_KW (0.15).
 
@@ -114,6 +296,33 @@ def _hybrid_score(
     return (pc * float(w_pc)) + (kw * float(w_kw))
 
 
+def reciprocal_rank_fusion(
+    rankings: list[list[Any]], k: int = RRF_K
+) -> list[tuple[Any, float]]:
+    """Fuse several best-first rankings with reciprocal-rank fusion.
+
+    Each item scores sum(1 / (k + rank)) over the rankings it appears in
+    (rank is 1-based). Only ranks are used, so scorers on different scales
+    (BM25, cosine) combine without calibration.
+
+    Args:
+        rankings: Lists of hashable items, each ordered best first.
+        k: Fusion constant (RRF_K).
+
+    Returns:
+        (item, fused score) pairs, best first. Ties keep first-seen order.
+
+    Example:
+        >>> reciprocal_rank_fusion([["a", "b"], ["b", "c"]], k=60)[0][0]
+        'b'
+    """
+    fused: dict[Any, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+
+
 def _substitute_matt_subject(query: str) -> str:
     # Possessive first to avoid double-substitution ("Matt's" -> "his", "Matt" -> "he").
     result = re.sub(r"\bMatt's\b", "his", query, flags=re.IGNORECASE)
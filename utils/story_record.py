@@ -0,0 +1,182 @@
+"""Compact read-only story records and per-hit score overlays.
+
+Every story used to be an ordinary dict with its own copy of each key and of
+each repeated categorical value ("Financial Services", "Accenture", ...),
+and retrieval copied whole stories just to attach pc/kw scores or synthesis
+annotations. Two types replace that:
+
+- StoryRecord: the loaded story. A slotted, read-only dict subclass whose
+  keys and categorical values are interned, so 100+ stories share one
+  string object per distinct Industry/Era/Client/... value. Being a dict, it
+  passes every existing isinstance(x, dict) check and serializes with json.
+- StoryHit: what search returns. It references the StoryRecord and keeps
+  only scores/annotations ("pc", "kw", "_matched_theme", ...) in its own
+  storage, presenting the union as one mapping. Writes land in the overlay,
+  never in the shared story.
+
+Both keep s.get("Title") / s["id"] call sites working. StoryRecord.copy()
+returns an empty StoryHit over the record, so legacy copy-then-annotate
+code gets an overlay instead of a full copy.
+"""
+
+import sys
+from collections.abc import ItemsView, Iterator, KeysView, Mapping, ValuesView
+from typing import Any
+
+# Low-cardinality fields whose string values repeat across the corpus
+CATEGORICAL_FIELDS = (
+    "Employer",
+    "Division",
+    "Role",
+    "Client",
+    "Industry",
+    "Theme",
+    "Era",
+    "Solution / Offering",
+    "Project Scope / Complexity",
+    "Category",
+    "Sub-category",
+    "Start_Date",
+    "End_Date",
+)
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(
+        f"{type(self).__name__} is read-only; annotate a StoryHit "
+        "(story.copy() or StoryHit(story, ...)) instead"
+    )
+
+
+class StoryRecord(dict):
+    """Read-only story mapping with interned keys and categorical values.
+
+    Use freeze_story() to build one from a parsed JSON dict.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def copy(self) -> "StoryHit":
+        """Writable view over this record (nothing is copied)."""
+        return StoryHit(self)
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def freeze_story(story: Mapping[str, Any]) -> StoryRecord:
+    """StoryRecord for a parsed (and normalized) story dict."""
+    if isinstance(story, StoryRecord):
+        return story
+    frozen = {}
+    for key, value in story.items():
+        if isinstance(value, str) and key in CATEGORICAL_FIELDS:
+            value = sys.intern(value)
+        elif key == "public_tags" and isinstance(value, list):
+            value = [sys.intern(t) if isinstance(t, str) else t for t in value]
+        frozen[sys.intern(key) if isinstance(key, str) else key] = value
+    return StoryRecord(frozen)
+
+
+class StoryHit(dict):
+    """A story plus per-result scores/annotations, without copying the story.
+
+    The dict storage holds only the overlay; reads fall through to the
+    underlying story. Reading a key returns the overlay value if set.
+
+    Args:
+        story: The corpus story (a StoryRecord, plain dict, or another hit,
+            whose overlay is carried over).
+        **annotations: Initial overlay values, e.g. pc=0.42, kw=0.1.
+    """
+
+    __slots__ = ("story",)
+
+    def __init__(self, story: Mapping[str, Any], **annotations: Any):
+        if isinstance(story, StoryHit):
+            super().__init__(dict.items(story))
+            story = story.story
+        else:
+            super().__init__()
+        self.story = story
+        dict.update(self, annotations)
+
+    # --- read access: overlay first, then the story ---
+    def __getitem__(self, key):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        return self.story[key]
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        return self.story.get(key, default)
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or key in self.story
+
+    def __iter__(self) -> Iterator:
+        yield from self.story
+        for key in dict.__iter__(self):
+            if key not in self.story:
+                yield key
+
+    def __len__(self) -> int:
+        extra = sum(1 for key in dict.__iter__(self) if key not in self.story)
+        return len(self.story) + extra
+
+    def keys(self):
+        return KeysView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other) -> bool:
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"StoryHit({dict(self.items())!r})"
+
+    # --- writes go to the overlay ---
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        return dict.pop(self, key, *default)
+
+    def copy(self) -> "StoryHit":
+        return StoryHit(self)
+
+    @property
+    def annotations(self) -> dict[str, Any]:
+        """The overlay alone (scores and annotations)."""
+        return dict(dict.items(self))
+
+    def __reduce__(self):
+        return (_rebuild_hit, (self.story, self.annotations))
+
+
+def _rebuild_hit(story, annotations):
+    return StoryHit(story, **annotations)
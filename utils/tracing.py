@@ -0,0 +1,153 @@
+"""Per-turn stage timing for the Ask Agy pipeline.
+
+rag_answer() opens a Trace for each turn with start_trace(); the stages it
+runs -- and the services it calls (semantic_search, pinecone_semantic_search,
+_generate_agy_response) -- time themselves with span("stage"). When no trace
+is active (My Work search, scripts, tests) span() is a no-op, so the
+services don't need to know who called them. @traced("stage") does the
+same for a whole function.
+
+The active trace lives in a ContextVar, so concurrent sessions (one
+Streamlit script thread each) never share one. Worker threads started by a
+ThreadPoolExecutor do not inherit it; time their parent call instead.
+
+Example:
+    >>> with start_trace() as trace:
+    ...     with span("search"):
+    ...         run_search()
+    >>> trace.durations()
+    {'search': 12.3}
+"""
+
+import functools
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Span:
+    """One timed stage. Times are milliseconds from the trace start."""
+
+    __slots__ = ("name", "start_ms", "duration_ms", "depth")
+
+    def __init__(self, name: str, start_ms: float, duration_ms: float, depth: int):
+        self.name = name
+        self.start_ms = start_ms
+        self.duration_ms = duration_ms
+        self.depth = depth
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, +{self.start_ms:.1f}ms, {self.duration_ms:.1f}ms)"
+
+
+class Trace:
+    """Stage timings recorded during one turn.
+
+    Args:
+        name: Label for the waterfall (e.g. "ask_agy").
+    """
+
+    def __init__(self, name: str = "turn"):
+        self.name = name
+        self.spans: list[Span] = []
+        self._t0 = time.perf_counter()
+        self._end: float | None = None
+        self._depth = 0
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage name (recorded even if it raises)."""
+        start = self._now_ms()
+        depth = self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth = depth
+            self.spans.append(Span(name, start, self._now_ms() - start, depth))
+
+    def finish(self) -> None:
+        """Fix total_ms at now. Spans may still be added afterwards."""
+        if self._end is None:
+            self._end = self._now_ms()
+
+    @property
+    def total_ms(self) -> float:
+        """Wall time of the turn: until finish(), or until the last span ended."""
+        end = self._end if self._end is not None else self._now_ms()
+        last = max((s.start_ms + s.duration_ms for s in self.spans), default=0.0)
+        return max(end, last)
+
+    def durations(self) -> dict[str, float]:
+        """Total milliseconds per stage name, in first-start order."""
+        out: dict[str, float] = {}
+        for s in sorted(self.spans, key=lambda s: s.start_ms):
+            out[s.name] = out.get(s.name, 0.0) + s.duration_ms
+        return out
+
+    def waterfall(self) -> list[Span]:
+        """Spans in start order (parents before the children they contain)."""
+        return sorted(self.spans, key=lambda s: (s.start_ms, s.depth))
+
+    def format_waterfall(self, width: int = 32) -> str:
+        """Fixed-width text waterfall for the DEBUG sidebar."""
+        total = self.total_ms or 1.0
+        lines = [f"{self.name}: {self.total_ms:.0f} ms"]
+        for s in self.waterfall():
+            lead = int(round(s.start_ms / total * width))
+            bar = max(1, int(round(s.duration_ms / total * width)))
+            label = ("  " * s.depth + s.name)[:24]
+            lines.append(
+                f"{label:<24} {' ' * lead}{'█' * bar}"
+                f"{' ' * max(0, width - lead - bar)} {s.duration_ms:7.1f} ms"
+            )
+        return "\n".join(lines)
+
+
+_CURRENT: ContextVar[Trace | None] = ContextVar("mattgpt_trace", default=None)
+
+
+def current_trace() -> Trace | None:
+    """The trace of the turn running in this context, if any."""
+    return _CURRENT.get()
+
+
+@contextmanager
+def start_trace(name: str = "turn") -> Iterator[Trace]:
+    """Make a new Trace current for the enclosed block, then finish it."""
+    trace = Trace(name)
+    token = _CURRENT.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finish()
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block in the current trace (no-op without one)."""
+    trace = _CURRENT.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name):
+        yield
+
+
+def traced(name: str):
+    """Decorator: run every call of the function inside span(name)."""
+
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
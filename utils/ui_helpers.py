@@ -5,6 +5,7 @@ import re
 import streamlit as st
 
 from config.debug import DEBUG
+from utils.corpus_index import get_corpus_index
 from utils.formatting import _format_deep_dive, _format_key_points, _format_narrative
 
 # ============================================================================
@@ -277,14 +278,7 @@ def render_sources_chips(
                             target = None
                             sid_norm = (item.get("id") or "").strip()
                             if sid_norm:
-                                target = next(
-                                    (
-                                        x
-                                        for x in stories
-                                        if str(x.get("id")) == str(sid_norm)
-                                    ),
-                                    None,
-                                )
+                                target = get_corpus_index(stories).get(sid_norm)
                             if not target:
                                 tgt_title = (item.get("title") or "").strip().lower()
                                 tgt_client = (item.get("client") or "").strip().lower()
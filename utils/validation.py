@@ -8,6 +8,10 @@ nonsense/off-topic queries in the RAG pipeline.
 import json
 import os
 import re
+
+# re's own parser (private, stable since 3.11) - used only to derive the
+# literal prefixes NonsenseRuleEngine prefilters on.
+from re import _constants as _sre, _parser as _sre_parse
 from typing import Any
 
 from utils.ui_helpers import dbg
@@ -65,6 +69,120 @@ _WORD_RX = re.compile(r"[A-Za-z0-9+#\-_.]+")
 _NONSENSE_RULES: list[dict] = []
 
 
+def _literal_prefixes(items) -> set[str] | None:
+    """Lowercased literals one of which must start every match of items.
+
+    items is a parsed regex sequence (re._parser). Zero-width anchors at the
+    front (\\b, ^) are skipped; groups and top-level alternations recurse.
+    Returns None when no such literal can be derived (character classes,
+    optional first items, non-ASCII, ...), meaning "always run this rule".
+    """
+    literal = ""
+    for op, av in items:
+        if op is _sre.LITERAL:
+            literal += chr(av)
+            continue
+        if literal:
+            break
+        if op is _sre.AT:
+            continue
+        if op is _sre.SUBPATTERN:
+            return _literal_prefixes(av[-1])
+        if op is _sre.BRANCH:
+            prefixes: set[str] = set()
+            for branch in av[1]:
+                sub = _literal_prefixes(branch)
+                if sub is None:
+                    return None
+                prefixes |= sub
+            return prefixes
+        return None
+    if not literal or not literal.isascii():
+        return None
+    return {literal.lower()}
+
+
+class NonsenseRuleEngine:
+    """Nonsense rules compiled once, with a literal-prefix prefilter.
+
+    Every rule pattern is compiled a single time (case-insensitive). For each
+    rule the engine also derives the literal text every match must start
+    with - e.g. {"weather", "forecast", ...} for \\b(weather|forecast|...)\\b.
+    A query only runs the regexes of rules whose prefix occurs in it (plus
+    rules with no derivable prefix), so the per-query cost stays roughly flat
+    as the rules file grows. The first matching rule in file order wins,
+    exactly as with the old per-rule loop.
+
+    Rules without a pattern, or whose pattern does not compile, are skipped.
+
+    Args:
+        rules: Rule dicts as returned by _load_nonsense_rules().
+    """
+
+    def __init__(self, rules: list[dict[str, Any]]):
+        self.rules = rules
+        self._categories: list[str] = []
+        self._patterns: list[re.Pattern] = []
+        # Rules with no derivable prefix; checked on every query
+        self._always: list[int] = []
+        # Literal prefix -> indices of rules it gates
+        self._prefixes: dict[str, list[int]] = {}
+
+        for r in rules:
+            pat = r.get("pattern") if isinstance(r, dict) else None
+            if not pat:
+                continue
+            try:
+                compiled = re.compile(pat, re.IGNORECASE)
+                prefixes = _literal_prefixes(_sre_parse.parse(pat, re.IGNORECASE))
+            except re.error:
+                continue
+            idx = len(self._patterns)
+            self._patterns.append(compiled)
+            self._categories.append(r.get("category") or "other")
+            if prefixes is None:
+                self._always.append(idx)
+            else:
+                for prefix in prefixes:
+                    self._prefixes.setdefault(prefix, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def candidates(self, query: str) -> list[int]:
+        """Indices (in file order) of rules that could match query."""
+        if not query.isascii():
+            # IGNORECASE folds a few non-ASCII letters (e.g. U+212A KELVIN
+            # SIGN, U+017F LONG S) onto ASCII ones; str.lower() does not.
+            return list(range(len(self._patterns)))
+        q_lower = query.lower()
+        found = set(self._always)
+        for prefix, idxs in self._prefixes.items():
+            if prefix in q_lower:
+                found.update(idxs)
+        return sorted(found)
+
+    def match(self, query: str) -> str | None:
+        """Category of the first rule (in file order) matching query."""
+        for idx in self.candidates(query):
+            if self._patterns[idx].search(query):
+                return self._categories[idx]
+        return None
+
+
+_NONSENSE_ENGINE: NonsenseRuleEngine | None = None
+
+
+def _get_nonsense_engine() -> NonsenseRuleEngine:
+    """Engine for the current _NONSENSE_RULES, compiling it if the list changed."""
+    global _NONSENSE_ENGINE
+    engine = _NONSENSE_ENGINE
+    if engine is None or engine.rules is not _NONSENSE_RULES:
+        engine = NonsenseRuleEngine(_NONSENSE_RULES)
+        _NONSENSE_ENGINE = engine
+    return engine
+
+
 def _tokenize(text: str) -> list[str]:
     """Tokenize text into normalized words (3+ chars, excluding stopwords).
 
@@ -195,10 +313,12 @@ def preload_nonsense_rules() -> None:
     uncompilable regex), the ValueError propagates and startup fails loudly.
 
     Side Effects:
-        Populates the _NONSENSE_RULES global cache used by is_nonsense.
+        Populates the _NONSENSE_RULES global cache used by is_nonsense and
+        compiles it into the NonsenseRuleEngine.
     """
     global _NONSENSE_RULES
     _NONSENSE_RULES = _load_nonsense_rules()
+    _get_nonsense_engine()
 
 
 def is_nonsense(query: str) -> str | None:
@@ -206,7 +326,8 @@ def is_nonsense(query: str) -> str | None:
 
     Tests query against loaded regex rules to detect off-domain queries like
     profanity, meta questions about the system, gibberish, etc. Loads rules
-    from nonsense_filters.jsonl on first call (lazy loading with caching).
+    from nonsense_filters.jsonl on first call (lazy loading with caching);
+    the rules are matched in one pass by the compiled NonsenseRuleEngine.
 
     Args:
         query: User query string to validate.
@@ -236,16 +357,41 @@ def is_nonsense(query: str) -> str | None:
     if not q:
         return None
 
-    for r in _NONSENSE_RULES:
-        pat = r.get("pattern")
-        if not pat:
-            continue
-        try:
-            if re.search(pat, q, re.IGNORECASE):
-                return r.get("category") or "other"
-        except re.error:
-            continue
-    return None
+    return _get_nonsense_engine().match(q)
+
+
+def build_known_vocab(stories: list[dict[str, Any]]) -> set[str]:
+    """Build vocabulary set from story corpus for overlap detection.
+
+    Extracts tokens from key story fields (Title, Client, Role, Industry,
+    Sub-category) and tags to create a domain vocabulary. Used for
+    token_overlap_ratio calculations to detect off-topic queries.
+
+    Args:
+        stories: List of story dictionaries from the portfolio.
+
+    Returns:
+        Set of lowercase tokens with length >= 3 characters.
+
+    Example:
+        >>> stories = [{"Title": "Platform Modernization", "Client": "JPMC"}]
+        >>> vocab = build_known_vocab(stories)
+        >>> "platform" in vocab
+        True
+    """
+    vocab = set()
+    for s in stories:
+        for field in ["Title", "Client", "Role", "Industry", "Sub-category"]:
+            txt = (s.get(field) or "").lower()
+            vocab.update(re.split(r"[^\w]+", txt))
+        # Add tags if available
+        tags = s.get("public_tags", [])
+        if isinstance(tags, str):
+            tags = tags.split(",")
+        for t in tags:
+            vocab.update(re.split(r"[^\w]+", str(t).strip().lower()))
+    # Prune tiny tokens
+    return {w for w in vocab if len(w) >= 3}
 
 
 def token_overlap_ratio(query: str, vocab: set[str]) -> float:
@@ -258,7 +404,7 @@ def token_overlap_ratio(query: str, vocab: set[str]) -> float:
     Args:
         query: User query string to analyze.
         vocab: Set of known vocabulary terms from story corpus (lowercase).
-            Typically built via build_known_vocab() in backend_service.
+            Typically built via build_known_vocab().
 
     Returns:
         Float ratio between 0.0 and 1.0 representing the proportion of unique